@@ -1,14 +1,64 @@
 """Fix Message"""
 
-from .common import SOH, calc_checksum
+from .columns import Column, decode_columns, decode_group_records
+from .common import SOH, calc_checksum, calc_checksums
+from .copy_on_write import CopyOnWriteMessage
 from .fix_message import FixMessage
+from .framer import FixFramer, iter_messages, read_messages
 from .fix_message_factory import FixMessageFactory
-from .decoder import find_message_meta_data
+from .file_decoder import decode_file, scan_file
+from .fix_stream import fix_stream
+from .lazy_message import LazyMessage
+from .order_book import BookManager, BookSide, OrderBook, TopOfBook
+from .parallel_decoder import (
+    parallel_decode_file,
+    parallel_decode_file_batches
+)
+from .decoder import find_message_meta_data, peek_header
+from .decode_plan import Projection, compile_decode_plan, compile_projection
+from .encode_plan import compile_encode_plan
+from .template import MessageTemplate
+from .typed_message import (
+    TypedGroup,
+    TypedMessage,
+    create_message_classes,
+    decode_typed,
+    get_message_class
+)
 
 __all__ = [
     'SOH',
+    'BookManager',
+    'BookSide',
     'calc_checksum',
+    'calc_checksums',
+    'Column',
+    'compile_decode_plan',
+    'compile_encode_plan',
+    'compile_projection',
+    'CopyOnWriteMessage',
+    'create_message_classes',
+    'decode_columns',
+    'decode_file',
+    'decode_group_records',
+    'decode_typed',
+    'FixFramer',
     'FixMessage',
     'find_message_meta_data',
-    'FixMessageFactory'
+    'FixMessageFactory',
+    'fix_stream',
+    'get_message_class',
+    'iter_messages',
+    'LazyMessage',
+    'MessageTemplate',
+    'OrderBook',
+    'parallel_decode_file',
+    'parallel_decode_file_batches',
+    'peek_header',
+    'Projection',
+    'read_messages',
+    'scan_file',
+    'TopOfBook',
+    'TypedGroup',
+    'TypedMessage'
 ]
@@ -0,0 +1,559 @@
+"""Decoding batches of FIX messages to columns"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast
+)
+
+from ..meta_data import (
+    FieldMetaData,
+    MessageMemberMetaData,
+    MessageMetaData,
+    ProtocolMetaData,
+    message_member_iter
+)
+from ..types import StrictMode, ValueType
+
+from .common import SOH
+from .decoder import (
+    _decode_encoded_message,
+    _find_encoded_message_meta_data
+)
+from .errors import DecodingError
+from .tokenizer import Buffer, to_bytes, tokenize
+from .validation import assert_message_valid
+from .value_decoders import bind_decoder
+
+_INT_TYPES = {
+    ValueType.INT.name,
+    ValueType.SEQNUM.name,
+    ValueType.NUMINGROUP.name,
+    ValueType.LENGTH.name,
+    ValueType.DAYOFMONTH.name
+}
+_FLOAT_TYPES = {
+    ValueType.FLOAT.name,
+    ValueType.QTY.name,
+    ValueType.PRICE.name,
+    ValueType.PRICEOFFSET.name,
+    ValueType.AMT.name,
+    'PERCENTAGE'
+}
+_DATE_TYPES = {
+    ValueType.UTCDATE.name,
+    ValueType.LOCALMKTDATE.name,
+}
+
+# The longest timestamp, with nanoseconds: YYYYmmdd-HH:MM:SS.fffffffff
+_TIMESTAMP_LENGTH = 27
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError(
+            'numpy is required to decode columns: '
+            'pip install jetblack-fixparser[numpy]'
+        ) from error
+    return numpy
+
+
+class Column:
+    """A column of decoded values.
+
+    The values are held in a typed NumPy array. Integers are int64, and floating
+    point numbers float64 (or int64 when the field is fixed point). Timestamps
+    are datetime64[ns], times timedelta64[ns] since midnight, and dates
+    datetime64[D] (or int64 nanoseconds when the protocol has integer times).
+    Booleans are bool.
+
+    Everything else, including enums, is categorical: the values are int32
+    codes indexing `categories`, with -1 for missing values.
+    """
+
+    def __init__(
+            self,
+            field: FieldMetaData,
+            values: Any,
+            mask: Any,
+            categories: Optional[List[Any]] = None
+    ) -> None:
+        """Initialise the column.
+
+        Args:
+            field (FieldMetaData): The field meta data.
+            values (Any): The NumPy array of values.
+            mask (Any): A NumPy bool array which is true where a value is
+                missing.
+            categories (Optional[List[Any]], optional): The decoded values of
+                the codes of a categorical column. Defaults to None.
+        """
+        self.field = field
+        self.values = values
+        self.mask = mask
+        self.categories = categories
+
+    @property
+    def is_categorical(self) -> bool:
+        """True if the values are codes of the categories.
+
+        Returns:
+            bool: True if the column is categorical.
+        """
+        return self.categories is not None
+
+    def to_masked_array(self) -> Any:
+        """Return the values as a NumPy masked array.
+
+        Returns:
+            Any: The masked array.
+        """
+        numpy = _import_numpy()
+        return numpy.ma.masked_array(self.values, self.mask)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __str__(self) -> str:
+        return (
+            'Column: '
+            f'name="{self.field.name}", '
+            f'dtype={self.values.dtype}, '
+            f'length={len(self.values)}'
+        )
+
+    __repr__ = __str__
+
+
+def _fill(raw: List[Optional[bytes]], missing: bytes) -> List[bytes]:
+    return [value or missing for value in raw]
+
+
+def _to_chars(numpy: Any, raw: List[bytes], width: int) -> Any:
+    # The values as a matrix of characters, padded with null bytes.
+    values = numpy.array(raw, numpy.bytes_).astype(f'S{width}')
+    return values.view(numpy.uint8).reshape(-1, width)
+
+
+def _copy_date(iso: Any, chars: Any) -> None:
+    # YYYYmmdd to YYYY-mm-dd
+    iso[:, 0:4] = chars[:, 0:4]
+    iso[:, 4] = ord('-')
+    iso[:, 5:7] = chars[:, 4:6]
+    iso[:, 7] = ord('-')
+    iso[:, 8:10] = chars[:, 6:8]
+
+
+# The characters of the FIX formats are rearranged into the ISO format
+# understood by NumPy. A missing fraction is left as null bytes, which NumPy
+# ignores.
+
+def _parse_timestamps(numpy: Any, raw: List[bytes]) -> Any:
+    # YYYYmmdd-HH:MM:SS.fffffffff to YYYY-mm-ddTHH:MM:SS.fffffffff
+    chars = _to_chars(numpy, raw, _TIMESTAMP_LENGTH)
+    iso = numpy.zeros((len(raw), _TIMESTAMP_LENGTH + 2), numpy.uint8)
+    _copy_date(iso, chars)
+    iso[:, 10] = ord('T')
+    iso[:, 11:] = chars[:, 9:]
+    return iso.view(f'S{iso.shape[1]}').ravel().astype('datetime64[ns]')
+
+
+def _parse_times(numpy: Any, raw: List[bytes]) -> Any:
+    # HH:MM:SS.fffffffff to 1970-01-01THH:MM:SS.fffffffff
+    chars = _to_chars(numpy, raw, _TIMESTAMP_LENGTH - 9)
+    iso = numpy.zeros((len(raw), _TIMESTAMP_LENGTH + 2), numpy.uint8)
+    iso[:, :11] = numpy.frombuffer(b'1970-01-01T', numpy.uint8)
+    iso[:, 11:] = chars
+    timestamps = iso.view(f'S{iso.shape[1]}').ravel().astype('datetime64[ns]')
+    return timestamps - numpy.datetime64(0, 'ns')
+
+
+def _parse_dates(numpy: Any, raw: List[bytes]) -> Any:
+    chars = _to_chars(numpy, raw, 8)
+    iso = numpy.zeros((len(raw), 10), numpy.uint8)
+    _copy_date(iso, chars)
+    return iso.view('S10').ravel().astype('datetime64[D]')
+
+
+def _to_column(
+        numpy: Any,
+        protocol: ProtocolMetaData,
+        field: FieldMetaData,
+        raw: List[Optional[bytes]],
+        is_categorical: bool = True
+) -> Column:
+    mask = numpy.fromiter((not value for value in raw), bool, len(raw))
+    field_type = field.type
+
+    if field_type in _INT_TYPES and not (
+            field.values and
+            protocol.is_type_enum.get(ValueType[field_type], True)
+    ):
+        values = numpy.array(_fill(raw, b'0'), numpy.bytes_).astype(
+            numpy.int64
+        )
+        return Column(field, values, mask)
+
+    if field_type in _FLOAT_TYPES:
+        if field.name in protocol.fixed_point_places:
+            decode_fixed_point = bind_decoder(protocol, field)
+            values = numpy.fromiter(
+                map(decode_fixed_point, _fill(raw, b'0')),
+                numpy.int64,
+                len(raw)
+            )
+        else:
+            values = numpy.array(_fill(raw, b'0'), numpy.bytes_).astype(
+                numpy.float64
+            )
+        return Column(field, values, mask)
+
+    if field_type == ValueType.BOOLEAN.name:
+        values = numpy.array(_fill(raw, b'N'), numpy.bytes_) == b'Y'
+        return Column(field, values, mask)
+
+    if field_type == ValueType.UTCTIMESTAMP.name:
+        values = _parse_timestamps(numpy, _fill(raw, b'19700101-00:00:00'))
+    elif field_type == ValueType.UTCTIMEONLY.name:
+        values = _parse_times(numpy, _fill(raw, b'00:00:00'))
+    elif field_type in _DATE_TYPES:
+        values = _parse_dates(numpy, _fill(raw, b'19700101'))
+    elif not is_categorical:
+        # The encoded values as fixed width byte strings.
+        values = numpy.array(_fill(raw, b''), numpy.bytes_)
+        return Column(field, values, mask)
+    else:
+        # Everything else is categorical.
+        codes_by_value: Dict[bytes, int] = {}
+        values = numpy.fromiter(
+            (
+                codes_by_value.setdefault(value, len(codes_by_value))
+                if value else -1
+                for value in raw
+            ),
+            numpy.int32,
+            len(raw)
+        )
+        decode: Callable[[bytes], Any] = (
+            bind_decoder(protocol, field)
+            if field_type in ValueType.__members__
+            else lambda value: value.decode('ascii')
+        )
+        categories = [decode(value) for value in codes_by_value]
+        return Column(field, values, mask, categories)
+
+    if protocol.is_integer_time:
+        if field_type in _DATE_TYPES:
+            values = values.astype('datetime64[ns]')
+        values = values.view(numpy.int64)
+    return Column(field, values, mask)
+
+
+def _top_level_fields(
+        protocol: ProtocolMetaData,
+        msgtype: bytes
+) -> Dict[str, FieldMetaData]:
+    message = protocol.messages_by_type[msgtype]
+    return {
+        member.member.name: member.member
+        for members in (protocol.header, message.fields, protocol.trailer)
+        for member in message_member_iter(members.values())  # type: ignore
+        if isinstance(member.member, FieldMetaData)
+    }
+
+
+def decode_columns(
+        protocol: ProtocolMetaData,
+        buffers: Iterable[Buffer],
+        msgtype: Union[str, bytes] = b'8',
+        fields: Optional[Sequence[str]] = None,
+        *,
+        sep: bytes = SOH
+) -> Dict[str, Column]:
+    """Decode a batch of messages of one type to columns of NumPy arrays.
+
+    The messages are tokenized, and the raw values of the requested fields
+    collected, before each column is converted in a single NumPy operation
+    where possible. No dictionary is built per message, and the messages are
+    not validated. Messages of other types are skipped.
+
+    Only the fields of the header, body and trailer can be decoded, not the
+    fields of repeating groups. If a field occurs more than once the first
+    value is used.
+
+    ```python
+    columns = decode_columns(
+        protocol,
+        buffers,
+        b'8',
+        ['TransactTime', 'Symbol', 'LastPx', 'LastQty']
+    )
+    prices = columns['LastPx'].to_masked_array()
+    ```
+
+    This requires NumPy.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        buffers (Iterable[Buffer]): The FIX message buffers.
+        msgtype (Union[str, bytes], optional): The message type (e.g. b'8') or
+            message name (e.g. 'ExecutionReport'). Defaults to b'8'.
+        fields (Optional[Sequence[str]], optional): The names of the fields to
+            decode. Defaults to None, which decodes every field of the header,
+            body and trailer.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+
+    Raises:
+        ValueError: If a field is not a field of the header, body or trailer.
+        DecodingError: If a buffer is not a FIX message.
+
+    Returns:
+        Dict[str, Column]: The columns by field name.
+    """
+    numpy = _import_numpy()
+
+    if isinstance(msgtype, str):
+        msgtype = protocol.messages_by_name[msgtype].msgtype
+    available = _top_level_fields(protocol, msgtype)
+    if fields is None:
+        fields = list(available)
+    for name in fields:
+        if name not in available:
+            raise ValueError(f'field {name} cannot be decoded to a column')
+
+    selected = [available[name] for name in fields]
+    raw_columns: List[List[Optional[bytes]]] = [[] for _ in selected]
+    numbers = [field.number for field in selected]
+
+    for buf in buffers:
+        encoded_message = tokenize(to_bytes(buf), sep)
+        if len(encoded_message) < 3 or encoded_message[2][0] != b'35':
+            raise DecodingError('message type not found')
+        if encoded_message[2][2] != msgtype:
+            continue
+        # The values by field number, keeping the first of repeated fields.
+        values = {
+            field_number: value
+            for field_number, _, value in reversed(encoded_message)
+        }
+        for number, raw in zip(numbers, raw_columns):
+            raw.append(values.get(number))
+
+    return {
+        field.name: _to_column(numpy, protocol, field, raw)
+        for field, raw in zip(selected, raw_columns)
+    }
+
+
+def _find_group(
+        protocol: ProtocolMetaData,
+        meta_data: MessageMetaData,
+        group: str
+) -> MessageMemberMetaData:
+    for members in (protocol.header, meta_data.fields, protocol.trailer):
+        for member in message_member_iter(members.values()):  # type: ignore
+            if member.type == 'group' and member.member.name == group:
+                return member
+    raise ValueError(f'{group} is not a group of {meta_data.name}')
+
+
+def _group_fields(
+        group: MessageMemberMetaData,
+        numbers: Set[bytes]
+) -> Dict[str, FieldMetaData]:
+    # The fields of the entries, adding the numbers of every descendant.
+    assert group.children is not None
+    fields: Dict[str, FieldMetaData] = {}
+    for member in message_member_iter(group.children.values()):
+        field = cast(FieldMetaData, member.member)
+        numbers.add(field.number)
+        if member.type == 'group':
+            _group_fields(member, numbers)
+        else:
+            fields[field.name] = field
+    return fields
+
+
+def decode_group_records(
+        protocol: ProtocolMetaData,
+        buf: Buffer,
+        group: str = 'NoMDEntries',
+        fields: Optional[Sequence[str]] = None,
+        *,
+        strict: Union[bool, StrictMode] = True,
+        validate: bool = True,
+        sep: bytes = SOH,
+        convert_sep_for_checksum: bool = True
+) -> Tuple[MutableMapping[str, Any], MessageMetaData]:
+    """Decode a message, with the entries of a group in a NumPy record array.
+
+    The message is decoded as usual, except the value of the group is a
+    structured array with a record for each entry. This suits the large
+    NoMDEntries groups of market data messages, as the entries can be
+    processed with vectorized operations.
+
+    ```python
+    message, meta_data = decode_group_records(
+        protocol,
+        buf,
+        'NoMDEntries',
+        ['MDUpdateAction', 'MDEntryType', 'MDEntryPx', 'MDEntrySize']
+    )
+    entries = message['NoMDEntries']
+    bids = entries[entries['MDEntryType'] == b'0']
+    ```
+
+    Numbers, timestamps and booleans have the types of `decode_columns`.
+    Everything else, including enums, is the encoded bytes. Missing floating
+    point numbers are NaN, missing times NaT, and other missing values are zero
+    or empty. The entries are not decoded to dictionaries, so only the number
+    of entries is checked, and groups within the entries are not decoded.
+
+    This requires NumPy.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        buf (Buffer): The FIX bytes buffer.
+        group (str, optional): The name of the group. Defaults to
+            'NoMDEntries'.
+        fields (Optional[Sequence[str]], optional): The names of the fields of
+            the entries to decode. Defaults to None, which decodes every field
+            of the entries, except those in nested groups.
+        strict (Union[bool, StrictMode], optional): If true use strict
+            validation. Defaults to True.
+        validate (bool, optional): If true validate the message. Defaults to
+            True.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        convert_sep_for_checksum (bool, optional): If true convert the separator
+            before calculating the checksum. Defaults to True.
+
+    Raises:
+        DecodingError: If the message type is missing or unknown.
+        ValueError: If the group is not in the message, or a field is not a
+            field of the entries.
+
+    Returns:
+        Tuple[MutableMapping[str, Any], MessageMetaData]: The message and its
+            meta data.
+    """
+    numpy = _import_numpy()
+    if isinstance(strict, bool):
+        strict = StrictMode.ALL if strict else StrictMode.NONE
+
+    buf = to_bytes(buf)
+    encoded_message = tokenize(buf, sep)
+    meta_data = _find_encoded_message_meta_data(
+        protocol,
+        encoded_message,
+        len(encoded_message)
+    )
+
+    group_member = _find_group(protocol, meta_data, group)
+    group_numbers: Set[bytes] = set()
+    available = _group_fields(group_member, group_numbers)
+    if fields is None:
+        fields = list(available)
+    for name in fields:
+        if name not in available:
+            raise ValueError(f'field {name} is not a field of {group}')
+
+    # Collect the raw values of the entries from the tokens. An entry starts
+    # at the first field of the group, and the group ends at the first field
+    # which is not in it.
+    selected = [available[name] for name in fields]
+    columns_by_number = {
+        field.number: column_index
+        for column_index, field in enumerate(selected)
+    }
+    group_number = cast(FieldMetaData, group_member.member).number
+    assert group_member.children is not None
+    delimiter = next(
+        message_member_iter(group_member.children.values())  # type: ignore
+    ).member.number
+    start, count = next(
+        (
+            (index + 1, int(value))
+            for index, (field_number, _, value) in enumerate(encoded_message)
+            if field_number == group_number
+        ),
+        (0, 0)
+    )
+    raw_columns: List[List[Optional[bytes]]] = [
+        [None] * count for _ in selected
+    ]
+    entry, end = -1, start
+    for field_number, _, value in encoded_message[start:] if start else ():
+        if field_number == delimiter:
+            entry += 1
+            if entry == count:
+                break
+        elif field_number not in group_numbers or entry < 0:
+            break
+        end += 1
+        column_index = columns_by_number.get(field_number)
+        if (
+                column_index is not None and
+                raw_columns[column_index][entry] is None
+        ):
+            raw_columns[column_index][entry] = value
+    if entry + 1 != count:
+        raise DecodingError(
+            f'expected {count} entries in {group} but found {entry + 1}'
+        )
+
+    # Decode the rest of the message with the group emptied.
+    message: MutableMapping[str, Any] = {}
+    _decode_encoded_message(
+        protocol,
+        (
+            encoded_message[:start - 1] +
+            [(group_number, b'=', b'0')] +
+            encoded_message[end:]
+        ) if start else encoded_message,
+        message,
+        strict,
+        False,
+        None
+    )
+    if validate:
+        assert_message_valid(
+            protocol,
+            buf,
+            encoded_message,
+            sep,
+            convert_sep_for_checksum
+        )
+
+    record_columns = [
+        _to_column(numpy, protocol, field, raw, is_categorical=False)
+        for field, raw in zip(selected, raw_columns)
+    ]
+    records = numpy.empty(
+        count,
+        [
+            (column.field.name, column.values.dtype)
+            for column in record_columns
+        ]
+    )
+    for column in record_columns:
+        values = column.values
+        if values.dtype.kind in 'fmM' and column.mask.any():
+            values[column.mask] = (
+                numpy.nan if values.dtype.kind == 'f'
+                else numpy.array('NaT', values.dtype)
+            )
+        records[column.field.name] = values
+
+    message[group] = records
+    return message, meta_data
@@ -1,6 +1,9 @@
 """Common Code"""
 
-from typing import Any, List, Tuple, Union
+from datetime import date
+from types import ModuleType
+from typing import Any, List, Optional, Sequence, Tuple, Union
+from zlib import adler32
 
 from ..meta_data import ProtocolMetaData, FieldMetaData
 from ..types import ValueType
@@ -13,6 +16,66 @@ UTCTIMESTAMP_FMT_NO_MILLIS = '%Y%m%d-%H:%M:%S'
 UTCTIMEONLY_FMT_MILLIS = '%H:%M:%S.%f'
 UTCTIMEONLY_FMT_NO_MILLIS = '%H:%M:%S'
 
+# Constants for integer nanosecond times.
+NANOS_PER_SECOND = 1000000000
+NANOS_PER_DAY = 86400 * NANOS_PER_SECOND
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+# An adler32 started from zero holds the sum of the bytes modulo 65521 in its
+# low 16 bits, which is exact for up to 256 bytes.
+_SUM_CHUNK_SIZE = 256
+
+
+def sum_bytes(buf: Any, start: int = 0, end: Optional[int] = None) -> int:
+    """Sum the bytes of a buffer without copying it.
+
+    The sum is calculated in C over chunks of the buffer, which is much faster
+    than summing the bytes in Python.
+
+    Args:
+        buf (Any): A buffer supporting the buffer protocol.
+        start (int, optional): The offset to start from. Defaults to 0.
+        end (Optional[int], optional): The offset to end at. Defaults to None.
+
+    Returns:
+        int: The sum of the bytes.
+    """
+    with memoryview(buf) as view:
+        region = view[start:end]
+        return sum([
+            adler32(region[index:index + _SUM_CHUNK_SIZE], 0) & 0xffff
+            for index in range(0, len(region), _SUM_CHUNK_SIZE)
+        ])
+
+
+def checksum_sum(
+        buf: Any,
+        end: int,
+        sep: bytes = SOH,
+        convert_sep_to_soh_for_checksum: bool = False
+) -> int:
+    """Calculate the checksum of the start of a buffer as an integer.
+
+    When the separator is converted the buffer is not copied. Instead the sum
+    is adjusted by the difference between the separator and SOH for each
+    separator found.
+
+    Args:
+        buf (Any): The FIX message buffer.
+        end (int): The end of the bytes included in the checksum.
+        sep (bytes, optional): The separator. Defaults to SOH.
+        convert_sep_to_soh_for_checksum (bool, optional): If true calculate
+            the checksum as if the separator was SOH. Defaults to False.
+
+    Returns:
+        int: The checksum.
+    """
+    total = sum_bytes(buf, 0, end)
+    if sep != SOH and convert_sep_to_soh_for_checksum:
+        total -= buf.count(sep, 0, end) * (sum(sep) - SOH[0])
+    return total % 256
+
 
 def calc_checksum(
         buf: bytes,
@@ -35,34 +98,95 @@ def calc_checksum(
     Returns:
         bytes: The checksum.
     """
-    if sep != SOH and convert_sep_to_soh_for_checksum:
-        buf = buf.replace(sep, SOH)
+    check_sum = checksum_sum(
+        buf,
+        len(buf) - len(b'10=000') - len(sep),
+        sep,
+        convert_sep_to_soh_for_checksum
+    )
+    return b'%03d' % check_sum
 
-    check_sum = sum(buf[:-len(b'10=000\x01')]) % 256
-    return f'{check_sum:#03}'.encode('ascii')
+
+def calc_checksums(
+        buffers: Sequence[bytes],
+        sep: bytes = SOH,
+        convert_sep_to_soh_for_checksum: bool = False
+) -> List[bytes]:
+    """Calculate the checksums of a batch of FIX messages.
+
+    If NumPy is installed the bytes of all the messages are summed in a single
+    call, otherwise each checksum is calculated with `calc_checksum`.
+
+    Args:
+        buffers (Sequence[bytes]): The FIX message buffers.
+        sep (bytes, optional): The separator. Defaults to SOH.
+        convert_sep_to_soh_for_checksum (bool, optional): If true convert the
+            separator to SOH before calculating the checksum. Defaults to False.
+
+    Returns:
+        List[bytes]: The checksums.
+    """
+    # NumPy is optional, so it is imported when it is first needed.
+    np: Optional[ModuleType]
+    try:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        np = None
+
+    if np is None or not buffers:
+        return [
+            calc_checksum(buf, sep, convert_sep_to_soh_for_checksum)
+            for buf in buffers
+        ]
+
+    data = np.frombuffer(b''.join(buffers), np.uint8)
+    lengths = np.fromiter(map(len, buffers), np.int64, len(buffers))
+    ends = np.cumsum(lengths)
+    # Sum from the start of each message to the start of its checksum field,
+    # discarding the sums between the messages.
+    bounds = np.empty(len(buffers) * 2, np.int64)
+    bounds[0::2] = ends - lengths
+    bounds[1::2] = ends - len(b'10=000') - len(sep)
+    totals = np.add.reduceat(data, bounds, dtype=np.int64)[0::2]
+    if sep != SOH and convert_sep_to_soh_for_checksum:
+        totals -= np.fromiter(
+            (
+                buf.count(sep, 0, len(buf) - len(b'10=000') - len(sep))
+                for buf in buffers
+            ),
+            np.int64,
+            len(buffers)
+        ) * (sum(sep) - SOH[0])
+    return [b'%03d' % check_sum for check_sum in (totals % 256).tolist()]
 
 
 def calc_body_length(
         buf: bytes,
-        encoded_message: List[Tuple[bytes, bytes]],
+        encoded_message: List[Tuple[bytes, bytes, bytes]],
         sep: bytes = SOH
 ) -> int:
     """Calculate the body length
 
+    The body is everything between the body length field and the checksum
+    field. Its length is found from the lengths of the tokenized fields, without
+    re-encoding them.
+
     Args:
         buf (bytes): The FIX message buffer
-        encoded_message (List[Tuple[bytes, bytes]]): The encoded FIX message
+        encoded_message (List[Tuple[bytes, bytes, bytes]]): The tokenized FIX
+            message
         sep (bytes, optional): The message separator. Defaults to SOH.
 
     Returns:
         int: The length of the body.
     """
-    header = sep.join([
-        b'='.join(field_value)
-        for field_value in encoded_message[:2]
-    ]) + sep
-    trailer = b'='.join(encoded_message[-1]) + sep
-    body_length = len(buf) - len(header) - len(trailer)
+    header_length = sum(
+        len(field_number) + 1 + len(value) + len(sep)
+        for field_number, _, value in encoded_message[:2]
+    )
+    field_number, _, value = encoded_message[-1]
+    trailer_length = len(field_number) + 1 + len(value) + len(sep)
+    body_length = len(buf) - header_length - trailer_length
     return body_length
 
 
@@ -0,0 +1,83 @@
+"""A copy on write FIX message"""
+
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set
+)
+
+
+class CopyOnWriteMessage(MutableMapping[str, Any]):
+    """A message mapping which copies a shared message when it is changed.
+
+    The shared message is never modified. The top level of the message is
+    copied on the first write, and the entries of a group are wrapped when the
+    group is first read, so they are copied only if they are changed.
+
+    ```python
+    fix_message = FixMessage(
+        protocol,
+        CopyOnWriteMessage(shared_message),
+        copy=False
+    )
+    ```
+    """
+
+    def __init__(self, message: Mapping[str, Any]) -> None:
+        """Initialise the copy on write message.
+
+        Args:
+            message (Mapping[str, Any]): The shared message.
+        """
+        self._source = message
+        self._copy: Optional[Dict[str, Any]] = None
+        # The keys with values belonging to this message.
+        self._owned: Set[str] = set()
+
+    def _own(self) -> Dict[str, Any]:
+        if self._copy is None:
+            self._copy = dict(self._source)
+        return self._copy
+
+    @property
+    def _message(self) -> Mapping[str, Any]:
+        return self._source if self._copy is None else self._copy
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._message[key]
+        if isinstance(value, list) and key not in self._owned:
+            groups: List[Any] = [
+                CopyOnWriteMessage(group)
+                for group in value
+            ]
+            self._own()[key] = groups
+            self._owned.add(key)
+            return groups
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._own()[key] = value
+        self._owned.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._own()[key]
+        self._owned.discard(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._message)
+
+    def __len__(self) -> int:
+        return len(self._message)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._message
+
+    def __str__(self) -> str:
+        return f'CopyOnWriteMessage: {dict(self.items())}'
+
+    __repr__ = __str__
@@ -0,0 +1,324 @@
+"""Compiled decode plans
+
+Decoding a message requires flattened lookup tables for the header, body and
+trailer members. Building these is more expensive than the decoding itself, so
+they are compiled once per protocol (and per message type for the body) and
+cached on the protocol meta data.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    cast
+)
+
+from ..meta_data import (
+    ProtocolMetaData,
+    FieldMetaData,
+    MessageMemberMetaData,
+    MessageMetaData,
+    message_member_iter
+)
+
+from .value_decoders import bind_decoder
+
+
+class MemberDecodePlan:
+    """The decode plan for a single field or group"""
+
+    def __init__(
+            self,
+            field: FieldMetaData,
+            is_required: bool,
+            decoder: Callable[[bytes], Any],
+            children: Optional['MembersDecodePlan'] = None
+    ) -> None:
+        """Initialise the member decode plan.
+
+        Args:
+            field (FieldMetaData): The field meta data.
+            is_required (bool): If true the member is required.
+            decoder (Callable[[bytes], Any]): The bound value decoder.
+            children (Optional[MembersDecodePlan], optional): The plan for the
+                members of a group. Defaults to None.
+        """
+        self.field = field
+        self.name = field.name
+        self.number = field.number
+        self.is_required = is_required
+        self.decoder = decoder
+        self.children = children
+        self.is_group = children is not None
+
+    def __str__(self) -> str:
+        return (
+            'MemberDecodePlan: '
+            f'name="{self.name}", '
+            f'is_required={self.is_required}, '
+            f'is_group={self.is_group}'
+        )
+
+    __repr__ = __str__
+
+
+class MembersDecodePlan:
+    """The decode plan for a sequence of members"""
+
+    def __init__(self, members: Sequence[MemberDecodePlan]) -> None:
+        """Initialise the members decode plan.
+
+        Args:
+            members (Sequence[MemberDecodePlan]): The members in declaration
+                order.
+        """
+        self.members = list(members)
+        self.by_number: Dict[bytes, MemberDecodePlan] = {
+            member.number: member
+            for member in self.members
+        }
+        self.required: List[MemberDecodePlan] = [
+            member
+            for member in self.members
+            if member.is_required
+        ]
+
+    def __str__(self) -> str:
+        return f'MembersDecodePlan: members={self.members}'
+
+    __repr__ = __str__
+
+
+def _compile_members(
+        protocol: ProtocolMetaData,
+        message_members: Iterable[MessageMemberMetaData]
+) -> List[MemberDecodePlan]:
+    members: List[MemberDecodePlan] = []
+    for message_member in message_member_iter(
+            cast(Any, message_members)
+    ):
+        field = cast(FieldMetaData, message_member.member)
+        children: Optional[MembersDecodePlan] = None
+        if message_member.type == 'group':
+            assert message_member.children is not None
+            children = MembersDecodePlan(
+                _compile_members(protocol, message_member.children.values())
+            )
+        members.append(
+            MemberDecodePlan(
+                field,
+                message_member.is_required,
+                bind_decoder(protocol, field),
+                children
+            )
+        )
+    return members
+
+
+def _add_fields(
+        fields: Dict[bytes, MemberDecodePlan],
+        members: Sequence[MemberDecodePlan]
+) -> None:
+    for member in members:
+        fields[member.number] = member
+        if member.children is not None:
+            _add_fields(fields, member.children.members)
+
+
+class Projection:
+    """The set of fields to decode from a message.
+
+    The members which are not projected are still checked, but their values
+    are not decoded. A group is decoded in full if it is projected, or with
+    only the projected fields of its entries if it contains projected fields.
+    """
+
+    def __init__(self, fields: FrozenSet[str], groups: FrozenSet[str]) -> None:
+        """Initialise the projection.
+
+        Args:
+            fields (FrozenSet[str]): The names of the projected fields.
+            groups (FrozenSet[str]): The names of the groups containing
+                projected fields.
+        """
+        self.fields = fields
+        self.groups = groups
+
+    def __str__(self) -> str:
+        return f'Projection: fields={set(self.fields)}'
+
+    __repr__ = __str__
+
+
+# A projection of nothing, used to skip over unprojected groups.
+EMPTY_PROJECTION = Projection(frozenset(), frozenset())
+
+
+def _add_groups(
+        message_members: Iterable[MessageMemberMetaData],
+        fields: FrozenSet[str],
+        groups: Set[str]
+) -> bool:
+    # Add the groups containing projected fields, returning true if any of the
+    # members are projected.
+    is_projected = False
+    for message_member in message_member_iter(cast(Any, message_members)):
+        if message_member.member.name in fields:
+            is_projected = True
+        if message_member.type == 'group':
+            assert message_member.children is not None
+            if _add_groups(message_member.children.values(), fields, groups):
+                groups.add(message_member.member.name)
+                is_projected = True
+    return is_projected
+
+
+class ProtocolDecodePlan:
+    """The compiled decode plan for a protocol.
+
+    The header and trailer plans are shared by all messages. The body plans
+    are compiled per message type on first use.
+    """
+
+    def __init__(self, protocol: ProtocolMetaData) -> None:
+        """Initialise the protocol decode plan.
+
+        Args:
+            protocol (ProtocolMetaData): The protocol meta data.
+        """
+        self.protocol = protocol
+
+        # The first three header fields must be in order, the rest can be in
+        # any order.
+        header = _compile_members(protocol, protocol.header.values())
+        self.header_prefix = MembersDecodePlan(header[:3])
+        self.header = MembersDecodePlan(header[3:])
+
+        # Every field which can appear in the header, including group members.
+        self.header_fields: Dict[bytes, MemberDecodePlan] = {}
+        _add_fields(self.header_fields, header)
+
+        # All but the last trailer field can be in any order. The last must be
+        # the checksum.
+        trailer = _compile_members(protocol, protocol.trailer.values())
+        self.trailer = MembersDecodePlan(trailer[:-1])
+        self.trailer_suffix = MembersDecodePlan(trailer[-1:])
+
+        self.bodies: Dict[bytes, MembersDecodePlan] = {}
+        self.projections: Dict[FrozenSet[str], Projection] = {}
+
+    def body(self, meta_data: MessageMetaData) -> MembersDecodePlan:
+        """Get the body plan for a message, compiling it if necessary.
+
+        Args:
+            meta_data (MessageMetaData): The message meta data.
+
+        Returns:
+            MembersDecodePlan: The body decode plan.
+        """
+        plan = self.bodies.get(meta_data.msgtype)
+        if plan is None:
+            plan = MembersDecodePlan(
+                _compile_members(
+                    self.protocol,
+                    cast(Any, meta_data.fields.values())
+                )
+            )
+            self.bodies[meta_data.msgtype] = plan
+        return plan
+
+    def projection(self, fields: Iterable[str]) -> Projection:
+        """Get the projection of a set of fields, compiling it if necessary.
+
+        Args:
+            fields (Iterable[str]): The names of the fields.
+
+        Raises:
+            ValueError: If a field is not in the protocol.
+
+        Returns:
+            Projection: The projection.
+        """
+        field_set = frozenset(fields)
+        projection = self.projections.get(field_set)
+        if projection is None:
+            for name in field_set:
+                if name not in self.protocol.fields_by_name:
+                    raise ValueError(f'unknown field {name}')
+            groups: Set[str] = set()
+            for members in (
+                    self.protocol.header,
+                    self.protocol.trailer,
+                    *(
+                        message.fields
+                        for message in self.protocol.messages_by_name.values()
+                    )
+            ):
+                _add_groups(cast(Any, members).values(), field_set, groups)
+            projection = Projection(field_set, frozenset(groups))
+            self.projections[field_set] = projection
+        return projection
+
+    def __str__(self) -> str:
+        return f'ProtocolDecodePlan: protocol={self.protocol}'
+
+    __repr__ = __str__
+
+
+def get_decode_plan(protocol: ProtocolMetaData) -> ProtocolDecodePlan:
+    """Get the decode plan for a protocol, compiling it on first use.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+
+    Returns:
+        ProtocolDecodePlan: The decode plan.
+    """
+    plan = protocol.decode_plan
+    if plan is None:
+        plan = ProtocolDecodePlan(protocol)
+        protocol.decode_plan = plan
+    return cast(ProtocolDecodePlan, plan)
+
+
+def compile_decode_plan(protocol: ProtocolMetaData) -> ProtocolDecodePlan:
+    """Eagerly compile the decode plans for every message in the protocol.
+
+    This moves the cost of compiling the plans from the first decode of each
+    message type to load time.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+
+    Returns:
+        ProtocolDecodePlan: The decode plan.
+    """
+    plan = get_decode_plan(protocol)
+    for meta_data in protocol.messages_by_type.values():
+        plan.body(meta_data)
+    return plan
+
+
+def compile_projection(
+        protocol: ProtocolMetaData,
+        fields: Iterable[str]
+) -> Projection:
+    """Compile a projection of the fields to decode.
+
+    The projection can be passed to `decode` in place of the field names,
+    avoiding the lookup of the compiled projection on each decode.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        fields (Iterable[str]): The names of the fields to decode.
+
+    Returns:
+        Projection: The projection.
+    """
+    return get_decode_plan(protocol).projection(fields)
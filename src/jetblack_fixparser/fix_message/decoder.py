@@ -2,116 +2,104 @@
 
 from typing import (
     Any,
-    Iterator,
+    Callable,
+    Dict,
+    Iterable,
     List,
     Mapping,
     MutableMapping,
     Optional,
     Set,
     Tuple,
-    Union,
-    ValuesView,
-    cast
+    Union
 )
 
 from ..meta_data import (
     ProtocolMetaData,
-    FieldMetaData,
-    MessageMemberMetaData,
-    message_member_iter,
     MessageMetaData
 )
 from ..types import StrictMode
 
 from .errors import DecodingError
 from .common import SOH
+from .decode_plan import (
+    EMPTY_PROJECTION,
+    MemberDecodePlan,
+    MembersDecodePlan,
+    ProtocolDecodePlan,
+    Projection,
+    get_decode_plan
+)
+from .lazy_message import LazyMessage
+from .tokenizer import Buffer, EncodedField, to_bytes, tokenize
 from .validation import assert_message_valid
-from .value_decoders import decode_value
 from .value_encoders import encode_value
 
 
-def _split_item(item: bytes) -> Tuple[bytes, bytes]:
-    field_id, _, field_value = item.partition(b'=')
-    return field_id, field_value
-
-
-def _to_encoded_message(buf: bytes, sep: bytes) -> List[Tuple[bytes, bytes]]:
-    encoded_message: List[Tuple[bytes, bytes]] = [
-        _split_item(field_value)
-        for field_value in buf.split(sep)
-    ]
-    return encoded_message[:-1]
-
-
-def _find_next_member(
-        received_field: FieldMetaData,
-        meta_data: Iterator[MessageMemberMetaData],
-        strict: bool
-) -> Optional[MessageMemberMetaData]:
-    # Find the next matching field.
-    while True:
-        try:
-            meta_datum = next(meta_data)
-            field = cast(FieldMetaData, meta_datum.member)
-            assert isinstance(field, FieldMetaData), "must be a field"
-            if field.number == received_field.number:
-                return meta_datum
-
-            if meta_datum.is_required and strict:
-                raise DecodingError(
-                    f'required field missing {meta_datum.member.name}'
-                )
-
-        except StopIteration:
-            return None
-
-
 def _decode_fields_in_order(
         protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        encoded_message: List[EncodedField],
         index: int,
-        meta_data: Iterator[MessageMemberMetaData],
+        plan: MembersDecodePlan,
         decoded_message: MutableMapping[str, Any],
         ensure_required: bool,
-        ensure_group_order: bool
+        ensure_group_order: bool,
+        lazy: bool,
+        projection: Optional[Projection]
 ) -> int:
+    members = plan.members
+    position = 0
     while index < len(encoded_message):
 
-        field_number, value = encoded_message[index]
-        received_field = protocol.fields_by_number.get(field_number)
-        if not received_field:
+        field_number, _, value = encoded_message[index]
+        # The tokens hold bytes tags, so the fields are found by hashing them,
+        # which is faster than converting them for the integer tag index.
+        if field_number not in protocol.fields_by_number:
             raise DecodingError(
                 f'received unknown field "{field_number!r}" of value "{value!r}"'
             )
-        meta_datum = _find_next_member(
-            received_field, meta_data, ensure_required)
-        if not meta_datum:
+
+        # Find the next matching member.
+        member: Optional[MemberDecodePlan] = None
+        while position < len(members):
+            candidate = members[position]
+            position += 1
+            if candidate.number == field_number:
+                member = candidate
+                break
+            if candidate.is_required and ensure_required:
+                raise DecodingError(
+                    f'required field missing {candidate.name}'
+                )
+        if member is None:
             break
         index += 1
 
-        if meta_datum.type == 'group':
-            _, index = _decode_group(
+        if member.children is not None:
+            index = _decode_group_member(
                 protocol,
                 encoded_message,
                 index,
-                meta_datum,
+                member,
                 int(value),
+                decoded_message,
                 ensure_required,
-                ensure_group_order
+                ensure_group_order,
+                lazy,
+                projection
             )
-            decoded_message[received_field.name] = value
+        elif projection is not None and member.name not in projection.fields:
+            pass
+        elif lazy:
+            decoded_message[member.name] = (member.decoder, value)
         else:
-            decoded_message[received_field.name] = decode_value(
-                protocol,
-                received_field,
-                value
-            )
+            decoded_message[member.name] = member.decoder(value)
 
     # Check if any members are required.
     required_fields = [
-        meta_datum.member.name
-        for meta_datum in meta_data
-        if meta_datum.is_required
+        member.name
+        for member in members[position:]
+        if member.is_required
     ]
     if len(required_fields) > 0:
         raise DecodingError(f'required fields missing: {required_fields}')
@@ -121,47 +109,55 @@ def _decode_fields_in_order(
 
 def _decode_fields_any_order(
         protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        encoded_message: List[EncodedField],
         index: int,
-        meta_data: MutableMapping[bytes, MessageMemberMetaData],
+        plan: MembersDecodePlan,
         decoded_message: MutableMapping[str, Any],
         ensure_required: bool,
-        ensure_group_order: bool
+        ensure_group_order: bool,
+        lazy: bool,
+        projection: Optional[Projection]
 ) -> int:
-    field_names_found: Set[str] = set()
+    members_by_number = plan.by_number
+    field_numbers_found: Set[bytes] = set()
     while index < len(encoded_message):
 
-        field_number, value = encoded_message[index]
-        received_field = protocol.fields_by_number[field_number]
-        meta_datum = meta_data.get(field_number)
-        if not meta_datum or received_field.name in field_names_found:
+        field_number, _, value = encoded_message[index]
+        if field_number not in protocol.fields_by_number:
+            raise DecodingError(
+                f'received unknown field "{field_number!r}" of value "{value!r}"'
+            )
+        member = members_by_number.get(field_number)
+        if not member or field_number in field_numbers_found:
             break
 
-        field_names_found.add(received_field.name)
+        field_numbers_found.add(field_number)
         index += 1
 
-        if meta_datum.type == 'group':
-            decoded_groups, index = _decode_group(
+        if member.children is not None:
+            index = _decode_group_member(
                 protocol,
                 encoded_message,
                 index,
-                meta_datum,
+                member,
                 int(value),
+                decoded_message,
                 ensure_required,
-                ensure_group_order
+                ensure_group_order,
+                lazy,
+                projection
             )
-            decoded_message[received_field.name] = decoded_groups
+        elif projection is not None and member.name not in projection.fields:
+            pass
+        elif lazy:
+            decoded_message[member.name] = (member.decoder, value)
         else:
-            decoded_message[received_field.name] = decode_value(
-                protocol,
-                received_field,
-                value
-            )
+            decoded_message[member.name] = member.decoder(value)
 
     required_members = [
-        meta_datum.member.name
-        for meta_datum in meta_data.values()
-        if meta_datum.is_required and meta_datum.member.name not in field_names_found
+        member.name
+        for member in plan.required
+        if member.number not in field_numbers_found
     ]
     if len(required_members) > 0:
         raise DecodingError(f'required fields missing: {required_members}')
@@ -171,66 +167,101 @@ def _decode_fields_any_order(
 
 def _decode_group(
         protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        encoded_message: List[EncodedField],
         index: int,
-        meta_data: MessageMemberMetaData,
+        plan: MembersDecodePlan,
         count: int,
+        entry_type: Callable[[], MutableMapping[str, Any]],
         ensure_required: bool,
-        ensure_group_order: bool
+        ensure_group_order: bool,
+        lazy: bool,
+        projection: Optional[Projection]
 ) -> Tuple[List[MutableMapping[str, Any]], int]:
-    assert meta_data.children is not None
+    decode_fields = (
+        _decode_fields_in_order if ensure_group_order
+        else _decode_fields_any_order
+    )
     decoded_groups: List[MutableMapping[str, Any]] = []
-    for _ in range(int(count)):
-        decoded_group: MutableMapping[str, Any] = {}
-        if ensure_group_order:
-            ordered_meta_data = message_member_iter(
-                meta_data.children.values()
-            )
-            index = _decode_fields_in_order(
-                protocol,
-                encoded_message,
-                index,
-                ordered_meta_data,
-                decoded_group,
-                ensure_required,
-                ensure_group_order
-            )
-        else:
-            unordered_meta_data = {
-                cast(FieldMetaData, message_member.member).number: message_member
-                for message_member in message_member_iter(meta_data.children.values())
-            }
-            index = _decode_fields_any_order(
-                protocol,
-                encoded_message,
-                index,
-                unordered_meta_data,
-                decoded_group,
-                ensure_required,
-                ensure_group_order
-            )
-
+    for _ in range(count):
+        decoded_group = entry_type()
+        index = decode_fields(
+            protocol,
+            encoded_message,
+            index,
+            plan,
+            decoded_group,
+            ensure_required,
+            ensure_group_order,
+            lazy,
+            projection
+        )
         decoded_groups.append(decoded_group)
     return decoded_groups, index
 
 
+def _decode_group_member(
+        protocol: ProtocolMetaData,
+        encoded_message: List[EncodedField],
+        index: int,
+        member: MemberDecodePlan,
+        count: int,
+        decoded_message: MutableMapping[str, Any],
+        ensure_required: bool,
+        ensure_group_order: bool,
+        lazy: bool,
+        projection: Optional[Projection]
+) -> int:
+    assert member.children is not None
+    if projection is not None and member.name in projection.fields:
+        # The group is projected, so every member is decoded.
+        projection = None
+    elif projection is not None and member.name not in projection.groups:
+        # Nothing in the group is projected, but it must still be walked.
+        projection = EMPTY_PROJECTION
+    # The entries of a typed message are instances of its group classes.
+    group_classes = getattr(decoded_message, 'groups', None)
+    entry_type = (
+        dict if group_classes is None or projection is EMPTY_PROJECTION
+        else group_classes[member.name]
+    )
+    decoded_groups, index = _decode_group(
+        protocol,
+        encoded_message,
+        index,
+        member.children,
+        count,
+        entry_type,
+        ensure_required,
+        ensure_group_order,
+        lazy,
+        projection
+    )
+    if projection is not EMPTY_PROJECTION:
+        decoded_message[member.name] = decoded_groups
+    return index
+
+
 def _decode_header(
         protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        plan: ProtocolDecodePlan,
+        encoded_message: List[EncodedField],
         decoded_message: MutableMapping[str, Any],
         ensure_required: bool,
-        ensure_group_order: bool
+        ensure_group_order: bool,
+        lazy: bool,
+        projection: Optional[Projection]
 ) -> int:
     # The first three header fields must be in order.
-    header_fields = list(message_member_iter(protocol.header.values()))
     index = _decode_fields_in_order(
         protocol,
         encoded_message,
         0,
-        iter(header_fields[:3]),
+        plan.header_prefix,
         decoded_message,
         ensure_required,
-        ensure_group_order
+        ensure_group_order,
+        lazy,
+        projection
     )
 
     # The rest can be in any order.
@@ -238,13 +269,12 @@ def _decode_header(
         protocol,
         encoded_message,
         index,
-        {
-            cast(FieldMetaData, message_member.member).number: message_member
-            for message_member in header_fields[3:]
-        },
+        plan.header,
         decoded_message,
         ensure_required,
-        ensure_group_order
+        ensure_group_order,
+        lazy,
+        projection
     )
 
     return index
@@ -252,32 +282,27 @@ def _decode_header(
 
 def _decode_body(
         protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        plan: ProtocolDecodePlan,
+        encoded_message: List[EncodedField],
         index: int,
         meta_data: MessageMetaData,
         decoded_message: MutableMapping[str, Any],
         ensure_required: bool,
-        ensure_group_order: bool
+        ensure_group_order: bool,
+        lazy: bool,
+        projection: Optional[Projection]
 ) -> int:
-    body_meta_data = {
-        cast(FieldMetaData, message_member.member).number: message_member
-        for message_member in message_member_iter(
-            cast(
-                ValuesView[MessageMemberMetaData],
-                meta_data.fields.values()
-            )
-        )
-    }
-
     # Body fields can be in any order
     index = _decode_fields_any_order(
         protocol,
         encoded_message,
         index,
-        body_meta_data,
+        plan.body(meta_data),
         decoded_message,
         ensure_required,
-        ensure_group_order
+        ensure_group_order,
+        lazy,
+        projection
     )
 
     return index
@@ -285,25 +310,26 @@ def _decode_body(
 
 def _decode_trailer(
         protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        plan: ProtocolDecodePlan,
+        encoded_message: List[EncodedField],
         index: int,
         decoded_message: MutableMapping[str, Any],
         ensure_required: bool,
-        ensure_group_order: bool
+        ensure_group_order: bool,
+        lazy: bool,
+        projection: Optional[Projection]
 ) -> int:
     # All but the last field can be in any order.
-    trailer_fields = list(message_member_iter(protocol.trailer.values()))
     index = _decode_fields_any_order(
         protocol,
         encoded_message,
         index,
-        {
-            cast(FieldMetaData, message_member.member).number: message_member
-            for message_member in trailer_fields[:-1]
-        },
+        plan.trailer,
         decoded_message,
         ensure_required,
-        ensure_group_order
+        ensure_group_order,
+        lazy,
+        projection
     )
 
     # The last field should be the checksum.
@@ -311,10 +337,12 @@ def _decode_trailer(
         protocol,
         encoded_message,
         index,
-        iter(trailer_fields[-1:]),
+        plan.trailer_suffix,
         decoded_message,
         ensure_required,
-        ensure_group_order
+        ensure_group_order,
+        lazy,
+        projection
     )
 
     return index
@@ -343,26 +371,136 @@ def find_message_meta_data(
     return meta_data
 
 
+def _find_encoded_message_meta_data(
+        protocol: ProtocolMetaData,
+        encoded_message: List[EncodedField],
+        header_end: int
+) -> MessageMetaData:
+    # The message type is taken from the tokens, as it may not be projected.
+    for field_number, _, value in encoded_message[:header_end]:
+        if field_number == b'35':
+            meta_data = protocol.messages_by_type.get(value)
+            if meta_data is None:
+                raise DecodingError(f'unknown message type {value!r}')
+            return meta_data
+    raise DecodingError('message type not found')
+
+
+def _decode_encoded_message(
+        protocol: ProtocolMetaData,
+        encoded_message: List[EncodedField],
+        decoded_message: MutableMapping[str, Any],
+        strict: StrictMode,
+        lazy: bool,
+        projection: Optional[Projection]
+) -> MessageMetaData:
+    plan = get_decode_plan(protocol)
+
+    index = _decode_header(
+        protocol,
+        plan,
+        encoded_message,
+        decoded_message,
+        StrictMode.ENSURE_REQUIRED in strict,
+        StrictMode.ENSURE_GROUP_ORDER in strict,
+        lazy,
+        projection
+    )
+    meta_data = _find_encoded_message_meta_data(
+        protocol,
+        encoded_message,
+        index
+    )
+
+    index = _decode_body(
+        protocol,
+        plan,
+        encoded_message,
+        index,
+        meta_data,
+        decoded_message,
+        StrictMode.ENSURE_REQUIRED in strict,
+        StrictMode.ENSURE_GROUP_ORDER in strict,
+        lazy,
+        projection
+    )
+
+    _decode_trailer(
+        protocol,
+        plan,
+        encoded_message,
+        index,
+        decoded_message,
+        StrictMode.ENSURE_REQUIRED in strict,
+        StrictMode.ENSURE_GROUP_ORDER in strict,
+        lazy,
+        projection
+    )
+
+    return meta_data
+
+
 def decode(
         protocol: ProtocolMetaData,
-        buf: bytes,
+        buf: Buffer,
         *,
         strict: Union[bool, StrictMode] = True,
         validate: bool = True,
         sep: bytes = SOH,
-        convert_sep_for_checksum: bool = True
+        convert_sep_for_checksum: bool = True,
+        lazy: bool = False,
+        fields: Optional[Union[Iterable[str], Projection]] = None,
+        into: Optional[MutableMapping[str, Any]] = None
 ) -> Tuple[MutableMapping[str, Any], MessageMetaData]:
     """Decode a FIX bytes buffer
 
+    When fields are given only those fields are decoded. The structure of the
+    message is still checked, and the message validated, but the values of
+    the other fields are skipped. A projected group is decoded in full, and a
+    group containing projected fields is decoded with only those fields.
+
+    ```python
+    message, meta_data = decode(
+        protocol,
+        buf,
+        fields={'MsgType', 'Symbol', 'MDEntryPx'}
+    )
+    ```
+
+    A handler which is done with each message before decoding the next can
+    pass the same mapping to every call with `into`. It is cleared, and the
+    fields decoded into it, so no message dictionary is allocated. The
+    entries of the groups are still new dictionaries.
+
+    ```python
+    message: Dict[str, Any] = {}
+    for buf in buffers:
+        decode(protocol, buf, into=message)
+        on_message(message)
+    ```
+
     Args:
         protocol (ProtocolMetaData): The protocol meta data.
-        buf (bytes): The FIX bytes buffer.
+        buf (Buffer): The FIX bytes buffer as bytes, a bytearray, or a
+            memoryview.
         strict (bool, optional): If true use strict validation. Defaults to True.
         validate (bool, optional): If true validate the message. Defaults to
             True.
         sep (bytes, optional): The field separator. Defaults to SOH.
         convert_sep_for_checksum (bool, optional): If true convert the separator
             before calculating the checksum. Defaults to True.
+        lazy (bool, optional): If true the structure of the message is checked,
+            but the values are only decoded when they are first read. Defaults
+            to False.
+        fields (Optional[Union[Iterable[str], Projection]], optional): The
+            names of the fields to decode, or a projection compiled by
+            `compile_projection`. Defaults to None, which decodes every field.
+        into (Optional[MutableMapping[str, Any]], optional): A mapping to
+            reuse for the message, which is cleared before decoding. Defaults
+            to None, which creates a new dictionary.
+
+    Raises:
+        ValueError: If a projected field is not in the protocol.
 
     Returns:
         Tuple[MutableMapping[str, Any], MessageMetaData]: The message and it's
@@ -371,35 +509,28 @@ def decode(
     if isinstance(strict, bool):
         strict = StrictMode.ALL if strict else StrictMode.NONE
 
-    encoded_message = _to_encoded_message(buf, sep)
-    decoded_message: MutableMapping[str, Any] = {}
-
-    index = _decode_header(
-        protocol,
-        encoded_message,
-        decoded_message,
-        StrictMode.ENSURE_REQUIRED in strict,
-        StrictMode.ENSURE_GROUP_ORDER in strict
+    plan = get_decode_plan(protocol)
+    projection = (
+        fields if fields is None or isinstance(fields, Projection)
+        else plan.projection(fields)
     )
-    meta_data = find_message_meta_data(protocol, decoded_message)
-
-    index = _decode_body(
+    buf = to_bytes(buf)
+    encoded_message = tokenize(buf, sep)
+    decoded_message: MutableMapping[str, Any]
+    if into is None:
+        decoded_message = {}
+    else:
+        into.clear()
+        decoded_message = into
+    message = LazyMessage(decoded_message) if lazy else decoded_message
+
+    meta_data = _decode_encoded_message(
         protocol,
         encoded_message,
-        index,
-        meta_data,
         decoded_message,
-        StrictMode.ENSURE_REQUIRED in strict,
-        StrictMode.ENSURE_GROUP_ORDER in strict
-    )
-
-    _decode_trailer(
-        protocol,
-        encoded_message,
-        index,
-        decoded_message,
-        StrictMode.ENSURE_REQUIRED in strict,
-        StrictMode.ENSURE_GROUP_ORDER in strict
+        strict,
+        lazy,
+        projection
     )
 
     if validate:
@@ -407,9 +538,64 @@ def decode(
             protocol,
             buf,
             encoded_message,
-            decoded_message,
             sep,
             convert_sep_for_checksum
         )
 
-    return decoded_message, meta_data
+    return message, meta_data
+
+
+def peek_header(
+        protocol: ProtocolMetaData,
+        buf: Buffer,
+        fields: Iterable[str] = (
+            'MsgType',
+            'SenderCompID',
+            'TargetCompID',
+            'MsgSeqNum'
+        ),
+        *,
+        sep: bytes = SOH
+) -> Dict[str, Any]:
+    """Decode some header fields without decoding the message.
+
+    The buffer is only scanned until the requested fields have been found or
+    the end of the header is reached. The message is not validated.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        buf (Buffer): The FIX bytes buffer as bytes, a bytearray, or a
+            memoryview.
+        fields (Iterable[str], optional): The names of the header fields.
+            Defaults to ('MsgType', 'SenderCompID', 'TargetCompID',
+            'MsgSeqNum').
+        sep (bytes, optional): The field separator. Defaults to SOH.
+
+    Returns:
+        Dict[str, Any]: The decoded values of the fields which were found.
+    """
+    buf = to_bytes(buf)
+    header_fields = get_decode_plan(protocol).header_fields
+    wanted = {
+        protocol.fields_by_name[name].number
+        for name in fields
+    }
+    decoded_fields: Dict[str, Any] = {}
+
+    start = 0
+    while wanted and start < len(buf):
+        end = buf.find(sep, start)
+        if end == -1:
+            end = len(buf)
+        equals = buf.find(b'=', start, end)
+        field_number = buf[start:equals]
+        member = header_fields.get(field_number)
+        if member is None:
+            # This is the end of the header.
+            break
+        if field_number in wanted:
+            wanted.discard(field_number)
+            decoded_fields[member.name] = member.decoder(buf[equals + 1:end])
+        start = end + len(sep)
+
+    return decoded_fields
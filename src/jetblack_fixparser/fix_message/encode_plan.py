@@ -0,0 +1,171 @@
+"""Compiled encode plans
+
+Encoding a message walks the header, body and trailer members in declaration
+order. The flattened member order, the encoded tag prefixes and the bound
+value encoders are compiled once per message type and cached on the protocol
+meta data.
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    cast
+)
+
+from ..meta_data import (
+    ProtocolMetaData,
+    FieldMetaData,
+    MessageMemberMetaData,
+    MessageMetaData,
+    message_member_iter
+)
+
+from .errors import EncodingError
+from .value_encoders import bind_encoder
+
+
+class MemberEncodePlan:
+    """The encode plan for a single field or group"""
+
+    def __init__(
+            self,
+            field: FieldMetaData,
+            is_required: bool,
+            encoder: Callable[[Any], bytes],
+            children: Optional[List['MemberEncodePlan']] = None
+    ) -> None:
+        """Initialise the member encode plan.
+
+        Args:
+            field (FieldMetaData): The field meta data.
+            is_required (bool): If true the member is required.
+            encoder (Callable[[Any], bytes]): The bound value encoder.
+            children (Optional[List[MemberEncodePlan]], optional): The plan for
+                the members of a group. Defaults to None.
+        """
+        self.field = field
+        self.name = field.name
+        self.number = field.number
+        self.prefix = field.number + b'='
+        self.is_required = is_required
+        self.encoder = encoder
+        self.children = children
+
+    def __str__(self) -> str:
+        return (
+            'MemberEncodePlan: '
+            f'name="{self.name}", '
+            f'is_required={self.is_required}, '
+            f'is_group={self.children is not None}'
+        )
+
+    __repr__ = __str__
+
+
+def _compile_members(
+        protocol: ProtocolMetaData,
+        message_members: Iterable[MessageMemberMetaData]
+) -> List[MemberEncodePlan]:
+    members: List[MemberEncodePlan] = []
+    for message_member in message_member_iter(cast(Any, message_members)):
+        children: Optional[List[MemberEncodePlan]] = None
+        if message_member.type == 'group':
+            assert message_member.children is not None
+            children = _compile_members(
+                protocol,
+                message_member.children.values()
+            )
+        elif message_member.type != 'field':
+            raise EncodingError(
+                f'unknown type "{message_member.type}" '
+                f'for item "{message_member.member.name}"'
+            )
+        field = cast(FieldMetaData, message_member.member)
+        members.append(
+            MemberEncodePlan(
+                field,
+                message_member.is_required,
+                bind_encoder(protocol, field),
+                children
+            )
+        )
+    return members
+
+
+class ProtocolEncodePlan:
+    """The compiled encode plan for a protocol.
+
+    Each message plan is the flattened header, body and trailer members, and
+    is compiled per message type on first use.
+    """
+
+    def __init__(self, protocol: ProtocolMetaData) -> None:
+        """Initialise the protocol encode plan.
+
+        Args:
+            protocol (ProtocolMetaData): The protocol meta data.
+        """
+        self.protocol = protocol
+        self.header = _compile_members(protocol, protocol.header.values())
+        self.trailer = _compile_members(protocol, protocol.trailer.values())
+        self.messages: Dict[bytes, List[MemberEncodePlan]] = {}
+
+    def message(self, meta_data: MessageMetaData) -> List[MemberEncodePlan]:
+        """Get the plan for a message, compiling it if necessary.
+
+        Args:
+            meta_data (MessageMetaData): The message meta data.
+
+        Returns:
+            List[MemberEncodePlan]: The members of the header, body and
+                trailer in encoding order.
+        """
+        plan = self.messages.get(meta_data.msgtype)
+        if plan is None:
+            body = _compile_members(
+                self.protocol,
+                cast(Any, meta_data.fields.values())
+            )
+            plan = self.header + body + self.trailer
+            self.messages[meta_data.msgtype] = plan
+        return plan
+
+    def __str__(self) -> str:
+        return f'ProtocolEncodePlan: protocol={self.protocol}'
+
+    __repr__ = __str__
+
+
+def get_encode_plan(protocol: ProtocolMetaData) -> ProtocolEncodePlan:
+    """Get the encode plan for a protocol, compiling it on first use.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+
+    Returns:
+        ProtocolEncodePlan: The encode plan.
+    """
+    plan = protocol.encode_plan
+    if plan is None:
+        plan = ProtocolEncodePlan(protocol)
+        protocol.encode_plan = plan
+    return cast(ProtocolEncodePlan, plan)
+
+
+def compile_encode_plan(protocol: ProtocolMetaData) -> ProtocolEncodePlan:
+    """Eagerly compile the encode plans for every message in the protocol.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+
+    Returns:
+        ProtocolEncodePlan: The encode plan.
+    """
+    plan = get_encode_plan(protocol)
+    for meta_data in protocol.messages_by_type.values():
+        plan.message(meta_data)
+    return plan
@@ -2,99 +2,89 @@
 
 from typing import (
     Any,
-    Iterator,
     List,
     Mapping,
     MutableMapping,
-    Tuple,
-    ValuesView,
-    cast
+    Tuple
 )
 
 from ..meta_data import (
-    message_member_iter,
-    MessageMemberMetaData,
     MessageMetaData,
     ProtocolMetaData
 )
-from ..meta_data.message_member import FieldMetaData
 
 from .errors import EncodingError
-from .common import SOH
-from .value_encoders import encode_value
+from .common import SOH, checksum_sum
+from .encode_plan import MemberEncodePlan, get_encode_plan
+
+_MISSING = object()
 
 
 def _encode_fields(
-        protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        encoded_message: List[bytes],
         data: Mapping[str, Any],
-        meta_data: Iterator[MessageMemberMetaData]
+        members: List[MemberEncodePlan]
 ) -> None:
-    for meta_datum in meta_data:
+    for member in members:
+        item_data = data.get(member.name, _MISSING)
+
         # Check for required fields.
-        if meta_datum.member.name not in data:
-            if meta_datum.is_required:
+        if item_data is _MISSING:
+            if member.is_required:
                 raise EncodingError(
-                    f'required field "{meta_datum.member.name}" is missing'
+                    f'required field "{member.name}" is missing'
                 )
             continue
 
-        item_data = data[meta_datum.member.name]
-        if meta_datum.type == 'field':
-            field_member = cast(FieldMetaData, meta_datum.member)
-            value = encode_value(protocol, field_member, item_data)
-            encoded_message.append((field_member.number, value))
-        elif meta_datum.type == 'group':
-            field_member = cast(FieldMetaData, meta_datum.member)
-            item_list = cast(List[Mapping[str, Any]], item_data)
-            value = encode_value(protocol, field_member, len(item_list))
-            encoded_message.append((field_member.number, value))
-            assert meta_datum.children is not None
-            for group_item in item_list:
-                _encode_fields(
-                    protocol,
-                    encoded_message,
-                    group_item,
-                    message_member_iter(meta_datum.children.values())
-                )
+        if member.children is None:
+            encoded_message.append(member.prefix + member.encoder(item_data))
         else:
-            raise EncodingError(
-                f'unknown type "{meta_datum.type}" for item "{meta_datum.member.name}"'
+            encoded_message.append(
+                member.prefix + member.encoder(len(item_data))
             )
+            for group_item in item_data:
+                _encode_fields(encoded_message, group_item, member.children)
 
 
 def _regenerate_integrity(
         protocol: ProtocolMetaData,
-        encoded_message: List[Tuple[bytes, bytes]],
+        encoded_message: List[bytes],
         sep: bytes,
         convert_sep_for_checksum: bool
 ) -> Tuple[bytes, int, str]:
-    body = sep.join(
-        field + b'=' + value
-        for field, value in encoded_message[2:-1]
-    ) + sep
-    body_length = len(body)
-
-    encoded_header = [
-        (protocol.fields_by_name['BeginString'].number, protocol.begin_string),
-        (protocol.fields_by_name['BodyLength'].number,
-         str(body_length).encode('ascii'))
-    ]
-    header = sep.join(
-        field + b'=' + value
-        for field, value in encoded_header
-    ) + sep
-
-    buf = header + body
-
-    # Calculate the checksum
-    checksum = sum(
-        buf if sep == SOH or not convert_sep_for_checksum
-        else buf.replace(sep, SOH)
+    # The body is everything after the body length and before the checksum.
+    body = sep.join(encoded_message[2:-1])
+    body_length = len(body) + len(sep)
+
+    # The checksum is found from the sums of the parts, so the message is
+    # only copied by the final join. The begin string and body length are
+    # short, so their bytes are summed directly. The separators are those
+    # after the begin string, the body length and the last body field.
+    sep_sum = sum(SOH if convert_sep_for_checksum else sep)
+    begin_string = protocol.fields_by_name['BeginString'].number + \
+        b'=' + protocol.begin_string
+    encoded_body_length = protocol.fields_by_name['BodyLength'].number + \
+        b'=%d' % body_length
+    checksum = (
+        sum(begin_string) +
+        sum(encoded_body_length) +
+        checksum_sum(body, len(body), sep, convert_sep_for_checksum) +
+        3 * sep_sum
     ) % 256
     checksum_str = f'{checksum:#03}'
-    buf += protocol.fields_by_name['CheckSum'].number + \
-        b'=' + checksum_str.encode('ascii') + sep
+
+    buf = b''.join([
+        begin_string,
+        sep,
+        encoded_body_length,
+        sep,
+        body,
+        sep,
+        protocol.fields_by_name['CheckSum'].number,
+        b'=',
+        checksum_str.encode('ascii'),
+        sep
+    ])
 
     return buf, body_length, checksum_str
 
@@ -123,7 +113,7 @@ def encode(
     Returns:
         bytes: The encoded FIX message as a bytes buffer.
     """
-    encoded_message: List[Tuple[bytes, bytes]] = []
+    encoded_message: List[bytes] = []
 
     if regenerate_integrity:
         data['BeginString'] = protocol.begin_string.decode('ascii')
@@ -131,24 +121,9 @@ def encode(
         data['CheckSum'] = '000'
 
     _encode_fields(
-        protocol,
-        encoded_message,
-        data,
-        message_member_iter(protocol.header.values())
-    )
-    _encode_fields(
-        protocol,
-        encoded_message,
-        data,
-        message_member_iter(
-            cast(ValuesView[MessageMemberMetaData], meta_data.fields.values())
-        )
-    )
-    _encode_fields(
-        protocol,
         encoded_message,
         data,
-        message_member_iter(protocol.trailer.values())
+        get_encode_plan(protocol).message(meta_data)
     )
 
     if regenerate_integrity:
@@ -161,9 +136,6 @@ def encode(
         data['BodyLength'] = body_length
         data['CheckSum'] = checksum
     else:
-        buf = sep.join(
-            field + b'=' + value
-            for field, value in encoded_message
-        ) + sep
+        buf = sep.join(encoded_message) + sep
 
     return buf
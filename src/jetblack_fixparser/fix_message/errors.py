@@ -1,5 +1,7 @@
 """Errors for FIX message parsing"""
 
+from typing import Any, Tuple
+
 from ..meta_data import FieldMetaData
 
 
@@ -29,6 +31,9 @@ class FieldValueError(DecodingError):
         self.expected = expected
         self.received = received
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self.field, self.expected, self.received)
+
 
 class InvalidFieldError(DecodingError):
     """An invalid field error"""
@@ -36,6 +41,11 @@ class InvalidFieldError(DecodingError):
     def __init__(self, field: bytes, value: bytes) -> None:
         super().__init__(
             f'received unknown field {field!r} with value {value!r}')
+        self.field = field
+        self.value = value
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self.field, self.value)
 
 
 class InvalidMsgTypeError(DecodingError):
@@ -43,3 +53,19 @@ class InvalidMsgTypeError(DecodingError):
 
     def __init__(self, msgtype: bytes) -> None:
         super().__init__(f'received unknown msgtype {msgtype!r}')
+        self.msgtype = msgtype
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (self.msgtype,)
+
+
+class FramingError(DecodingError):
+    """A framing error"""
+
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(message)
+        self.position = position
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Errors are pickled when raised in a worker process.
+        return type(self), (str(self), self.position)
@@ -0,0 +1,253 @@
+"""Decoding FIX log files"""
+
+from decimal import InvalidOperation
+import mmap
+import os
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Union
+)
+
+from ..meta_data import ProtocolMetaData, MessageMetaData
+from ..types import StrictMode
+
+from .common import SOH
+from .decode_plan import Projection, compile_projection
+from .decoder import decode
+from .errors import DecodingError, FramingError
+from .framer import find_message
+
+
+def _msgtype(buf: Any, message_start: int, sep: bytes) -> bytes:
+    # The message type is the third field.
+    begin_string_end = buf.find(sep, message_start)
+    body_start = buf.find(sep, begin_string_end + len(sep)) + len(sep)
+    msgtype_end = buf.find(sep, body_start)
+    return bytes(buf[body_start + len(b'35='):msgtype_end])
+
+
+def scan_spans(
+        buf: Any,
+        *,
+        sep: bytes = SOH,
+        begin_string: Optional[bytes] = None,
+        msgtypes: Optional[Set[bytes]] = None,
+        start: int = 0,
+        end: Optional[int] = None,
+        on_error: Optional[Callable[[FramingError], None]] = None
+) -> Iterator[Tuple[int, int]]:
+    """Find the messages in a buffer without copying them.
+
+    Anything between the messages, like line endings or timestamp prefixes, is
+    skipped. When a message is not correctly framed the scan continues from
+    the position of the error, so the next message is found.
+
+    Args:
+        buf (Any): A buffer supporting `find` and slicing, such as an mmap.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        begin_string (Optional[bytes], optional): If given only messages with
+            this begin string are found. Defaults to None.
+        msgtypes (Optional[Set[bytes]], optional): If given only messages with
+            these message types are returned. Defaults to None.
+        start (int, optional): The offset to start from. Defaults to 0.
+        end (Optional[int], optional): If given only messages starting before
+            this offset are returned. Defaults to None.
+        on_error (Optional[Callable[[FramingError], None]], optional): If
+            given this is called with the error for each message which is not
+            correctly framed. The callback may raise to stop the scan.
+            Defaults to None, which skips these messages.
+
+    Yields:
+        Tuple[int, int]: The start and end offsets of each message.
+    """
+    begin = b'8=' if begin_string is None else b'8=' + begin_string + sep
+    if end is None:
+        end = len(buf)
+
+    while True:
+        try:
+            message_start, message_end = find_message(buf, start, sep, begin)
+        except FramingError as error:
+            if error.position > end:
+                return
+            if on_error is not None:
+                on_error(error)
+            start = error.position
+            continue
+        if message_end == -1 or message_start >= end:
+            return
+        start = message_end
+        if msgtypes is None or _msgtype(buf, message_start, sep) in msgtypes:
+            yield message_start, message_end
+
+
+def scan_file(
+        path: Union[str, Path],
+        *,
+        sep: bytes = SOH,
+        begin_string: Optional[bytes] = None,
+        msgtypes: Optional[Iterable[bytes]] = None,
+        on_error: Optional[Callable[[FramingError], None]] = None
+) -> Iterator[bytes]:
+    """Read the messages from a FIX log file.
+
+    The file is memory mapped and framed in place. Each message is copied once,
+    when it is yielded.
+
+    Args:
+        path (Union[str, Path]): The path to the log file.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        begin_string (Optional[bytes], optional): If given only messages with
+            this begin string are read. Defaults to None.
+        msgtypes (Optional[Iterable[bytes]], optional): If given only messages
+            with these message types (e.g. b'8') are read. Defaults to None.
+        on_error (Optional[Callable[[FramingError], None]], optional): If
+            given this is called with the error for each message which is not
+            correctly framed. Defaults to None, which skips these messages.
+
+    Yields:
+        bytes: The message buffers.
+    """
+    msgtype_set = None if msgtypes is None else set(msgtypes)
+    with open(path, 'rb') as file_ptr:
+        # An empty file cannot be memory mapped.
+        if os.fstat(file_ptr.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file_ptr.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            for message_start, message_end in scan_spans(
+                    buf,
+                    sep=sep,
+                    begin_string=begin_string,
+                    msgtypes=msgtype_set,
+                    on_error=on_error
+            ):
+                yield buf[message_start:message_end]
+
+
+def to_msgtypes(
+        protocol: ProtocolMetaData,
+        msgtypes: Optional[Iterable[Union[str, bytes]]]
+) -> Optional[Set[bytes]]:
+    """Convert message names or types to a set of message types.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        msgtypes (Optional[Iterable[Union[str, bytes]]]): The message names or
+            types.
+
+    Returns:
+        Optional[Set[bytes]]: The message types.
+    """
+    if msgtypes is None:
+        return None
+    return {
+        protocol.messages_by_name[msgtype].msgtype
+        if isinstance(msgtype, str) else msgtype
+        for msgtype in msgtypes
+    }
+
+
+def _decode_message(
+        protocol: ProtocolMetaData,
+        buf: bytes,
+        **options: Any
+) -> Tuple[MutableMapping[str, Any], MessageMetaData]:
+    # The value decoders raise a ValueError, or an InvalidOperation for a
+    # Decimal, for a corrupt value. These are raised as decoding errors, so
+    # they are handled like the other errors in a message.
+    try:
+        return decode(protocol, buf, **options)
+    except (ValueError, InvalidOperation) as error:
+        raise DecodingError(f'invalid value: {error}') from error
+
+
+def decode_file(
+        protocol: ProtocolMetaData,
+        path: Union[str, Path],
+        *,
+        sep: bytes = SOH,
+        msgtypes: Optional[Iterable[Union[str, bytes]]] = None,
+        strict: Union[bool, StrictMode] = True,
+        validate: bool = True,
+        convert_sep_for_checksum: bool = True,
+        lazy: bool = False,
+        fields: Optional[Union[Iterable[str], Projection]] = None,
+        on_error: Optional[Callable[[DecodingError], None]] = None
+) -> Iterator[Tuple[MutableMapping[str, Any], MessageMetaData]]:
+    """Decode the messages in a FIX log file.
+
+    Messages which are not correctly framed are skipped. A message which
+    cannot be decoded, including one with a value which cannot be converted,
+    raises a `DecodingError`, unless `on_error` is given.
+
+    ```python
+    for message, meta_data in decode_file(
+            protocol,
+            'fix.log',
+            sep=b'|',
+            msgtypes=['ExecutionReport']
+    ):
+        print(message['OrdStatus'])
+    ```
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        path (Union[str, Path]): The path to the log file.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        msgtypes (Optional[Iterable[Union[str, bytes]]], optional): If given
+            only messages of these types are decoded. Message names (e.g.
+            'ExecutionReport') or message types (e.g. b'8') may be used.
+            Defaults to None.
+        strict (Union[bool, StrictMode], optional): If true use strict
+            validation. Defaults to True.
+        validate (bool, optional): If true validate the messages. Defaults to
+            True.
+        convert_sep_for_checksum (bool, optional): If true convert the separator
+            before calculating the checksum. Defaults to True.
+        lazy (bool, optional): If true values are decoded when they are first
+            read. Defaults to False.
+        fields (Optional[Union[Iterable[str], Projection]], optional): If given
+            only these fields are decoded. Defaults to None.
+        on_error (Optional[Callable[[DecodingError], None]], optional): If
+            given this is called with the error for each message which cannot
+            be framed or decoded, and the message is skipped. The callback may
+            raise to stop decoding. Defaults to None.
+
+    Yields:
+        Tuple[MutableMapping[str, Any], MessageMetaData]: The message and its
+            meta data.
+    """
+    if fields is not None and not isinstance(fields, Projection):
+        fields = compile_projection(protocol, fields)
+    for buf in scan_file(
+            path,
+            sep=sep,
+            begin_string=protocol.begin_string,
+            msgtypes=to_msgtypes(protocol, msgtypes),
+            on_error=on_error
+    ):
+        try:
+            decoded = _decode_message(
+                protocol,
+                buf,
+                strict=strict,
+                validate=validate,
+                sep=sep,
+                convert_sep_for_checksum=convert_sep_for_checksum,
+                lazy=lazy,
+                fields=fields
+            )
+        except DecodingError as error:
+            if on_error is None:
+                raise
+            on_error(error)
+            continue
+        yield decoded
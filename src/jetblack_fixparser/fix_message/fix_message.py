@@ -3,7 +3,15 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any, Mapping, MutableMapping, Optional, Union, cast
+from typing import (
+    Any,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Union,
+    cast
+)
 
 from ..meta_data import (
     ProtocolMetaData,
@@ -13,6 +21,7 @@ from ..types import StrictMode
 
 from .encoder import encode, SOH
 from .decoder import decode, find_message_meta_data
+from .decode_plan import Projection
 
 
 class FixMessage:
@@ -22,10 +31,20 @@ class FixMessage:
             self,
             protocol: ProtocolMetaData,
             message: Mapping[str, Any],
-            meta_data: Optional[MessageMetaData] = None
+            meta_data: Optional[MessageMetaData] = None,
+            *,
+            copy: bool = True
     ) -> None:
         """Initialise the FIX message
 
+        By default the message is deep copied, so changes to the message (for
+        example the integrity fields set when encoding) are not seen by the
+        caller. A deep copy can cost more than decoding the message. When the
+        message is not shared it can be taken without copying by setting
+        `copy` to false (or with `FixMessage.from_owned`). A shared message can
+        be wrapped in a `CopyOnWriteMessage`, which copies only what is
+        changed.
+
         Args:
             protocol (ProtocolMetaData): The protocol meta data.
             message (Mapping[str, Any]): The fix message in the form of a
@@ -33,11 +52,39 @@ class FixMessage:
             meta_data (Optional[MessageMetaData], optional): Optional meta data.
                 If this is not supplied it will be discovered from the protocol
                 meta data. Defaults to None.
+            copy (bool, optional): If true the message is deep copied.
+                Defaults to True.
         """
         self.protocol = protocol
-        self.message = cast(MutableMapping[str, Any], deepcopy(message))
+        self.message = cast(
+            MutableMapping[str, Any],
+            deepcopy(message) if copy else message
+        )
         self.meta_data = meta_data or find_message_meta_data(protocol, message)
 
+    @classmethod
+    def from_owned(
+            cls,
+            protocol: ProtocolMetaData,
+            message: MutableMapping[str, Any],
+            meta_data: Optional[MessageMetaData] = None
+    ) -> FixMessage:
+        """Create a FIX message which takes ownership of the message.
+
+        The message is not copied, so it must not be used by the caller
+        afterwards.
+
+        Args:
+            protocol (ProtocolMetaData): The protocol meta data.
+            message (MutableMapping[str, Any]): The fix message.
+            meta_data (Optional[MessageMetaData], optional): Optional meta data.
+                Defaults to None.
+
+        Returns:
+            FixMessage: The FIX message.
+        """
+        return cls(protocol, message, meta_data, copy=False)
+
     def encode(
             self,
             sep: bytes = SOH,
@@ -75,7 +122,9 @@ class FixMessage:
             strict: Union[bool, StrictMode] = True,
             validate: bool = True,
             sep: bytes = SOH,
-            convert_sep_for_checksum: bool = True
+            convert_sep_for_checksum: bool = True,
+            lazy: bool = False,
+            fields: Optional[Union[Iterable[str], Projection]] = None
     ) -> FixMessage:
         """Decode a FIX bytes buffer.
 
@@ -89,6 +138,10 @@ class FixMessage:
             sep (bytes, optional): The field separator. Defaults to SOH.
             convert_sep_for_checksum (bool, optional): If true convert the
                 separator before calculating the checksum. Defaults to True.
+            lazy (bool, optional): If true the values are decoded when they are
+                first read. Defaults to False.
+            fields (Optional[Union[Iterable[str], Projection]], optional): If
+                given only these fields are decoded. Defaults to None.
 
         Returns:
             FixMessage: A class containing the decoded message.
@@ -99,6 +152,8 @@ class FixMessage:
             strict=strict,
             validate=validate,
             sep=sep,
-            convert_sep_for_checksum=convert_sep_for_checksum
+            convert_sep_for_checksum=convert_sep_for_checksum,
+            lazy=lazy,
+            fields=fields
         )
-        return FixMessage(protocol, message, meta_data)
+        return FixMessage.from_owned(protocol, message, meta_data)
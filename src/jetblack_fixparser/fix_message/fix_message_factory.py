@@ -1,11 +1,14 @@
 """FIX message factory"""
 
+from copy import deepcopy
 from datetime import datetime
-from typing import Any, Mapping, Optional
+from typing import Any, Iterable, Mapping, Optional, Sequence, Union
 
 from ..meta_data import ProtocolMetaData
 
+from .decode_plan import Projection, compile_projection
 from .fix_message import FixMessage, SOH
+from .template import MessageTemplate
 
 
 class FixMessageFactory:
@@ -21,7 +24,9 @@ class FixMessageFactory:
             validate: bool = True,
             sep: bytes = SOH,
             convert_sep_for_checksum: bool = True,
-            header_kwargs: Optional[Mapping[str, Any]] = None
+            header_kwargs: Optional[Mapping[str, Any]] = None,
+            lazy: bool = False,
+            fields: Optional[Union[Iterable[str], Projection]] = None
     ) -> None:
         """Initialise the message factory
 
@@ -38,6 +43,10 @@ class FixMessageFactory:
                 separator before calculating the checksum. Defaults to True.
             header_kwargs (Optional[Mapping[str, Any]], optional): Extra header
                 args. Defaults to None.
+            lazy (bool, optional): If true decoded values are converted when
+                they are first read. Defaults to False.
+            fields (Optional[Union[Iterable[str], Projection]], optional): If
+                given only these fields are decoded. Defaults to None.
         """
         self.protocol = protocol
         self.sender_comp_id = sender_comp_id
@@ -47,6 +56,11 @@ class FixMessageFactory:
         self.sep = sep
         self.convert_sep_for_checksum = convert_sep_for_checksum
         self.header_kwargs = header_kwargs
+        self.lazy = lazy
+        self.fields = (
+            fields if fields is None or isinstance(fields, Projection)
+            else compile_projection(protocol, fields)
+        )
 
     def create(
             self,
@@ -59,6 +73,9 @@ class FixMessageFactory:
     ) -> FixMessage:
         """Create a FIX message
 
+        The groups passed in the kwargs are copied, so the caller may reuse
+        them. The message itself is built here, so it is not deep copied.
+
         Args:
             msg_type (str): The message type.
             msg_seq_num (int): The message sequence number.
@@ -104,7 +121,54 @@ class FixMessageFactory:
                 if name in trailer_kwargs
             })
 
-        return FixMessage(self.protocol, data)
+        # The message was built here, so only the groups, which are the only
+        # mutable values, need to be copied.
+        for name, value in data.items():
+            if isinstance(value, list):
+                data[name] = deepcopy(value)
+
+        return FixMessage.from_owned(self.protocol, data)
+
+    def create_template(
+            self,
+            msg_type: str,
+            variable_fields: Sequence[str] = (),
+            body_kwargs: Optional[Mapping[str, Any]] = None,
+            header_kwargs: Optional[Mapping[str, Any]] = None,
+            trailer_kwargs: Optional[Mapping[str, Any]] = None
+    ) -> MessageTemplate:
+        """Create a template for messages which differ in a few fields.
+
+        The MsgSeqNum and SendingTime are always variable.
+
+        Args:
+            msg_type (str): The message type.
+            variable_fields (Sequence[str], optional): The names of the other
+                fields which change between messages. Defaults to ().
+            body_kwargs (Optional[Mapping[str, Any]], optional): The static
+                body fields. Defaults to None.
+            header_kwargs (Optional[Mapping[str, Any]], optional): Extra header
+                args. Defaults to None.
+            trailer_kwargs (Optional[Mapping[str, Any]], optional): Extra
+                trailer args. Defaults to None.
+
+        Returns:
+            MessageTemplate: The template.
+        """
+        fix_message = self.create(
+            msg_type,
+            0,
+            datetime.min,
+            body_kwargs,
+            header_kwargs,
+            trailer_kwargs
+        )
+        return MessageTemplate.from_fix_message(
+            fix_message,
+            ['MsgSeqNum', 'SendingTime', *variable_fields],
+            sep=self.sep,
+            convert_sep_for_checksum=self.convert_sep_for_checksum
+        )
 
     def decode(self, buffer: bytes) -> FixMessage:
         """Decode a FIX message byte buffer.
@@ -121,5 +185,7 @@ class FixMessageFactory:
             strict=self.strict,
             validate=self.validate,
             sep=self.sep,
-            convert_sep_for_checksum=self.convert_sep_for_checksum
+            convert_sep_for_checksum=self.convert_sep_for_checksum,
+            lazy=self.lazy,
+            fields=self.fields
         )
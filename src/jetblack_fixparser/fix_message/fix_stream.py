@@ -0,0 +1,132 @@
+"""Reading FIX messages from an asyncio stream"""
+
+import asyncio
+from concurrent.futures import Executor
+from decimal import InvalidOperation
+from typing import AsyncIterator, Callable, List, Optional, Union
+
+from .errors import DecodingError, FramingError
+from .fix_message import FixMessage
+from .fix_message_factory import FixMessageFactory
+from .framer import FixFramer
+
+
+def _decode_buffer(
+        factory: FixMessageFactory,
+        buf: bytes
+) -> Union[FixMessage, DecodingError]:
+    # The error is returned rather than raised, so one bad message does not
+    # lose the other messages of a burst. A value which cannot be converted
+    # raises a ValueError, or an InvalidOperation for a Decimal, and these are
+    # reported as decoding errors.
+    try:
+        return factory.decode(buf)
+    except DecodingError as error:
+        return error
+    except (ValueError, InvalidOperation) as error:
+        decoding_error = DecodingError(f'invalid value: {error}')
+        decoding_error.__cause__ = error
+        return decoding_error
+
+
+def _decode_buffers(
+        factory: FixMessageFactory,
+        buffers: List[bytes]
+) -> List[Union[FixMessage, DecodingError]]:
+    return [_decode_buffer(factory, buf) for buf in buffers]
+
+
+async def fix_stream(
+        reader: asyncio.StreamReader,
+        factory: FixMessageFactory,
+        *,
+        chunk_size: int = 65536,
+        executor: Optional[Executor] = None,
+        burst_size: int = 32,
+        on_error: Optional[Callable[[DecodingError], None]] = None
+) -> AsyncIterator[FixMessage]:
+    """Decode the FIX messages read from an asyncio stream.
+
+    ```python
+    async for fix_message in fix_stream(reader, factory):
+        print(fix_message.message)
+    ```
+
+    Each message is decoded on its own. A message which cannot be framed or
+    decoded raises a `DecodingError` once the messages before it have been
+    yielded, which ends the iteration. When `on_error` is given it is called
+    with the error instead, the message is skipped, and the stream continues.
+
+    When an executor is given, reads which frame at least `burst_size`
+    messages are decoded in the executor. Decoding holds the GIL, so a
+    `ThreadPoolExecutor` gives no parallelism: it only lets the event loop
+    run between the time slices of the decoding thread. A
+    `ProcessPoolExecutor` decodes in parallel, but pickles the factory, with
+    its protocol, for every burst, and the decode plans are compiled again in
+    the worker. This can cost more than decoding the burst, so it only pays
+    for large bursts of expensive messages.
+
+    Args:
+        reader (asyncio.StreamReader): The stream to read from.
+        factory (FixMessageFactory): The factory used to decode the messages.
+        chunk_size (int, optional): The maximum size of each read. Defaults to
+            65536.
+        executor (Optional[Executor], optional): An optional executor for
+            decoding bursts of messages. Defaults to None.
+        burst_size (int, optional): The number of messages framed by a single
+            read for the decoding to be passed to the executor. Defaults to 32.
+        on_error (Optional[Callable[[DecodingError], None]], optional): If
+            given this is called with the error for each message which cannot
+            be framed or decoded, and the message is skipped. The callback may
+            raise to stop reading. Defaults to None.
+
+    Raises:
+        DecodingError: If a message cannot be framed or decoded and `on_error`
+            is not given.
+
+    Yields:
+        FixMessage: The decoded messages.
+    """
+    loop = asyncio.get_running_loop()
+    framer = FixFramer(factory.sep)
+
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            return
+
+        framer.feed(chunk)
+        # The framing errors are kept in place, so every error is reported in
+        # the order of the stream.
+        framed: List[Union[bytes, FramingError]] = []
+        while True:
+            try:
+                buf = framer.next_message()
+            except FramingError as error:
+                # The framer discards the bad data, so framing can continue.
+                framed.append(error)
+                continue
+            if buf is None:
+                break
+            framed.append(buf)
+
+        buffers = [item for item in framed if isinstance(item, bytes)]
+        if executor is not None and len(buffers) >= burst_size:
+            results = await loop.run_in_executor(
+                executor,
+                _decode_buffers,
+                factory,
+                buffers
+            )
+        else:
+            results = _decode_buffers(factory, buffers)
+
+        decoded = iter(results)
+        for item in framed:
+            result = next(decoded) if isinstance(item, bytes) else item
+            if isinstance(result, DecodingError):
+                if on_error is None:
+                    raise result
+                on_error(result)
+            else:
+                yield result
@@ -0,0 +1,223 @@
+"""Framing FIX messages from a byte stream"""
+
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from .common import SOH
+from .errors import FramingError
+
+# The longest begin string and body length values accepted before the framer
+# gives up looking for the separator.
+_MAX_BEGIN_STRING_LENGTH = 32
+_MAX_BODY_LENGTH_DIGITS = 10
+
+
+def find_message(
+        buf: Any,
+        start: int = 0,
+        sep: bytes = SOH,
+        begin: bytes = b'8='
+) -> Tuple[int, int]:
+    """Find the next complete message in a buffer.
+
+    The buffer can be anything supporting `find` and slicing, such as bytes, a
+    bytearray or an mmap. Data before the start of the message is skipped.
+
+    Args:
+        buf (Any): The buffer to search.
+        start (int, optional): The offset to start from. Defaults to 0.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        begin (bytes, optional): The marker for the start of a message. Must
+            start with the begin string tag. Defaults to b'8='.
+
+    Raises:
+        FramingError: If a message is not correctly framed. The position of the
+            error gives the offset from which to continue.
+
+    Returns:
+        Tuple[int, int]: The start and end of the message. If there is no
+            complete message the end is -1 and the start is the offset from
+            which to search when there is more data.
+    """
+    sep_len = len(sep)
+    buf_len = len(buf)
+
+    while True:
+        message_start = buf.find(begin, start)
+        if message_start == -1:
+            # Keep the end of the buffer as it may be the start of a message.
+            return max(start, buf_len - len(begin) + 1), -1
+        start = message_start
+
+        # The begin string.
+        begin_end = buf.find(sep, message_start + 2)
+        if begin_end == -1:
+            if buf_len - message_start > _MAX_BEGIN_STRING_LENGTH:
+                start = message_start + 1
+                continue
+            return message_start, -1
+
+        # The body length must follow the begin string.
+        length_start = begin_end + sep_len + 2
+        if buf_len < length_start:
+            return message_start, -1
+        if buf[begin_end + sep_len:length_start] != b'9=':
+            start = message_start + 1
+            continue
+
+        length_end = buf.find(sep, length_start)
+        if length_end == -1:
+            if buf_len - length_start > _MAX_BODY_LENGTH_DIGITS:
+                raise FramingError('invalid body length', message_start + 1)
+            return message_start, -1
+        length_value = bytes(buf[length_start:length_end])
+        if not length_value.isdigit():
+            raise FramingError(
+                f'invalid body length {length_value!r}',
+                message_start + 1
+            )
+
+        # The checksum follows the body: "10=nnn<SEP>".
+        trailer_start = length_end + sep_len + int(length_value)
+        message_end = trailer_start + 6 + sep_len
+        if buf_len < message_end:
+            return message_start, -1
+        if (
+                buf[trailer_start:trailer_start + 3] != b'10=' or
+                buf[message_end - sep_len:message_end] != sep
+        ):
+            raise FramingError(
+                f'checksum not found after body length {length_value!r}',
+                message_start + 1
+            )
+
+        return message_start, message_end
+
+
+class FixFramer:
+    """Split a stream of bytes into complete FIX message buffers.
+
+    Data is added with `feed` in chunks of any size, and the complete messages
+    are taken by iterating over the framer. The body length is used to find the
+    checksum, so fields containing data (like RawData) are handled correctly.
+
+    ```python
+    framer = FixFramer()
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        framer.feed(chunk)
+        for buf in framer:
+            fix_message = factory.decode(buf)
+    ```
+    """
+
+    def __init__(self, sep: bytes = SOH) -> None:
+        """Initialise the framer.
+
+        Args:
+            sep (bytes, optional): The field separator. Defaults to SOH.
+        """
+        self.sep = sep
+        self._buffer = bytearray()
+        self._start = 0
+
+    @property
+    def buffered(self) -> int:
+        """The number of bytes buffered which are not yet part of a message.
+
+        Returns:
+            int: The number of bytes.
+        """
+        return len(self._buffer) - self._start
+
+    def feed(self, data: bytes) -> None:
+        """Add data to the framer.
+
+        Args:
+            data (bytes): The data to add.
+        """
+        # Discard consumed data when it makes up most of the buffer, so the
+        # cost of the copy is amortized over the messages framed.
+        if self._start and self._start * 2 >= len(self._buffer):
+            del self._buffer[:self._start]
+            self._start = 0
+        self._buffer += data
+
+    def next_message(self) -> Optional[bytes]:
+        """Take the next complete message from the framer.
+
+        Any data before the start of a message, such as line endings between
+        messages, is discarded.
+
+        Raises:
+            FramingError: If the message is not correctly framed. The bad data
+                is discarded before raising, so the framer can continue.
+
+        Returns:
+            Optional[bytes]: The message, or None if no complete message is
+                available.
+        """
+        try:
+            message_start, message_end = find_message(
+                self._buffer,
+                self._start,
+                self.sep
+            )
+        except FramingError as error:
+            self._start = error.position
+            raise
+
+        if message_end == -1:
+            self._start = message_start
+            return None
+
+        self._start = message_end
+        return bytes(self._buffer[message_start:message_end])
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            message = self.next_message()
+            if message is None:
+                return
+            yield message
+
+
+def iter_messages(
+        chunks: Iterable[bytes],
+        sep: bytes = SOH
+) -> Iterator[bytes]:
+    """Frame the FIX messages in a sequence of chunks.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks of data.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+
+    Yields:
+        bytes: The complete message buffers.
+    """
+    framer = FixFramer(sep)
+    for chunk in chunks:
+        framer.feed(chunk)
+        yield from framer
+
+
+def read_messages(
+        file_ptr: BinaryIO,
+        sep: bytes = SOH,
+        chunk_size: int = 65536
+) -> Iterator[bytes]:
+    """Frame the FIX messages read from a binary file or socket file.
+
+    Args:
+        file_ptr (BinaryIO): The file to read from.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        chunk_size (int, optional): The size of the reads. Defaults to 65536.
+
+    Yields:
+        bytes: The complete message buffers.
+    """
+    yield from iter_messages(
+        iter(lambda: file_ptr.read(chunk_size), b''),
+        sep
+    )
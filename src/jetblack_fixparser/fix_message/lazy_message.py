@@ -0,0 +1,64 @@
+"""A lazily decoded FIX message"""
+
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Tuple, Union
+
+RawValue = Tuple[Callable[[bytes], Any], bytes]
+RawMessage = MutableMapping[str, Union[RawValue, List[Any]]]
+
+
+class LazyMessage(MutableMapping[str, Any]):
+    """A message mapping which decodes each value the first time it is read.
+
+    The structure of the message (including any groups) has been checked when
+    the mapping is created; only the conversion of the values is deferred.
+    """
+
+    def __init__(self, raw: RawMessage) -> None:
+        """Initialise the lazy message.
+
+        Args:
+            raw (RawMessage): A mapping of field names to either a tuple of the
+                bound decoder and the encoded value, or a list of raw group
+                entries.
+        """
+        self._raw = raw
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        item = self._raw[key]
+        if isinstance(item, list):
+            value: Any = [LazyMessage(group) for group in item]
+        else:
+            decoder, encoded_value = item
+            value = decoder(encoded_value)
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._raw:
+            # Hold the position of the key. The value takes precedence.
+            self._raw[key] = []
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._raw[key]
+        self._values.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw
+
+    def __str__(self) -> str:
+        return f'LazyMessage: {dict(self.items())}'
+
+    __repr__ = __str__
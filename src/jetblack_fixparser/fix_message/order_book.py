@@ -0,0 +1,528 @@
+"""Price level order books built from market data messages"""
+
+from bisect import bisect_left, insort
+import logging
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple
+)
+
+from ..meta_data import MessageMetaData, ProtocolMetaData
+
+from .value_decoders import decode_value
+
+LOGGER = logging.getLogger(__name__)
+
+PriceLevel = Tuple[Any, Any]
+
+
+class BookSide:
+    """The price levels of one side of a book.
+
+    The prices are held in ascending order in a list, with the sizes in a
+    dictionary. Finding a level is a binary search, and changing the size of
+    an existing level a dictionary update. Adding or removing a level inserts
+    or deletes its price in the list, which moves the prices after it. This is
+    O(n) in the number of levels, but for the depth of a book it is a short
+    move of memory, and is faster than a tree in Python.
+
+    A level may be set as a whole, or built from entries identified by an
+    MDEntryID. The size of a level is the size set for it, plus the sizes of
+    its entries, and the level is removed with its last entry.
+    """
+
+    def __init__(self, is_bid: bool) -> None:
+        """Initialise the side.
+
+        Args:
+            is_bid (bool): True for bids, where the best price is the highest.
+        """
+        self.is_bid = is_bid
+        self._prices: List[Any] = []
+        self._sizes: Dict[Any, Any] = {}
+        # The size of each level not held by an identified entry.
+        self._level_sizes: Dict[Any, Any] = {}
+        # The price and size of the identified entries, and the identifiers
+        # of the entries at each price.
+        self._entries: Dict[Any, Tuple[Any, Any]] = {}
+        self._entry_ids: Dict[Any, Set[Any]] = {}
+
+    def set(self, price: Any, size: Any) -> None:
+        """Set the size of a level, adding the level if it is new.
+
+        The identified entries at the price are replaced by the level.
+
+        Args:
+            price (Any): The price of the level.
+            size (Any): The size of the level.
+        """
+        for entry_id in self._entry_ids.pop(price, ()):
+            del self._entries[entry_id]
+        self._level_sizes[price] = size
+        self._update(price)
+
+    def add(self, price: Any, size: Any) -> None:
+        """Add to the size of a level, adding the level if it is new.
+
+        Args:
+            price (Any): The price of the level.
+            size (Any): The size to add.
+        """
+        level_size = self._level_sizes.get(price)
+        self._level_sizes[price] = (
+            size if level_size is None else level_size + size
+        )
+        self._update(price)
+
+    def remove(self, price: Any) -> None:
+        """Remove a level and its entries, if it exists.
+
+        Args:
+            price (Any): The price of the level.
+        """
+        for entry_id in self._entry_ids.pop(price, ()):
+            del self._entries[entry_id]
+        self._level_sizes.pop(price, None)
+        self._update(price)
+
+    def set_entry(self, entry_id: Any, price: Any, size: Any) -> None:
+        """Set the price and size of an identified entry.
+
+        An entry which moves to another price is removed from its old level,
+        leaving the other entries of the level.
+
+        Args:
+            entry_id (Any): The MDEntryID of the entry.
+            price (Any): The price of the entry.
+            size (Any): The size of the entry.
+        """
+        entry = self._entries.get(entry_id)
+        if entry is not None and entry[0] != price:
+            self.remove_entry(entry_id)
+        self._entries[entry_id] = (price, size)
+        self._entry_ids.setdefault(price, set()).add(entry_id)
+        self._update(price)
+
+    def remove_entry(self, entry_id: Any) -> bool:
+        """Remove an identified entry, if it exists.
+
+        Args:
+            entry_id (Any): The MDEntryID of the entry.
+
+        Returns:
+            bool: True if the entry was removed.
+        """
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        price = entry[0]
+        entry_ids = self._entry_ids[price]
+        entry_ids.discard(entry_id)
+        if not entry_ids:
+            del self._entry_ids[price]
+        self._update(price)
+        return True
+
+    def entry(self, entry_id: Any) -> Optional[PriceLevel]:
+        """The price and size of an identified entry.
+
+        Args:
+            entry_id (Any): The MDEntryID of the entry.
+
+        Returns:
+            Optional[PriceLevel]: The price and size, or None if the side has
+                no entry with the identifier.
+        """
+        return self._entries.get(entry_id)
+
+    def _update(self, price: Any) -> None:
+        # Recalculate the size of a level from its parts, so removing an entry
+        # leaves no rounding error in the size.
+        entry_ids = self._entry_ids.get(price)
+        if entry_ids is None and price not in self._level_sizes:
+            if self._sizes.pop(price, None) is not None:
+                del self._prices[bisect_left(self._prices, price)]
+            return
+        size = self._level_sizes.get(price)
+        for entry_id in entry_ids or ():
+            entry_size = self._entries[entry_id][1]
+            size = entry_size if size is None else size + entry_size
+        if price not in self._sizes:
+            insort(self._prices, price)
+        self._sizes[price] = size
+
+    def clear(self) -> None:
+        """Remove every level."""
+        self._prices.clear()
+        self._sizes.clear()
+        self._level_sizes.clear()
+        self._entries.clear()
+        self._entry_ids.clear()
+
+    @property
+    def best(self) -> Optional[PriceLevel]:
+        """The best level.
+
+        Returns:
+            Optional[PriceLevel]: The price and size, or None if the side is
+                empty.
+        """
+        if not self._prices:
+            return None
+        price = self._prices[-1] if self.is_bid else self._prices[0]
+        return price, self._sizes[price]
+
+    def levels(self, depth: Optional[int] = None) -> List[PriceLevel]:
+        """The levels, best first.
+
+        Args:
+            depth (Optional[int], optional): The maximum number of levels.
+                Defaults to None, for every level.
+
+        Returns:
+            List[PriceLevel]: The prices and sizes.
+        """
+        if self.is_bid:
+            prices = self._prices[::-1][:depth]
+        else:
+            prices = self._prices[:depth]
+        return [(price, self._sizes[price]) for price in prices]
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __str__(self) -> str:
+        return f'BookSide: is_bid={self.is_bid}, levels={self.levels()}'
+
+    __repr__ = __str__
+
+
+class TopOfBook:
+    """The best bid and offer of a book."""
+
+    def __init__(
+            self,
+            instrument: str,
+            bid: Optional[PriceLevel],
+            offer: Optional[PriceLevel]
+    ) -> None:
+        """Initialise the top of book.
+
+        Args:
+            instrument (str): The SecurityID or Symbol of the book.
+            bid (Optional[PriceLevel]): The best bid price and size.
+            offer (Optional[PriceLevel]): The best offer price and size.
+        """
+        self.instrument = instrument
+        self.bid = bid
+        self.offer = offer
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TopOfBook):
+            return NotImplemented
+        return (
+            self.instrument == other.instrument and
+            self.bid == other.bid and
+            self.offer == other.offer
+        )
+
+    def __str__(self) -> str:
+        return (
+            'TopOfBook: '
+            f'instrument={self.instrument}, '
+            f'bid={self.bid}, '
+            f'offer={self.offer}'
+        )
+
+    __repr__ = __str__
+
+
+class OrderBook:
+    """The price levels of an instrument."""
+
+    def __init__(self, instrument: str) -> None:
+        """Initialise the book.
+
+        Args:
+            instrument (str): The SecurityID or Symbol of the book.
+        """
+        self.instrument = instrument
+        self.bids = BookSide(True)
+        self.offers = BookSide(False)
+
+    def top(self) -> TopOfBook:
+        """The best bid and offer.
+
+        Returns:
+            TopOfBook: The top of the book.
+        """
+        return TopOfBook(self.instrument, self.bids.best, self.offers.best)
+
+    def clear(self) -> None:
+        """Remove every level."""
+        self.bids.clear()
+        self.offers.clear()
+
+    def __str__(self) -> str:
+        return (
+            'OrderBook: '
+            f'instrument={self.instrument}, '
+            f'bids={self.bids.levels()}, '
+            f'offers={self.offers.levels()}'
+        )
+
+    __repr__ = __str__
+
+
+def _instrument(message: Mapping[str, Any]) -> Optional[str]:
+    return message.get('SecurityID') or message.get('Symbol')
+
+
+class BookManager:
+    """Maintain price level books from decoded market data messages.
+
+    Snapshots (35=W) replace the book of their instrument, and incremental
+    refreshes (35=X) add, change and delete the levels of the books of their
+    entries. Books are keyed by SecurityID, or Symbol when there is no
+    SecurityID. An incremental entry without an instrument is for the same
+    instrument as the entry before it. Entries which are not bids or offers,
+    or have no price, are ignored.
+
+    Entries with an MDEntryID are held individually, and the size of a level
+    is the sum of the sizes of its entries. A change moves or resizes only
+    its own entry, and a delete removes only its own size, so it need not
+    give the price or type. Entries without an MDEntryID update a level as a
+    whole, except in a snapshot where the entries at a price are added up. A
+    delete which cannot be resolved is logged as a warning.
+
+    ```python
+    manager = BookManager(protocol, on_top_of_book=print, conflation_ms=100)
+    for buf in buffers:
+        manager.update(*decode(protocol, buf))
+    book = manager.books['EUR/USD']
+    print(book.bids.levels(5))
+    ```
+
+    When a callback is given it is called with the top of a book when it
+    changes. With conflation the top of each book is published at most once
+    every interval, and changes within the interval are published by a later
+    `update` or `poll` once the interval has passed.
+    """
+
+    def __init__(
+            self,
+            protocol: ProtocolMetaData,
+            on_top_of_book: Optional[Callable[[TopOfBook], None]] = None,
+            conflation_ms: Optional[float] = None,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialise the book manager.
+
+        Args:
+            protocol (ProtocolMetaData): The protocol meta data.
+            on_top_of_book (Optional[Callable[[TopOfBook], None]], optional):
+                Called with the top of a book when it changes. Defaults to
+                None.
+            conflation_ms (Optional[float], optional): The minimum interval
+                in milliseconds between publishing the top of a book. Defaults
+                to None, which publishes every change.
+            clock (Callable[[], float], optional): The clock in seconds used
+                for conflation. Defaults to time.monotonic.
+        """
+        self.on_top_of_book = on_top_of_book
+        self.conflation_ms = conflation_ms
+        self.clock = clock
+        self.books: Dict[str, OrderBook] = {}
+        self._published: Dict[str, Tuple[float, TopOfBook]] = {}
+        self._pending: Set[str] = set()
+
+        # The decoded values depend on the protocol options, so they are
+        # found by decoding the encoded values.
+        entry_type = protocol.fields_by_name['MDEntryType']
+        self._bid = decode_value(protocol, entry_type, b'0')
+        self._offer = decode_value(protocol, entry_type, b'1')
+        self._delete = decode_value(
+            protocol,
+            protocol.fields_by_name['MDUpdateAction'],
+            b'2'
+        )
+
+    def book(self, instrument: str) -> OrderBook:
+        """Get the book of an instrument, creating it if it does not exist.
+
+        Args:
+            instrument (str): The SecurityID or Symbol.
+
+        Returns:
+            OrderBook: The book.
+        """
+        book = self.books.get(instrument)
+        if book is None:
+            book = self.books[instrument] = OrderBook(instrument)
+        return book
+
+    def update(
+            self,
+            message: Mapping[str, Any],
+            meta_data: MessageMetaData
+    ) -> Set[str]:
+        """Apply a market data message to the books.
+
+        Messages other than snapshots and incremental refreshes are ignored.
+
+        Args:
+            message (Mapping[str, Any]): The decoded message.
+            meta_data (MessageMetaData): The message meta data.
+
+        Returns:
+            Set[str]: The instruments of the books which were updated.
+        """
+        if meta_data.msgtype == b'W':
+            instruments = self._apply_snapshot(message)
+        elif meta_data.msgtype == b'X':
+            instruments = self._apply_incremental(message)
+        else:
+            return set()
+
+        if self.on_top_of_book is not None:
+            self._pending |= instruments
+            self.poll()
+        return instruments
+
+    def poll(self) -> None:
+        """Publish the changed tops of book which are due.
+
+        Call this periodically when conflating, so the last change to a book
+        is published when no further messages arrive.
+        """
+        if not self._pending:
+            return
+        now = self.clock()
+        interval = (
+            0.0 if self.conflation_ms is None
+            else self.conflation_ms / 1000
+        )
+        for instrument in list(self._pending):
+            published = self._published.get(instrument)
+            if published is not None and now - published[0] < interval:
+                continue
+            self._pending.discard(instrument)
+            self._publish(instrument, now, published)
+
+    def flush(self) -> None:
+        """Publish every changed top of book, ignoring conflation."""
+        now = self.clock()
+        for instrument in self._pending:
+            self._publish(instrument, now, self._published.get(instrument))
+        self._pending.clear()
+
+    def _publish(
+            self,
+            instrument: str,
+            now: float,
+            published: Optional[Tuple[float, TopOfBook]]
+    ) -> None:
+        assert self.on_top_of_book is not None
+        top = self.books[instrument].top()
+        if published is not None and published[1] == top:
+            return
+        self._published[instrument] = (now, top)
+        self.on_top_of_book(top)
+
+    def _apply_snapshot(self, message: Mapping[str, Any]) -> Set[str]:
+        instrument = _instrument(message)
+        if instrument is None:
+            return set()
+        book = self.book(instrument)
+        book.clear()
+        for entry in message.get('NoMDEntries', ()):
+            self._apply_entry(book, entry, False, True)
+        return {instrument}
+
+    def _apply_incremental(self, message: Mapping[str, Any]) -> Set[str]:
+        instruments: Set[str] = set()
+        instrument = _instrument(message)
+        for entry in message.get('NoMDEntries', ()):
+            instrument = _instrument(entry) or instrument
+            if instrument is None:
+                continue
+            book = self.book(instrument)
+            self._apply_entry(
+                book,
+                entry,
+                entry.get('MDUpdateAction') == self._delete,
+                False
+            )
+            instruments.add(instrument)
+        return instruments
+
+    def _apply_entry(
+            self,
+            book: OrderBook,
+            entry: Mapping[str, Any],
+            is_delete: bool,
+            is_snapshot: bool
+    ) -> None:
+        entry_type = entry.get('MDEntryType')
+        side: Optional[BookSide]
+        if entry_type == self._bid:
+            side = book.bids
+        elif entry_type == self._offer:
+            side = book.offers
+        elif entry_type is None:
+            side = None
+        else:
+            return
+
+        entry_id = entry.get('MDEntryID')
+        price = entry.get('MDEntryPx')
+        size = entry.get('MDEntrySize')
+        is_removed = is_delete or not size
+
+        if entry_id is not None:
+            if side is None:
+                side = next(
+                    (
+                        book_side
+                        for book_side in (book.bids, book.offers)
+                        if book_side.entry(entry_id) is not None
+                    ),
+                    None
+                )
+            if side is not None and is_removed:
+                if side.remove_entry(entry_id):
+                    return
+            elif side is not None:
+                if price is None:
+                    added = side.entry(entry_id)
+                    price = None if added is None else added[0]
+                if price is not None:
+                    side.set_entry(entry_id, price, size)
+                return
+
+        if side is None or price is None:
+            if is_delete:
+                LOGGER.warning(
+                    'Unable to resolve the level of a delete for %s: %s',
+                    book.instrument,
+                    entry
+                )
+            return
+        if is_removed:
+            side.remove(price)
+        elif is_snapshot:
+            side.add(price, size)
+        else:
+            side.set(price, size)
+
+    def __str__(self) -> str:
+        return f'BookManager: books={list(self.books)}'
+
+    __repr__ = __str__
@@ -0,0 +1,255 @@
+"""Decoding FIX log files in parallel"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import mmap
+import os
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Union
+)
+
+from ..loader import load_quickfix_protocol, load_yaml_protocol
+from ..meta_data import ProtocolMetaData
+from ..types import StrictMode, ValueType
+
+from .common import SOH
+from .errors import DecodingError
+from .file_decoder import _decode_message, scan_spans, to_msgtypes
+
+# The protocol loaded by each worker process. This is set once by the pool
+# initializer, so the protocol is never pickled.
+_PROTOCOL: Optional[ProtocolMetaData] = None
+
+
+def _load_protocol(
+        path: Union[str, Path],
+        options: Mapping[str, Any]
+) -> ProtocolMetaData:
+    if Path(path).suffix.lower() == '.xml':
+        return load_quickfix_protocol(path, **options)
+    return load_yaml_protocol(path, **options)
+
+
+def _initialize_worker(
+        protocol_path: Union[str, Path],
+        options: Mapping[str, Any]
+) -> None:
+    global _PROTOCOL  # pylint: disable=global-statement
+    _PROTOCOL = _load_protocol(protocol_path, options)
+
+
+def _decode_chunk(
+        log_path: Union[str, Path],
+        start: int,
+        end: int,
+        sep: bytes,
+        msgtypes: Optional[Set[bytes]],
+        decode_options: Mapping[str, Any],
+        is_skipping_errors: bool
+) -> Tuple[List[MutableMapping[str, Any]], List[DecodingError]]:
+    # The errors are returned, as the callback cannot be sent to the worker.
+    assert _PROTOCOL is not None, "worker not initialized"
+    messages: List[MutableMapping[str, Any]] = []
+    errors: List[DecodingError] = []
+    with open(log_path, 'rb') as file_ptr:
+        with mmap.mmap(file_ptr.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            for message_start, message_end in scan_spans(
+                    buf,
+                    sep=sep,
+                    begin_string=_PROTOCOL.begin_string,
+                    msgtypes=msgtypes,
+                    start=start,
+                    end=end,
+                    on_error=errors.append
+            ):
+                try:
+                    message, _ = _decode_message(
+                        _PROTOCOL,
+                        buf[message_start:message_end],
+                        sep=sep,
+                        **decode_options
+                    )
+                except DecodingError as error:
+                    if not is_skipping_errors:
+                        raise
+                    errors.append(error)
+                    continue
+                messages.append(message)
+    return messages, errors
+
+
+def _chunk_result(
+        future: 'Future[Tuple[List[MutableMapping[str, Any]], List[DecodingError]]]',
+        on_error: Optional[Callable[[DecodingError], None]]
+) -> List[MutableMapping[str, Any]]:
+    messages, errors = future.result()
+    if on_error is not None:
+        for error in errors:
+            on_error(error)
+    return messages
+
+
+def parallel_decode_file_batches(
+        protocol_path: Union[str, Path],
+        log_path: Union[str, Path],
+        *,
+        workers: Optional[int] = None,
+        chunk_size: int = 16 * 1024 * 1024,
+        sep: bytes = SOH,
+        msgtypes: Optional[Iterable[Union[str, bytes]]] = None,
+        strict: Union[bool, StrictMode] = True,
+        validate: bool = True,
+        convert_sep_for_checksum: bool = True,
+        is_millisecond_time: bool = True,
+        is_float_decimal: bool = False,
+        is_integer_time: bool = False,
+        fixed_point_places: Optional[Mapping[Union[ValueType, str], int]] = None,
+        is_type_enum: Optional[Mapping[Union[ValueType, str], bool]] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        on_error: Optional[Callable[[DecodingError], None]] = None
+) -> Iterator[List[MutableMapping[str, Any]]]:
+    """Decode a FIX log file in parallel, returning batches of messages.
+
+    The file is split into chunks which are decoded by a pool of processes.
+    Each worker loads the protocol from the protocol file once, so the protocol
+    meta data is never pickled. A chunk contains the messages starting in its
+    range of the file. The batches are returned in the order of the file.
+
+    At most two chunks per worker are in progress or waiting to be read, so
+    the memory used does not grow with the size of the file.
+
+    Errors are handled as by `decode_file`. Messages which are not correctly
+    framed are skipped. A message which cannot be decoded raises, unless
+    `on_error` is given. The callback is called in this process, before the
+    batch of the chunk containing the error is returned.
+
+    Args:
+        protocol_path (Union[str, Path]): The path to a YAML or QuickFix XML
+            protocol file.
+        log_path (Union[str, Path]): The path to the log file.
+        workers (Optional[int], optional): The number of worker processes.
+            Defaults to None, which uses the number of processors.
+        chunk_size (int, optional): The approximate number of bytes in each
+            chunk. Defaults to 16MB.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        msgtypes (Optional[Iterable[Union[str, bytes]]], optional): If given
+            only messages of these types are decoded. Defaults to None.
+        strict (Union[bool, StrictMode], optional): If true use strict
+            validation. Defaults to True.
+        validate (bool, optional): If true validate the messages. Defaults to
+            True.
+        convert_sep_for_checksum (bool, optional): If true convert the separator
+            before calculating the checksum. Defaults to True.
+        is_millisecond_time (bool, optional): The protocol option for
+            millisecond times. Defaults to True.
+        is_float_decimal (bool, optional): The protocol option for decimals.
+            Defaults to False.
+        is_integer_time (bool, optional): The protocol option for integer
+            times. Defaults to False.
+        fixed_point_places (Optional[Mapping[Union[ValueType, str], int]], optional):
+            The protocol option for fixed point numbers. Defaults to None.
+        is_type_enum (Optional[Mapping[Union[ValueType, str], bool]], optional):
+            The protocol option for enums. Defaults to None.
+        cache_dir (Optional[Union[str, Path]], optional): An optional protocol
+            cache folder, reducing the start up time of the workers. Defaults
+            to None.
+        on_error (Optional[Callable[[DecodingError], None]], optional): If
+            given this is called with the error for each message which cannot
+            be framed or decoded, and the message is skipped. Defaults to None.
+
+    Yields:
+        List[MutableMapping[str, Any]]: The decoded messages of each chunk.
+    """
+    options: Dict[str, Any] = {
+        'is_millisecond_time': is_millisecond_time,
+        'is_float_decimal': is_float_decimal,
+        'is_integer_time': is_integer_time,
+        'fixed_point_places': fixed_point_places,
+        'is_type_enum': is_type_enum,
+        'cache_dir': cache_dir
+    }
+    decode_options = {
+        'strict': strict,
+        'validate': validate,
+        'convert_sep_for_checksum': convert_sep_for_checksum
+    }
+
+    if msgtypes is not None:
+        # Message names need the protocol to be converted to message types.
+        msgtypes = to_msgtypes(_load_protocol(protocol_path, options), msgtypes)
+
+    file_size = os.path.getsize(log_path)
+    if file_size == 0:
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(protocol_path, options)
+    ) as executor:
+        # Submitting every chunk up front would hold every result in memory,
+        # so only a window of chunks is submitted.
+        futures: Deque[Future] = deque()
+        try:
+            for start in range(0, file_size, chunk_size):
+                futures.append(
+                    executor.submit(
+                        _decode_chunk,
+                        log_path,
+                        start,
+                        min(start + chunk_size, file_size),
+                        sep,
+                        msgtypes,
+                        decode_options,
+                        on_error is not None
+                    )
+                )
+                if len(futures) >= 2 * workers:
+                    yield _chunk_result(futures.popleft(), on_error)
+            while futures:
+                yield _chunk_result(futures.popleft(), on_error)
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def parallel_decode_file(
+        protocol_path: Union[str, Path],
+        log_path: Union[str, Path],
+        **kwargs: Any
+) -> Iterator[MutableMapping[str, Any]]:
+    """Decode a FIX log file in parallel.
+
+    This takes the same arguments as `parallel_decode_file_batches`, and yields
+    the messages one at a time in the order of the file.
+
+    ```python
+    for message in parallel_decode_file('FIX44.yaml', 'fix.log', workers=8):
+        print(message['MsgType'])
+    ```
+
+    Args:
+        protocol_path (Union[str, Path]): The path to a YAML or QuickFix XML
+            protocol file.
+        log_path (Union[str, Path]): The path to the log file.
+
+    Yields:
+        MutableMapping[str, Any]: The decoded messages.
+    """
+    for batch in parallel_decode_file_batches(protocol_path, log_path, **kwargs):
+        yield from batch
@@ -0,0 +1,274 @@
+"""Templates for encoding repeated messages"""
+
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Iterable,
+    List,
+    Mapping,
+    Optional
+)
+
+from ..meta_data import MessageMetaData, ProtocolMetaData
+
+from .common import SOH, checksum_sum
+from .decoder import find_message_meta_data
+from .encode_plan import MemberEncodePlan, get_encode_plan
+from .errors import EncodingError
+from .fix_message import FixMessage
+
+_MISSING = object()
+
+# The fields written by the template itself.
+_INTEGRITY_FIELDS = ('BeginString', 'BodyLength', 'CheckSum')
+
+
+class _Slot:
+    """A variable field of a template"""
+
+    def __init__(
+            self,
+            member: MemberEncodePlan,
+            sep: bytes,
+            sep_sum: int
+    ) -> None:
+        self.name = member.name
+        self.is_required = member.is_required
+        self.prefix = member.prefix
+        self.encoder = member.encoder
+        # The prefix and separator are fixed, so their length and checksum
+        # are too.
+        self.length = len(member.prefix) + len(sep)
+        self.fixed_sum = sum(member.prefix) + sep_sum
+
+
+def _add_static(
+        encoded_message: List[bytes],
+        data: Mapping[str, Any],
+        member: MemberEncodePlan
+) -> None:
+    item_data = data.get(member.name, _MISSING)
+    if item_data is _MISSING:
+        if member.is_required:
+            raise EncodingError(f'required field "{member.name}" is missing')
+        return
+
+    if member.children is None:
+        encoded_message.append(member.prefix + member.encoder(item_data))
+    else:
+        encoded_message.append(member.prefix + member.encoder(len(item_data)))
+        for group_item in item_data:
+            for child in member.children:
+                _add_static(encoded_message, group_item, child)
+
+
+class MessageTemplate:
+    """A message with the static fields encoded once.
+
+    Most of the fields of a stream of outbound messages are the same from one
+    message to the next. A template encodes these once. Each message then
+    encodes only the variable fields, and the body length and checksum are
+    found by adding the lengths and sums of those fields to the precalculated
+    lengths and sums of the static fields.
+
+    ```python
+    template = MessageTemplate.from_fix_message(
+        fix_message,
+        ['MsgSeqNum', 'SendingTime', 'ClOrdID', 'Price', 'OrderQty']
+    )
+    buf = template.encode({
+        'MsgSeqNum': 43,
+        'SendingTime': datetime.now(timezone.utc),
+        'ClOrdID': 'ORD-43',
+        'Price': Decimal('101.25'),
+        'OrderQty': 100
+    })
+    ```
+
+    The variable fields must be fields of the header, body or trailer, and
+    cannot be in a group. Their values in the template message are ignored.
+    """
+
+    def __init__(
+            self,
+            protocol: ProtocolMetaData,
+            data: Mapping[str, Any],
+            variable_fields: Iterable[str],
+            meta_data: Optional[MessageMetaData] = None,
+            *,
+            sep: bytes = SOH,
+            convert_sep_for_checksum: bool = True
+    ) -> None:
+        """Initialise the template.
+
+        Args:
+            protocol (ProtocolMetaData): The protocol meta data.
+            data (Mapping[str, Any]): The message holding the static fields.
+            variable_fields (Iterable[str]): The names of the fields which
+                change between messages.
+            meta_data (Optional[MessageMetaData], optional): The message meta
+                data. Defaults to None, which finds it from the MsgType.
+            sep (bytes, optional): The field separator. Defaults to SOH.
+            convert_sep_for_checksum (bool, optional): If true convert the
+                field separator to SOH when calculating the checksum. Defaults
+                to True.
+
+        Raises:
+            ValueError: If a variable field is not a field of the header, body
+                or trailer.
+            EncodingError: If a required static field is missing.
+        """
+        self.protocol = protocol
+        self.meta_data = meta_data or find_message_meta_data(protocol, data)
+        self.sep = sep
+        self.convert_sep_for_checksum = convert_sep_for_checksum
+
+        # The contribution of a separator to the checksum.
+        sep_sum = sum(SOH if convert_sep_for_checksum else sep)
+        self.sep_sum = sep_sum
+
+        variable_field_set = set(variable_fields)
+        for name in variable_field_set:
+            if name in _INTEGRITY_FIELDS:
+                raise ValueError(f'field {name} is written by the template')
+
+        members = get_encode_plan(protocol).message(self.meta_data)
+
+        # The body is the static chunks between the slots. Each chunk holds
+        # the separators of the fields around it.
+        chunks: List[bytes] = []
+        slots: List[_Slot] = []
+        encoded_message: List[bytes] = []
+        for member in members:
+            if member.name in _INTEGRITY_FIELDS:
+                continue
+            if member.name in variable_field_set:
+                if member.children is not None:
+                    raise ValueError(f'group {member.name} cannot be variable')
+                variable_field_set.discard(member.name)
+                chunks.append(
+                    b''.join(field + sep for field in encoded_message)
+                )
+                slots.append(_Slot(member, sep, sep_sum))
+                encoded_message = []
+            else:
+                _add_static(encoded_message, data, member)
+        chunks.append(b''.join(field + sep for field in encoded_message))
+        if variable_field_set:
+            raise ValueError(
+                f'fields {sorted(variable_field_set)} are not fields of '
+                'the header, body or trailer'
+            )
+
+        self.chunks = chunks
+        self.slots = slots
+        self.static_length = sum(len(chunk) for chunk in chunks)
+        self.static_sum = sum(
+            checksum_sum(chunk, len(chunk), sep, convert_sep_for_checksum)
+            for chunk in chunks
+        )
+        self.begin_string = (
+            protocol.fields_by_name['BeginString'].number + b'=' +
+            protocol.begin_string + sep +
+            protocol.fields_by_name['BodyLength'].number + b'='
+        )
+        self.begin_string_sum = checksum_sum(
+            self.begin_string,
+            len(self.begin_string),
+            sep,
+            convert_sep_for_checksum
+        )
+        self.check_sum_prefix = (
+            protocol.fields_by_name['CheckSum'].number + b'='
+        )
+
+    @classmethod
+    def from_fix_message(
+            cls,
+            fix_message: FixMessage,
+            variable_fields: Iterable[str],
+            *,
+            sep: bytes = SOH,
+            convert_sep_for_checksum: bool = True
+    ) -> MessageTemplate:
+        """Create a template from a FIX message.
+
+        Args:
+            fix_message (FixMessage): The message holding the static fields.
+            variable_fields (Iterable[str]): The names of the fields which
+                change between messages.
+            sep (bytes, optional): The field separator. Defaults to SOH.
+            convert_sep_for_checksum (bool, optional): If true convert the
+                field separator to SOH when calculating the checksum. Defaults
+                to True.
+
+        Returns:
+            MessageTemplate: The template.
+        """
+        return cls(
+            fix_message.protocol,
+            fix_message.message,
+            variable_fields,
+            fix_message.meta_data,
+            sep=sep,
+            convert_sep_for_checksum=convert_sep_for_checksum
+        )
+
+    def encode(self, values: Mapping[str, Any]) -> bytes:
+        """Encode a message from the template.
+
+        Only the variable fields are read from the values.
+
+        Args:
+            values (Mapping[str, Any]): The values of the variable fields.
+
+        Raises:
+            EncodingError: If a required variable field is missing.
+
+        Returns:
+            bytes: The encoded FIX message.
+        """
+        sep = self.sep
+        body: List[bytes] = [self.chunks[0]]
+        body_length = self.static_length
+        total = self.static_sum
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            value = values.get(slot.name, _MISSING)
+            if value is not _MISSING:
+                encoded_value = slot.encoder(value)
+                body.append(slot.prefix)
+                body.append(encoded_value)
+                body.append(sep)
+                body_length += slot.length + len(encoded_value)
+                total += slot.fixed_sum + sum(encoded_value)
+            elif slot.is_required:
+                raise EncodingError(f'required field "{slot.name}" is missing')
+            body.append(chunk)
+
+        encoded_body_length = b'%d' % body_length
+        total += (
+            self.begin_string_sum +
+            sum(encoded_body_length) +
+            self.sep_sum
+        )
+
+        return b''.join([
+            self.begin_string,
+            encoded_body_length,
+            sep,
+            *body,
+            self.check_sum_prefix,
+            b'%03d' % (total % 256),
+            sep
+        ])
+
+    def __str__(self) -> str:
+        return (
+            'MessageTemplate: '
+            f'msgtype={self.meta_data.msgtype!r}, '
+            f'variable_fields={[slot.name for slot in self.slots]}'
+        )
+
+    __repr__ = __str__
+
@@ -0,0 +1,56 @@
+"""Tokenizing FIX message buffers
+
+The buffer is split into fields with the C implemented `bytes` methods and
+iterators, so no Python code runs per field. A Python loop scanning for the
+separators and recording offsets was measured to be several times slower than
+this, even though it allocates less.
+
+This is not zero copy. Each field number and value is a new `bytes`, and a
+`bytearray` or `memoryview` is copied to `bytes` before it is split, as
+`memoryview` has no `split`. The framer and file scanner already yield each
+message as `bytes`, so they pay for a single copy of the message.
+"""
+
+from itertools import repeat
+from typing import List, Tuple, Union
+
+from .common import SOH
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# A field as returned by `bytes.partition`: the field number, b'=', and the
+# value.
+EncodedField = Tuple[bytes, bytes, bytes]
+
+
+def to_bytes(buf: Buffer) -> bytes:
+    """Convert a buffer to bytes, copying only when it is not already bytes.
+
+    A `bytearray` or `memoryview` is copied, as the tokenizer needs the `bytes`
+    methods.
+
+    Args:
+        buf (Buffer): The buffer.
+
+    Returns:
+        bytes: The buffer as bytes.
+    """
+    return buf if isinstance(buf, bytes) else bytes(buf)
+
+
+def tokenize(buf: bytes, sep: bytes = SOH) -> List[EncodedField]:
+    """Split a FIX message buffer into its fields.
+
+    Args:
+        buf (bytes): The FIX message buffer, ending with a separator.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+
+    Returns:
+        List[EncodedField]: The fields as tuples of the field number, b'=', and
+            the value.
+    """
+    fields = list(map(bytes.partition, buf.split(sep), repeat(b'=')))
+    # Drop whatever follows the last separator.
+    fields.pop()
+    return fields
+
@@ -0,0 +1,500 @@
+"""Typed message classes created from the protocol meta data"""
+
+from __future__ import annotations
+
+from keyword import iskeyword
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast
+)
+
+from ..meta_data import MessageMetaData, ProtocolMetaData
+from ..types import StrictMode
+
+from .common import SOH
+from .decode_plan import Projection, compile_projection
+from .decoder import (
+    _decode_encoded_message,
+    _find_encoded_message_meta_data
+)
+from .encode_plan import MemberEncodePlan, get_encode_plan
+from .encoder import _regenerate_integrity
+from .errors import DecodingError, EncodingError
+from .tokenizer import Buffer, to_bytes, tokenize
+from .validation import assert_message_valid
+from .value_decoders import bind_decoder
+
+
+class TypedGroup:
+    """The base class for the entries of a repeating group.
+
+    The fields are slots, so an entry holds no dictionary. Each class has a
+    generated `__init__` taking the field values as keyword arguments, and
+    fields which are not given are None.
+    """
+
+    __slots__ = ()
+
+    # The names of the fields in encoding order.
+    fields: ClassVar[Tuple[str, ...]] = ()
+    # The classes of the entries of the groups by name.
+    groups: ClassVar[Dict[str, Type[TypedGroup]]] = {}
+    _members: ClassVar[List[MemberEncodePlan]] = []
+
+    # The decoder fills the slots by item assignment, as it does a dictionary.
+    __setitem__ = object.__setattr__
+
+    @classmethod
+    def from_mapping(cls, message: Mapping[str, Any]) -> TypedGroup:
+        """Create an entry from a message mapping.
+
+        Args:
+            message (Mapping[str, Any]): The message.
+
+        Returns:
+            TypedGroup: The entry.
+        """
+        # Setting the attributes is faster than passing the values as keyword
+        # arguments, which are matched against every field name.
+        entry = cls()
+        groups = cls.groups
+        for name, value in message.items():
+            if name in groups:
+                group_class = groups[name]
+                value = [group_class.from_mapping(item) for item in value]
+            setattr(entry, name, value)
+        return entry
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields which are not None as a dictionary.
+
+        Returns:
+            Dict[str, Any]: The message as a dictionary.
+        """
+        message: Dict[str, Any] = {}
+        for name in self.fields:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if name in self.groups:
+                value = [item.to_dict() for item in value]
+            message[name] = value
+        return message
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == cast(TypedGroup, other).to_dict()
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}: {self.to_dict()}'
+
+    __repr__ = __str__
+
+
+class TypedMessage(TypedGroup):
+    """The base class of the typed message classes.
+
+    The MsgType defaults to the type of the class.
+    """
+
+    # The fields set by encode are held here, as every message has them.
+    __slots__ = ('BeginString', 'BodyLength', 'CheckSum')
+
+    BeginString: Optional[str]
+    BodyLength: Optional[int]
+    CheckSum: Optional[str]
+
+    protocol: ClassVar[ProtocolMetaData]
+    meta_data: ClassVar[MessageMetaData]
+    # The fields decoded, when the class has a slot for only some of them.
+    projection: ClassVar[Optional[Projection]] = None
+
+    @classmethod
+    def decode_from(
+            cls,
+            buf: Buffer,
+            *,
+            strict: Union[bool, StrictMode] = True,
+            validate: bool = True,
+            sep: bytes = SOH,
+            convert_sep_for_checksum: bool = True,
+            into: Optional[TypedMessage] = None
+    ) -> TypedMessage:
+        """Decode a message of this type.
+
+        The fields are decoded straight into the slots of the message. A
+        handler which is done with each message before decoding the next can
+        reuse one instance with `into`. Its fields are reset, and the message
+        decoded into it. The entries of the groups are still new instances.
+
+        Args:
+            buf (Buffer): The FIX bytes buffer.
+            strict (Union[bool, StrictMode], optional): If true use strict
+                validation. Defaults to True.
+            validate (bool, optional): If true validate the message. Defaults
+                to True.
+            sep (bytes, optional): The field separator. Defaults to SOH.
+            convert_sep_for_checksum (bool, optional): If true convert the
+                separator before calculating the checksum. Defaults to True.
+            into (Optional[TypedMessage], optional): An instance of this
+                class to reuse for the message. Defaults to None, which
+                creates a new instance.
+
+        Raises:
+            DecodingError: If the message is of a different type.
+            ValueError: If `into` is not an instance of this class.
+
+        Returns:
+            TypedMessage: The decoded message.
+        """
+        return _decode_typed(
+            cls.protocol,
+            buf,
+            cls,
+            strict,
+            validate,
+            sep,
+            convert_sep_for_checksum,
+            into
+        )
+
+    def encode(
+            self,
+            sep: bytes = SOH,
+            convert_sep_for_checksum: bool = False
+    ) -> bytes:
+        """Encode the message, regenerating the body length and checksum.
+
+        Args:
+            sep (bytes, optional): The field separator. Defaults to SOH.
+            convert_sep_for_checksum (bool, optional): If true convert the field
+                separator before calculating the checksum. Defaults to False.
+
+        Returns:
+            bytes: The FIX bytes buffer.
+        """
+        protocol = self.protocol
+        self.BeginString = protocol.begin_string.decode('ascii')
+        self.BodyLength = 0
+        self.CheckSum = '000'
+
+        encoded_message: List[bytes] = []
+        _encode_fields(encoded_message, self, self._members)
+        buf, body_length, checksum = _regenerate_integrity(
+            protocol,
+            encoded_message,
+            sep,
+            convert_sep_for_checksum
+        )
+        self.BodyLength = body_length
+        self.CheckSum = checksum
+        return buf
+
+
+def _encode_fields(
+        encoded_message: List[bytes],
+        entry: TypedGroup,
+        members: List[MemberEncodePlan]
+) -> None:
+    for member in members:
+        item_data = getattr(entry, member.name)
+
+        # Check for required fields.
+        if item_data is None:
+            if member.is_required:
+                raise EncodingError(
+                    f'required field "{member.name}" is missing'
+                )
+            continue
+
+        if member.children is None:
+            encoded_message.append(member.prefix + member.encoder(item_data))
+        else:
+            encoded_message.append(
+                member.prefix + member.encoder(len(item_data))
+            )
+            for group_item in item_data:
+                _encode_fields(encoded_message, group_item, member.children)
+
+
+def _create_init(
+        fields: Tuple[str, ...],
+        defaults: Mapping[str, Any]
+) -> Callable[..., None]:
+    # Setting every slot means reading a field never raises, and never needs a
+    # __getattr__ fallback. The arguments and assignments are generated, as
+    # assigning the slots one at a time with setattr is much slower.
+    for name in fields:
+        if not name.isidentifier() or iskeyword(name):
+            raise ValueError(f'field {name} is not a valid attribute name')
+    arguments = ', '.join(f'{name}=None' for name in fields)
+    source = f'def __init__(self, *, {arguments}):\n' + ''.join(
+        f'    self.{name} = {name}\n'
+        for name in fields
+    )
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)  # pylint: disable=exec-used
+    init = namespace['__init__']
+    init.__kwdefaults__ = {**init.__kwdefaults__, **defaults}
+    return cast(Callable[..., None], init)
+
+
+def _create_class(
+        name: str,
+        base: Type[TypedGroup],
+        members: List[MemberEncodePlan],
+        namespace: Mapping[str, Any],
+        defaults: Mapping[str, Any]
+) -> Type[TypedGroup]:
+    fields = tuple(dict.fromkeys(member.name for member in members))
+    groups = {
+        member.name: _create_class(
+            member.name,
+            TypedGroup,
+            cast(List[MemberEncodePlan], member.children),
+            {},
+            {}
+        )
+        for member in members
+        if member.children is not None
+    }
+    return type(
+        name,
+        (base,),
+        {
+            '__slots__': tuple(
+                field for field in fields
+                if field not in base.__slots__
+            ),
+            '__init__': _create_init(fields, defaults),
+            'fields': fields,
+            'groups': groups,
+            '_members': members,
+            **namespace
+        }
+    )
+
+
+def _decode_typed(
+        protocol: ProtocolMetaData,
+        buf: Buffer,
+        message_class: Optional[Type[TypedMessage]],
+        strict: Union[bool, StrictMode],
+        validate: bool,
+        sep: bytes,
+        convert_sep_for_checksum: bool,
+        into: Optional[TypedMessage] = None
+) -> TypedMessage:
+    if isinstance(strict, bool):
+        strict = StrictMode.ALL if strict else StrictMode.NONE
+
+    buf = to_bytes(buf)
+    encoded_message = tokenize(buf, sep)
+    meta_data = _find_encoded_message_meta_data(
+        protocol,
+        encoded_message,
+        len(encoded_message)
+    )
+    if message_class is None:
+        message_class = get_message_class(protocol, meta_data.msgtype)
+    elif meta_data is not message_class.meta_data:
+        raise DecodingError(
+            f'expected {message_class.meta_data.name} '
+            f'but received {meta_data.name}'
+        )
+
+    if into is None:
+        message = message_class()
+    elif type(into) is message_class:
+        # The generated __init__ resets every slot to its default.
+        message = into
+        message_class.__init__(message)
+    else:
+        raise ValueError(
+            f'expected an instance of {message_class.__name__} '
+            f'but received {type(into).__name__}'
+        )
+    _decode_encoded_message(
+        protocol,
+        encoded_message,
+        cast(Any, message),
+        strict,
+        False,
+        message_class.projection
+    )
+    if validate:
+        assert_message_valid(
+            protocol,
+            buf,
+            encoded_message,
+            sep,
+            convert_sep_for_checksum
+        )
+    return message
+
+
+def get_message_class(
+        protocol: ProtocolMetaData,
+        message: Union[str, bytes],
+        fields: Optional[Iterable[str]] = None
+) -> Type[TypedMessage]:
+    """Get the typed class of a message, creating it on first use.
+
+    The class has a slot for each field of the header, body and trailer, and
+    the entries of the groups are instances of slotted classes found in
+    `groups`. The field order and encoders are taken from the compiled encode
+    plan.
+
+    ```python
+    ExecutionReport = get_message_class(protocol, 'ExecutionReport')
+    report = ExecutionReport.decode_from(buf)
+    print(report.OrdStatus, report.LastPx)
+    ```
+
+    As every slot takes space whether or not it is set, an instance of a
+    message defining hundreds of fields is larger than a dictionary of the
+    fields it holds. When only some fields are used they can be given, and the
+    class has slots for just those and the required fields. Only those fields
+    are decoded, and a group given is decoded in full.
+
+    ```python
+    NewOrderSingle = get_message_class(
+        protocol,
+        'NewOrderSingle',
+        ['Account', 'Price', 'OrderQty']
+    )
+    ```
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        message (Union[str, bytes]): The message name (e.g.
+            'ExecutionReport') or message type (e.g. b'8').
+        fields (Optional[Iterable[str]], optional): The names of the optional
+            header, body and trailer fields to hold. Defaults to None, for
+            every field.
+
+    Raises:
+        ValueError: If a field is not a member of the message.
+
+    Returns:
+        Type[TypedMessage]: The message class.
+    """
+    meta_data = (
+        protocol.messages_by_name[message] if isinstance(message, str)
+        else protocol.messages_by_type[message]
+    )
+    selected = None if fields is None else frozenset(fields)
+
+    if protocol.message_classes is None:
+        protocol.message_classes = {}
+    message_classes = cast(
+        Dict[Tuple[bytes, Optional[frozenset]], Type[TypedMessage]],
+        protocol.message_classes
+    )
+
+    key = (meta_data.msgtype, selected)
+    message_class = message_classes.get(key)
+    if message_class is None:
+        members = get_encode_plan(protocol).message(meta_data)
+        projection = None
+        if selected is not None:
+            unknown = selected - {member.name for member in members}
+            if unknown:
+                raise ValueError(
+                    f'{sorted(unknown)} are not fields of {meta_data.name}'
+                )
+            members = [
+                member
+                for member in members
+                if member.name in selected or member.is_required
+            ]
+            projection = compile_projection(
+                protocol,
+                [member.name for member in members]
+            )
+
+        msg_type_field = protocol.fields_by_name['MsgType']
+        message_class = cast(
+            Type[TypedMessage],
+            _create_class(
+                meta_data.name,
+                TypedMessage,
+                members,
+                {
+                    'protocol': protocol,
+                    'meta_data': meta_data,
+                    'projection': projection
+                },
+                {
+                    'MsgType': bind_decoder(protocol, msg_type_field)(
+                        meta_data.msgtype
+                    )
+                }
+            )
+        )
+        message_classes[key] = message_class
+    return message_class
+
+
+def create_message_classes(
+        protocol: ProtocolMetaData
+) -> Dict[str, Type[TypedMessage]]:
+    """Create the typed classes for every message in the protocol.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+
+    Returns:
+        Dict[str, Type[TypedMessage]]: The message classes by message name.
+    """
+    return {
+        name: get_message_class(protocol, name)
+        for name in protocol.messages_by_name
+    }
+
+
+def decode_typed(
+        protocol: ProtocolMetaData,
+        buf: Buffer,
+        *,
+        strict: Union[bool, StrictMode] = True,
+        validate: bool = True,
+        sep: bytes = SOH,
+        convert_sep_for_checksum: bool = True
+) -> TypedMessage:
+    """Decode a message of any type to its typed class.
+
+    Args:
+        protocol (ProtocolMetaData): The protocol meta data.
+        buf (Buffer): The FIX bytes buffer.
+        strict (Union[bool, StrictMode], optional): If true use strict
+            validation. Defaults to True.
+        validate (bool, optional): If true validate the message. Defaults to
+            True.
+        sep (bytes, optional): The field separator. Defaults to SOH.
+        convert_sep_for_checksum (bool, optional): If true convert the
+            separator before calculating the checksum. Defaults to True.
+
+    Returns:
+        TypedMessage: The decoded message.
+    """
+    return _decode_typed(
+        protocol,
+        buf,
+        None,
+        strict,
+        validate,
+        sep,
+        convert_sep_for_checksum
+    )
@@ -1,6 +1,6 @@
 """FIX message validation"""
 
-from typing import Any, List, Mapping, Tuple
+from typing import List, Tuple
 
 from ..meta_data import (
     ProtocolMetaData,
@@ -24,18 +24,20 @@ def _assert_field_value_matches(
 def assert_message_valid(
         protocol: ProtocolMetaData,
         buf: bytes,
-        encoded_message: List[Tuple[bytes, bytes]],
-        decoded_message: Mapping[str, Any],
+        encoded_message: List[Tuple[bytes, bytes, bytes]],
         sep: bytes,
         convert_sep_to_soh_for_checksum: bool
 ) -> None:
     """Check the message is valid
 
+    The received values are read from the tokens, so the fields need not have
+    been decoded.
+
     Args:
         protocol (ProtocolMetaData): The protocol meta data
         buf (bytes): The FIX message as bytes
-        encoded_message (List[Tuple[bytes, bytes]]): The encoded message.
-        decoded_message (Mapping[str, Any]): The decoded message
+        encoded_message (List[Tuple[bytes, bytes, bytes]]): The tokenized
+            message.
         sep (bytes): The field separator
         convert_sep_to_soh_for_checksum (bool): If true convert the separator
             before calculating the checksum.
@@ -45,41 +47,28 @@ def assert_message_valid(
     """
     # Check the begin string.
     begin_string_field = protocol.fields_by_name['BeginString']
-    begin_string_value = encode_value(
-        protocol,
-        begin_string_field,
-        decoded_message[begin_string_field.name]
-    )
     _assert_field_value_matches(
         begin_string_field,
         protocol.begin_string,
-        begin_string_value
+        encoded_message[0][2]
     )
 
-    # Check the body length.
+    # Check the body length, which is found from the lengths of the tokens.
+    # The encoded values are compared, so a value which is not a number, or
+    # is zero padded, is rejected.
     body_length_field = protocol.fields_by_name['BodyLength']
-    body_length_value = encode_value(
-        protocol,
-        body_length_field,
-        decoded_message[body_length_field.name]
-    )
     body_length = calc_body_length(buf, encoded_message, sep)
     _assert_field_value_matches(
         body_length_field,
-        body_length_value,
-        encode_value(protocol, body_length_field, body_length)
+        encode_value(protocol, body_length_field, body_length),
+        encoded_message[1][2]
     )
 
-    # Check the checksum.
+    # Check the checksum against the received value, which is the last token.
     check_sum_field = protocol.fields_by_name['CheckSum']
-    check_sum_value = encode_value(
-        protocol,
-        check_sum_field,
-        decoded_message[check_sum_field.name]
-    )
     check_sum = calc_checksum(buf, sep, convert_sep_to_soh_for_checksum)
     _assert_field_value_matches(
         check_sum_field,
         check_sum,
-        check_sum_value
+        encoded_message[-1][2]
     )
@@ -1,8 +1,9 @@
 """Value Decoders"""
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import Any, Callable, List, Mapping, Union
+import re
+from typing import Any, Callable, List, Mapping, Optional, Union
 
 from ..meta_data import ProtocolMetaData, FieldMetaData
 from ..types import ValueType
@@ -11,6 +12,9 @@ from .common import is_decodable_enum
 from .errors import DecodingError
 
 from .common import (
+    EPOCH_ORDINAL,
+    NANOS_PER_DAY,
+    NANOS_PER_SECOND,
     UTCTIMEONLY_FMT_MILLIS,
     UTCTIMEONLY_FMT_NO_MILLIS,
     UTCTIMESTAMP_FMT_MILLIS,
@@ -69,35 +73,65 @@ def _decode_float(
     return Decimal(value.decode('ascii')) if protocol.is_float_decimal else float(value)
 
 
+def _decode_fixed_point(
+        meta_data: FieldMetaData,
+        value: bytes,
+        places: int
+) -> int:
+    # The digits are joined and parsed as a single integer, which keeps the
+    # sign of values like "-0.5".
+    whole, _, fraction = value.partition(b'.')
+    if len(fraction) > places:
+        if fraction[places:].strip(b'0'):
+            raise DecodingError(
+                f'value {value!r} of field {meta_data.name} has more than '
+                f'{places} decimal places'
+            )
+        fraction = fraction[:places]
+    return int(whole + fraction.ljust(places, b'0'))
+
+
 def _decode_qty(
         protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        meta_data: FieldMetaData,
         value: bytes
-) -> Union[float, Decimal]:
+) -> Union[float, Decimal, int]:
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None:
+        return _decode_fixed_point(meta_data, value, places)
     return Decimal(value.decode('ascii')) if protocol.is_float_decimal else float(value)
 
 
 def _decode_price(
         protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        meta_data: FieldMetaData,
         value: bytes
-) -> Union[float, Decimal]:
+) -> Union[float, Decimal, int]:
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None:
+        return _decode_fixed_point(meta_data, value, places)
     return Decimal(value.decode('ascii')) if protocol.is_float_decimal else float(value)
 
 
 def _decode_price_offset(
         protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        meta_data: FieldMetaData,
         value: bytes
-) -> Union[float, Decimal]:
+) -> Union[float, Decimal, int]:
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None:
+        return _decode_fixed_point(meta_data, value, places)
     return Decimal(value.decode('ascii')) if protocol.is_float_decimal else float(value)
 
 
 def _decode_amt(
         protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        meta_data: FieldMetaData,
         value: bytes
-) -> Union[float, Decimal]:
+) -> Union[float, Decimal, int]:
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None:
+        return _decode_fixed_point(meta_data, value, places)
     return Decimal(value.decode('ascii')) if protocol.is_float_decimal else float(value)
 
 
@@ -158,40 +192,131 @@ def _decode_bool(
         return value == b'Y'
 
 
+# Timestamps are parsed with a pattern rather than strptime, which is much
+# slower. Fractions of up to nine digits are accepted. They are truncated to
+# the microsecond precision of datetime, but kept for integer times.
+_UTCTIMESTAMP_PATTERN = re.compile(
+    rb'(\d{4})(\d\d)(\d\d)-(\d\d):(\d\d):(\d\d)(?:\.(\d{1,9}))?'
+)
+_UTCTIMEONLY_PATTERN = re.compile(
+    rb'(\d\d):(\d\d):(\d\d)(?:\.(\d{1,9}))?'
+)
+
+
+def _to_micros(fraction: Optional[bytes]) -> int:
+    return int(fraction[:6].ljust(6, b'0')) if fraction else 0
+
+
+def _to_nanos(
+        days: int,
+        hour: int,
+        minute: int,
+        second: int,
+        fraction: Optional[bytes]
+) -> int:
+    # A second of 60 is a leap second.
+    if hour > 23 or minute > 59 or second > 60:
+        raise ValueError('time out of range')
+    seconds = ((days * 24 + hour) * 60 + minute) * 60 + second
+    nanos = int(fraction.ljust(9, b'0')) if fraction else 0
+    return seconds * NANOS_PER_SECOND + nanos
+
+
+def _datetime_to_nanos(value: datetime, days: int) -> int:
+    return _to_nanos(
+        days,
+        value.hour,
+        value.minute,
+        value.second,
+        b'%06d' % value.microsecond
+    )
+
+
 def _decode_utc_timestamp(
-        _protocol: ProtocolMetaData,
+        protocol: ProtocolMetaData,
         _meta_data: FieldMetaData,
         value: bytes
-) -> datetime:
+) -> Union[datetime, int]:
     # We can be more relaxed about decoding timestamps.
     # We accept either:
     #   YYYYmmdd-HH:MM:SS (length 17)
-    #   YYYYmmdd-HH:MM:SS.fff or YYYYmmdd-HH:MM:SS.ffffff
+    #   YYYYmmdd-HH:MM:SS.fff, YYYYmmdd-HH:MM:SS.ffffff or
+    #   YYYYmmdd-HH:MM:SS.fffffffff
+    match = _UTCTIMESTAMP_PATTERN.fullmatch(value)
+    if match is not None:
+        year, month, day, hour, minute, second, fraction = match.groups()
+        if protocol.is_integer_time:
+            return _to_nanos(
+                date(int(year), int(month), int(day)).toordinal() -
+                EPOCH_ORDINAL,
+                int(hour),
+                int(minute),
+                int(second),
+                fraction
+            )
+        return datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            _to_micros(fraction),
+            timezone.utc
+        )
+
+    # Anything else is left to strptime, which raises for malformed input.
     text = value.decode('ascii')
     if len(text) == 17:
         fmt = UTCTIMESTAMP_FMT_NO_MILLIS
     else:
         fmt = UTCTIMESTAMP_FMT_MILLIS
 
-    return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+    timestamp = datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+    if protocol.is_integer_time:
+        return _datetime_to_nanos(
+            timestamp,
+            timestamp.toordinal() - EPOCH_ORDINAL
+        )
+    return timestamp
 
 
 def _decode_utc_time_only(
-        _protocol: ProtocolMetaData,
+        protocol: ProtocolMetaData,
         _meta_data: FieldMetaData,
         value: bytes
-) -> datetime:
+) -> Union[datetime, int]:
     # We can be more relaxed about decoding timestamps.
     # We accept either:
     #   HH:MM:SS (length 8)
-    #   HH:MM:SS.fff  or HH:MM:SS.ffffff
+    #   HH:MM:SS.fff, HH:MM:SS.ffffff or HH:MM:SS.fffffffff
+    match = _UTCTIMEONLY_PATTERN.fullmatch(value)
+    if match is not None:
+        hour, minute, second, fraction = match.groups()
+        if protocol.is_integer_time:
+            return _to_nanos(0, int(hour), int(minute), int(second), fraction)
+        # The date is the strptime default.
+        return datetime(
+            1900,
+            1,
+            1,
+            int(hour),
+            int(minute),
+            int(second),
+            _to_micros(fraction),
+            timezone.utc
+        )
+
     text = value.decode('ascii')
     if len(text) == 8:
         fmt = UTCTIMEONLY_FMT_NO_MILLIS
     else:
         fmt = UTCTIMEONLY_FMT_MILLIS
 
-    return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+    time_only = datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+    if protocol.is_integer_time:
+        return _datetime_to_nanos(time_only, 0)
+    return time_only
 
 
 def _decode_localmktdate(
@@ -203,11 +328,14 @@ def _decode_localmktdate(
 
 
 def _decode_utcdate(
-        _protocol: ProtocolMetaData,
+        protocol: ProtocolMetaData,
         _meta_data: FieldMetaData,
         value: bytes
-) -> datetime:
-    return datetime.strptime(value.decode('ascii'), '%Y%m%d')
+) -> Union[datetime, int]:
+    utc_date = datetime.strptime(value.decode('ascii'), '%Y%m%d')
+    if protocol.is_integer_time:
+        return (utc_date.toordinal() - EPOCH_ORDINAL) * NANOS_PER_DAY
+    return utc_date
 
 
 def _decode_monthyear(
@@ -268,3 +396,34 @@ def decode_value(
     if not decoder:
         raise DecodingError(f'Unknown type "{meta_data.type}"')
     return decoder(protocol, meta_data, value)
+
+
+def bind_decoder(
+        protocol: ProtocolMetaData,
+        meta_data: FieldMetaData
+) -> Callable[[bytes], Any]:
+    """Bind the value decoder for a field.
+
+    The returned function behaves like `decode_value` with the protocol and
+    field meta data already supplied, avoiding the decoder lookup per value.
+
+    Args:
+        protocol (ProtocolMetaData): The FIX protocol
+        meta_data (FieldMetaData): The field meta data
+
+    Returns:
+        Callable[[bytes], Any]: A function to decode a value of the field.
+    """
+    decoder = _DECODERS.get(meta_data.type)
+
+    if not decoder:
+        def decode_unknown(value: bytes) -> Any:
+            if not value:
+                return None
+            raise DecodingError(f'Unknown type "{meta_data.type}"')
+        return decode_unknown
+
+    def decode(value: bytes) -> Any:
+        return decoder(protocol, meta_data, value) if value else None  # type: ignore
+
+    return decode
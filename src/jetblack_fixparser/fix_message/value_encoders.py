@@ -1,6 +1,6 @@
 """Value Encoders"""
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Any, Callable, List, Mapping, Union
 
@@ -8,6 +8,9 @@ from ..meta_data import ProtocolMetaData, FieldMetaData
 from ..types import ValueType
 
 from .common import (
+    EPOCH_ORDINAL,
+    NANOS_PER_DAY,
+    NANOS_PER_SECOND,
     UTCTIMESTAMP_FMT_NO_MILLIS,
     UTCTIMESTAMP_FMT_MILLIS,
     UTCTIMEONLY_FMT_NO_MILLIS,
@@ -73,12 +76,23 @@ def _encode_float(
         return str(value).encode()
 
 
+def _encode_fixed_point(value: int, places: int) -> bytes:
+    whole, fraction = divmod(abs(value), 10 ** places)
+    sign = b'-' if value < 0 else b''
+    if not fraction:
+        return sign + b'%d' % whole
+    return sign + (b'%d.%0*d' % (whole, places, fraction)).rstrip(b'0')
+
+
 def _encode_qty(
-        _protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        protocol: ProtocolMetaData,
+        meta_data: FieldMetaData,
         value: Union[Decimal, float, int]
 ) -> bytes:
-    if isinstance(value, Decimal):
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None and isinstance(value, int):
+        return _encode_fixed_point(value, places)
+    elif isinstance(value, Decimal):
         return str(value).encode()
     elif value != int(value):
         return str(int(value)).encode()
@@ -87,11 +101,14 @@ def _encode_qty(
 
 
 def _encode_price(
-        _protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        protocol: ProtocolMetaData,
+        meta_data: FieldMetaData,
         value: Union[Decimal, float, int]
 ) -> bytes:
-    if isinstance(value, Decimal):
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None and isinstance(value, int):
+        return _encode_fixed_point(value, places)
+    elif isinstance(value, Decimal):
         return str(value).encode()
     elif value != int(value):
         return str(int(value)).encode()
@@ -100,11 +117,14 @@ def _encode_price(
 
 
 def _encode_price_offset(
-        _protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        protocol: ProtocolMetaData,
+        meta_data: FieldMetaData,
         value: Union[Decimal, float, int]
 ) -> bytes:
-    if isinstance(value, Decimal):
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None and isinstance(value, int):
+        return _encode_fixed_point(value, places)
+    elif isinstance(value, Decimal):
         return str(value).encode()
     elif value != int(value):
         return str(int(value)).encode()
@@ -113,11 +133,14 @@ def _encode_price_offset(
 
 
 def _encode_amt(
-        _protocol: ProtocolMetaData,
-        _meta_data: FieldMetaData,
+        protocol: ProtocolMetaData,
+        meta_data: FieldMetaData,
         value: Union[Decimal, float, int]
 ) -> bytes:
-    if isinstance(value, Decimal):
+    places = protocol.fixed_point_places.get(meta_data.name)
+    if places is not None and isinstance(value, int):
+        return _encode_fixed_point(value, places)
+    elif isinstance(value, Decimal):
         return str(value).encode()
     elif value != int(value):
         return str(int(value)).encode()
@@ -190,12 +213,41 @@ def _encode_multi_value_str(
     return ' '.join(value).encode()
 
 
+def _format_date(days: int) -> str:
+    value = date.fromordinal(days + EPOCH_ORDINAL)
+    return f'{value.year:04}{value.month:02}{value.day:02}'
+
+
+def _format_time(nanos: int, is_millisecond_time: bool) -> str:
+    # The fraction is written with as many digits as are needed to hold the
+    # value exactly, and at least milliseconds when they are required.
+    seconds, fraction = divmod(nanos, NANOS_PER_SECOND)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    text = f'{hour:02}:{minute:02}:{second:02}'
+    if fraction % 1000000 == 0:
+        if fraction or is_millisecond_time:
+            text += f'.{fraction // 1000000:03}'
+    elif fraction % 1000 == 0:
+        text += f'.{fraction // 1000:06}'
+    else:
+        text += f'.{fraction:09}'
+    return text
+
+
 def _encode_utc_timestamp(
         protocol: ProtocolMetaData,
         _meta_data: FieldMetaData,
-        value: datetime
+        value: Union[datetime, int]
 ) -> bytes:
-    if protocol.is_millisecond_time:
+    if isinstance(value, int):
+        days, nanos = divmod(value, NANOS_PER_DAY)
+        return (
+            _format_date(days) +
+            '-' +
+            _format_time(nanos, protocol.is_millisecond_time)
+        ).encode()
+    elif protocol.is_millisecond_time:
         return value.strftime(UTCTIMESTAMP_FMT_MILLIS)[:-3].encode()
     else:
         return value.strftime(UTCTIMESTAMP_FMT_NO_MILLIS).encode()
@@ -204,9 +256,14 @@ def _encode_utc_timestamp(
 def _encode_utc_time_only(
         protocol: ProtocolMetaData,
         _meta_data: FieldMetaData,
-        value: datetime
+        value: Union[datetime, int]
 ) -> bytes:
-    if protocol.is_millisecond_time:
+    if isinstance(value, int):
+        return _format_time(
+            value % NANOS_PER_DAY,
+            protocol.is_millisecond_time
+        ).encode()
+    elif protocol.is_millisecond_time:
         return value.strftime(UTCTIMEONLY_FMT_MILLIS).encode()
     else:
         return value.strftime(UTCTIMEONLY_FMT_NO_MILLIS).encode()
@@ -223,8 +280,10 @@ def _encode_localmktdate(
 def _encode_utcdate(
         _protocol: ProtocolMetaData,
         _meta_data: FieldMetaData,
-        value: datetime
+        value: Union[datetime, int]
 ) -> bytes:
+    if isinstance(value, int):
+        return _format_date(value // NANOS_PER_DAY).encode()
     return value.strftime('%Y%m%d').encode()
 
 
@@ -279,3 +338,36 @@ def encode_value(
         raise EncodingError(f'Unknown type "{meta_data.type}"')
 
     return encoder(protocol, meta_data, value)
+
+
+def bind_encoder(
+        protocol: ProtocolMetaData,
+        meta_data: FieldMetaData
+) -> Callable[[Any], bytes]:
+    """Bind the value encoder for a field.
+
+    The returned function behaves like `encode_value` with the protocol and
+    field meta data already supplied, avoiding the encoder lookup per value.
+
+    Args:
+        protocol (ProtocolMetaData): The FIX protocol meta data
+        meta_data (FieldMetaData): The field meta data
+
+    Returns:
+        Callable[[Any], bytes]: A function to encode a value of the field.
+    """
+    encoder = _ENCODERS.get(meta_data.type)
+
+    if not encoder:
+        def encode_unknown(value: Any) -> bytes:
+            if value is None:
+                return b''
+            raise EncodingError(f'Unknown type "{meta_data.type}"')
+        return encode_unknown
+
+    def encode(value: Any) -> bytes:
+        if value is None:
+            return b''
+        return encoder(protocol, meta_data, value)  # type: ignore
+
+    return encode
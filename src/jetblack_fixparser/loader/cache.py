@@ -0,0 +1,142 @@
+"""A cache of loaded protocols"""
+
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+from typing import Any, Callable, Mapping, Optional, Tuple, Union
+
+from ..meta_data import ProtocolMetaData
+from ..types import ValueType
+
+# Increment this when the layout of the meta data classes changes, to
+# invalidate existing cache files.
+_CACHE_VERSION = 3
+
+
+def _cache_key(
+        filename: Path,
+        is_millisecond_time: bool,
+        is_float_decimal: bool,
+        is_integer_time: bool,
+        fixed_point_places: Optional[Mapping[Union[ValueType, str], int]],
+        is_type_enum: Optional[Mapping[Union[ValueType, str], bool]]
+) -> Tuple[str, str]:
+    # The source key identifies the protocol file and options, and the content
+    # key the version of the file.
+    stat = filename.stat()
+    type_enums = sorted(
+        (key.name if isinstance(key, ValueType) else key, value)
+        for key, value in (is_type_enum or {}).items()
+    )
+
+    places = sorted(
+        (key.name if isinstance(key, ValueType) else key, value)
+        for key, value in (fixed_point_places or {}).items()
+    )
+
+    source_key = hashlib.sha256()
+    source_key.update(str(filename.resolve()).encode())
+    source_key.update(str(
+        (
+            is_millisecond_time,
+            is_float_decimal,
+            is_integer_time,
+            places,
+            type_enums
+        )
+    ).encode())
+
+    content_key = hashlib.sha256()
+    content_key.update(str(_CACHE_VERSION).encode())
+    content_key.update(str(stat.st_mtime_ns).encode())
+    content_key.update(filename.read_bytes())
+
+    return source_key.hexdigest()[:16], content_key.hexdigest()
+
+
+def _remove_stale_files(cache_dir: Path, prefix: str, cache_file: Path) -> None:
+    # Remove the entries for earlier versions of the protocol file.
+    for stale_file in cache_dir.glob(f'{prefix}-*.pickle'):
+        if stale_file != cache_file:
+            try:
+                stale_file.unlink()
+            except OSError:
+                pass
+
+
+def load_cached_protocol(
+        filename: Path,
+        cache_dir: Union[str, Path],
+        load: Callable[[], ProtocolMetaData],
+        *,
+        is_millisecond_time: bool,
+        is_float_decimal: bool,
+        is_integer_time: bool,
+        fixed_point_places: Optional[Mapping[Union[ValueType, str], int]],
+        is_type_enum: Optional[Mapping[Union[ValueType, str], bool]]
+) -> ProtocolMetaData:
+    """Load a protocol from the cache, or load and cache it.
+
+    The cache entry is keyed on the path, modification time and contents of the
+    protocol file, and the protocol options. When the protocol file changes the
+    entry for the previous version is removed. A cache file which cannot be
+    read is replaced.
+
+    Args:
+        filename (Path): The protocol file.
+        cache_dir (Union[str, Path]): The folder holding the cache files.
+        load (Callable[[], ProtocolMetaData]): A function to load the protocol
+            when it is not in the cache.
+        is_millisecond_time (bool): The millisecond time option.
+        is_float_decimal (bool): The decimal option.
+        is_integer_time (bool): The integer time option.
+        fixed_point_places (Optional[Mapping[Union[ValueType, str], int]]):
+            The fixed point option.
+        is_type_enum (Optional[Mapping[Union[ValueType, str], bool]]): The
+            enum option.
+
+    Returns:
+        ProtocolMetaData: The protocol meta data.
+    """
+    if not isinstance(cache_dir, Path):
+        cache_dir = Path(cache_dir)
+
+    source_key, content_key = _cache_key(
+        filename,
+        is_millisecond_time,
+        is_float_decimal,
+        is_integer_time,
+        fixed_point_places,
+        is_type_enum
+    )
+    prefix = f'{filename.stem}-{source_key}'
+    cache_file = cache_dir / f'{prefix}-{content_key}.pickle'
+
+    try:
+        with cache_file.open('rb') as file_ptr:
+            protocol: Any = pickle.load(file_ptr)
+        if isinstance(protocol, ProtocolMetaData):
+            return protocol
+    except Exception:  # pylint: disable=broad-except
+        # A missing, truncated or incompatible file is rebuilt. Unpickling can
+        # fail with almost any exception.
+        pass
+
+    protocol = load()
+
+    # Write to a temporary file and rename it, so concurrent readers never see
+    # a partial file.
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file_ptr:
+            pickle.dump(protocol, file_ptr, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_name, cache_file)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+    _remove_stale_files(cache_dir, prefix, cache_file)
+
+    return protocol
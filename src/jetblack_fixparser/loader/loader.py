@@ -14,6 +14,8 @@ def load_protocol(
         *,
         is_millisecond_time: bool = True,
         is_float_decimal: bool = False,
+        is_integer_time: bool = False,
+        fixed_point_places: Optional[Mapping[Union[ValueType, str], int]] = None,
         is_type_enum: Optional[Mapping[Union[ValueType, str], bool]] = None
 ) -> ProtocolMetaData:
     """Load a protocol
@@ -24,6 +26,12 @@ def load_protocol(
             Defaults to True.
         is_float_decimal (bool, optional): If true use Decimal for floating
             point numbers. Defaults to False.
+        is_integer_time (bool, optional): If true decode UTC timestamps, times
+            and dates to integer nanoseconds. Defaults to False.
+        fixed_point_places (Optional[Mapping[Union[ValueType, str], int]], optional):
+            A map of value types (PRICE, QTY, AMT or PRICEOFFSET) or field
+            names to a number of decimal places. These fields are decoded to
+            scaled integers. Defaults to None.
         is_type_enum (Optional[Mapping[Union[ValueType, str], bool]], optional):
             An optional map to control the serialization of types to enums.
             Defaults to None.
@@ -49,5 +57,7 @@ def load_protocol(
         trailer,
         is_millisecond_time=is_millisecond_time,
         is_float_decimal=is_float_decimal,
+        is_integer_time=is_integer_time,
+        fixed_point_places=fixed_point_places,
         is_type_enum=is_type_enum
     )
@@ -1,6 +1,6 @@
 """Messages"""
 
-from typing import Any, Mapping, MutableMapping, Optional
+from typing import Any, Dict, Mapping, MutableMapping, Optional
 
 from ..meta_data import FieldMetaData, ComponentMetaData, MessageMemberMetaData, MessageMetaData
 
@@ -121,16 +121,22 @@ def parse_components(
     if info is None:
         return dict()
 
-    # Declare components first to handle forward references.
+    # Declare components first to handle forward references. The members are
+    # filled in afterwards, as the meta data is immutable.
+    members: Dict[str, Dict[str, MessageMemberMetaData]] = {
+        name: {}
+        for name in info.keys()
+    }
     components = {
-        name: ComponentMetaData(name, {})
+        name: ComponentMetaData(name, members[name])
         for name in info.keys()
     }
     for name, data in info.items():
-        component = components[name]
-        component.members = _to_message_member_meta_data(
-            data,
-            field_meta_data,
-            components
+        members[name].update(
+            _to_message_member_meta_data(
+                data,
+                field_meta_data,
+                components
+            )
         )
     return components
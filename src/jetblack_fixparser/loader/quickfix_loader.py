@@ -1,91 +1,46 @@
 """A loader for QuickFix metadata (XML format)"""
 
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional, Union
-import xml.dom.minidom as minidom
-import xml.dom as dom
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from xml.etree.ElementTree import Element, iterparse
 
 from ..meta_data import ProtocolMetaData
 from ..types import ValueType
 
+from .cache import load_cached_protocol
 from .loader import load_protocol
 
-
-def _process_members(node: Any) -> Dict[str, Any]:
-    members: Dict[str, Any] = {}
-    for child in node.childNodes:
-        if child.nodeType != dom.Node.ELEMENT_NODE:
-            continue
-
-        if child.nodeName == 'field':
-            members[child.attributes['name'].value] = {
-                'type': 'field',
-                'required': child.attributes['required'].value == 'Y'
-            }
-        elif child.nodeName == 'group':
-            members[child.attributes['name'].value] = {
-                'type': 'group',
-                'required': child.attributes['required'].value == 'Y',
-                'fields': _process_members(child)
-            }
-        elif child.nodeName == 'component':
-            members[child.attributes['name'].value] = {
-                'type': 'component',
-                'required': child.attributes['required'].value == 'Y'
-            }
-        else:
-            raise RuntimeError(f'invalid member node {child.nodeName}')
-    return members
-
-
-def _process_message(node: Any) -> Dict[str, Any]:
-    return {
-        'msgtype': node.attributes['msgtype'].value,
-        'msgcat': node.attributes['msgcat'].value,
-        'fields': _process_members(node)
-    }
-
-
-def _process_field(node: Any) -> Dict[str, Any]:
-    return {
-        'number': node.attributes['number'].value,
-        'type': node.attributes['type'].value,
-        'values': {
-            child.attributes['enum'].value: child.attributes['description'].value
-            for child in node.childNodes if child.nodeType == dom.Node.ELEMENT_NODE
+_SECTIONS = ('header', 'trailer', 'messages', 'components', 'fields')
+
+
+def _process_member(
+        attrib: Mapping[str, str],
+        tag: str,
+        members: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    required = attrib['required'] == 'Y'
+    if tag == 'field':
+        members[attrib['name']] = {'type': 'field', 'required': required}
+    elif tag == 'group':
+        fields: Dict[str, Any] = {}
+        members[attrib['name']] = {
+            'type': 'group',
+            'required': required,
+            'fields': fields
         }
-    }
-
-
-def _process_messages(node: Any) -> Dict[str, Any]:
+        return fields
+    elif tag == 'component':
+        members[attrib['name']] = {'type': 'component', 'required': required}
+    else:
+        raise RuntimeError(f'invalid member node {tag}')
+    return None
+
+
+def _process_root(attrib: Mapping[str, str]) -> Dict[str, Any]:
+    major = attrib['major']
+    minor = attrib['minor']
+    servicepack = attrib['servicepack']
     return {
-        child.attributes['name'].value: _process_message(child)
-        for child in node.childNodes
-        if child.nodeType == dom.Node.ELEMENT_NODE and child.nodeName == 'message'
-    }
-
-
-def _process_components(node: Any) -> Dict[str, Any]:
-    return {
-        child.attributes['name'].value: _process_members(child)
-        for child in node.childNodes
-        if child.nodeType == dom.Node.ELEMENT_NODE and child.nodeName == 'component'
-    }
-
-
-def _process_fields(node: Any) -> Dict[str, Any]:
-    return {
-        child.attributes['name'].value: _process_field(child)
-        for child in node.childNodes
-        if child.nodeType == dom.Node.ELEMENT_NODE and child.nodeName == 'field'
-    }
-
-
-def _process_root(node: Any) -> Dict[str, Any]:
-    major = node.attributes['major'].value
-    minor = node.attributes['minor'].value
-    servicepack = node.attributes['servicepack'].value
-    protocol = {
         'version': {
             'major': major,
             'minor': minor,
@@ -99,39 +54,88 @@ def _process_root(node: Any) -> Dict[str, Any]:
         'messages': {}
     }
 
-    for child in node.childNodes:
-        if child.nodeType != dom.Node.ELEMENT_NODE:
+
+def _convert_xml_file_to_dict(filename: Path) -> Dict[str, Any]:
+    # The file is parsed in a single streaming pass. Each element is cleared
+    # and removed from its parent when it ends, so the parsed elements are
+    # never held in memory.
+    protocol: Dict[str, Any] = {}
+    # The elements which have started but not ended.
+    elements: List[Element] = []
+    # The member mappings being filled, with the depth of their element.
+    members_stack: List[Tuple[int, Dict[str, Any]]] = []
+    section = ''
+    # The values of the field being read. Elements in the fields section
+    # which are not fields have values which are discarded.
+    values: Dict[str, str] = {}
+
+    for event, element in iterparse(str(filename), events=('start', 'end')):
+        if event == 'end':
+            depth = len(elements)
+            if members_stack and members_stack[-1][0] == depth:
+                members_stack.pop()
+            elements.pop()
+            element.clear()
+            if elements:
+                # The parser may have read ahead and added later siblings, but
+                # the earlier ones are removed, so this is the first child.
+                elements[-1].remove(element)
             continue
 
-        if child.nodeName == 'header':
-            protocol['header'] = _process_members(child)
-        elif child.nodeName == 'trailer':
-            protocol['trailer'] = _process_members(child)
-        elif child.nodeName == 'messages':
-            protocol['messages'] = _process_messages(child)
-        elif child.nodeName == 'components':
-            protocol['components'] = _process_components(child)
-        elif child.nodeName == 'fields':
-            protocol['fields'] = _process_fields(child)
-        else:
-            raise RuntimeError(f'unknown node {child.nodeName}')
+        elements.append(element)
+        depth = len(elements)
+        tag, attrib = element.tag, element.attrib
+
+        if depth == 1:
+            protocol = _process_root(attrib)
+        elif depth == 2:
+            if tag not in _SECTIONS:
+                raise RuntimeError(f'unknown node {tag}')
+            section = tag
+            if tag in ('header', 'trailer'):
+                members_stack.append((depth, protocol[tag]))
+        elif section == 'fields':
+            if depth == 3:
+                values = {}
+                if tag == 'field':
+                    protocol['fields'][attrib['name']] = {
+                        'number': attrib['number'],
+                        'type': attrib['type'],
+                        'values': values
+                    }
+            elif depth == 4:
+                values[attrib['enum']] = attrib['description']
+        elif depth == 3 and section == 'messages':
+            if tag == 'message':
+                members: Dict[str, Any] = {}
+                protocol['messages'][attrib['name']] = {
+                    'msgtype': attrib['msgtype'],
+                    'msgcat': attrib['msgcat'],
+                    'fields': members
+                }
+                members_stack.append((depth, members))
+        elif depth == 3 and section == 'components':
+            if tag == 'component':
+                members = {}
+                protocol['components'][attrib['name']] = members
+                members_stack.append((depth, members))
+        elif members_stack and members_stack[-1][0] == depth - 1:
+            group = _process_member(attrib, tag, members_stack[-1][1])
+            if group is not None:
+                members_stack.append((depth, group))
 
     return protocol
 
 
-def _convert_xml_file_to_dict(filename: Path) -> Dict[str, Any]:
-    with filename.open() as file_ptr:
-        document = minidom.parse(file_ptr)
-        config = _process_root(document.documentElement)
-        return config
-
-
 def load_quickfix_protocol(
         filename: Union[str, Path],
         *,
         is_millisecond_time: bool = True,
         is_float_decimal: bool = False,
-        is_type_enum: Optional[Mapping[Union[ValueType, str], bool]] = None
+        is_integer_time: bool = False,
+        fixed_point_places: Optional[Mapping[Union[ValueType, str], int]] = None,
+        is_type_enum: Optional[Mapping[Union[ValueType, str], bool]] = None,
+        cache_dir: Optional[Union[str, Path]] = None
 ) -> ProtocolMetaData:
     """Load a QuickFix style XML protocol file
 
@@ -141,8 +145,17 @@ def load_quickfix_protocol(
             Defaults to True.
         is_float_decimal (bool, optional): If true use Decimal for floating
             point numbers. Defaults to False.
+        is_integer_time (bool, optional): If true decode UTC timestamps, times
+            and dates to integer nanoseconds. Defaults to False.
+        fixed_point_places (Optional[Mapping[Union[ValueType, str], int]], optional):
+            A map of value types (PRICE, QTY, AMT or PRICEOFFSET) or field
+            names to a number of decimal places. These fields are decoded to
+            scaled integers. Defaults to None.
         is_type_enum (Optional[Mapping[Union[ValueType, str], bool]], optional):
             A map of types to control serialization to enums. Defaults to None.
+        cache_dir (Optional[Union[str, Path]], optional): If given the loaded
+            protocol is cached in this folder, and loaded from the cache while
+            the file and options are unchanged. Defaults to None.
 
     Returns:
         ProtocolMetaData: The protocol meta data.
@@ -150,10 +163,27 @@ def load_quickfix_protocol(
     if not isinstance(filename, Path):
         filename = Path(filename)
 
-    config: Dict[str, Any] = _convert_xml_file_to_dict(filename)
-    return load_protocol(
-        config,
+    def load() -> ProtocolMetaData:
+        config: Dict[str, Any] = _convert_xml_file_to_dict(filename)
+        return load_protocol(
+            config,
+            is_millisecond_time=is_millisecond_time,
+            is_float_decimal=is_float_decimal,
+            is_integer_time=is_integer_time,
+            fixed_point_places=fixed_point_places,
+            is_type_enum=is_type_enum
+        )
+
+    if cache_dir is None:
+        return load()
+
+    return load_cached_protocol(
+        filename,
+        cache_dir,
+        load,
         is_millisecond_time=is_millisecond_time,
         is_float_decimal=is_float_decimal,
+        is_integer_time=is_integer_time,
+        fixed_point_places=fixed_point_places,
         is_type_enum=is_type_enum
     )
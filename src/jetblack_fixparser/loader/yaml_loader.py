@@ -8,6 +8,7 @@ from ruamel.yaml import YAML
 from ..meta_data import ProtocolMetaData
 from ..types import ValueType
 
+from .cache import load_cached_protocol
 from .loader import load_protocol
 
 
@@ -16,7 +17,10 @@ def load_yaml_protocol(
         *,
         is_millisecond_time: bool = True,
         is_float_decimal: bool = False,
-        is_type_enum: Optional[Mapping[Union[ValueType, str], bool]] = None
+        is_integer_time: bool = False,
+        fixed_point_places: Optional[Mapping[Union[ValueType, str], int]] = None,
+        is_type_enum: Optional[Mapping[Union[ValueType, str], bool]] = None,
+        cache_dir: Optional[Union[str, Path]] = None
 ) -> ProtocolMetaData:
     """Load a YAML style protocol file
 
@@ -26,8 +30,17 @@ def load_yaml_protocol(
             Defaults to True.
         is_float_decimal (bool, optional): If true use Decimal for floating
             point numbers. Defaults to False.
+        is_integer_time (bool, optional): If true decode UTC timestamps, times
+            and dates to integer nanoseconds. Defaults to False.
+        fixed_point_places (Optional[Mapping[Union[ValueType, str], int]], optional):
+            A map of value types (PRICE, QTY, AMT or PRICEOFFSET) or field
+            names to a number of decimal places. These fields are decoded to
+            scaled integers. Defaults to None.
         is_type_enum (Optional[Mapping[Union[ValueType, str], bool]], optional):
             Map controlling serialization to enums. Defaults to None.
+        cache_dir (Optional[Union[str, Path]], optional): If given the loaded
+            protocol is cached in this folder, and loaded from the cache while
+            the file and options are unchanged. Defaults to None.
 
     Returns:
         ProtocolMetaData: The protocol meta data.
@@ -35,12 +48,29 @@ def load_yaml_protocol(
     if not isinstance(filename, Path):
         filename = Path(filename)
 
-    yaml = YAML()
+    def load() -> ProtocolMetaData:
+        yaml = YAML()
 
-    with filename.open('rt', encoding="utf8") as file_ptr:
-        return load_protocol(
-            yaml.load(file_ptr),
-            is_millisecond_time=is_millisecond_time,
-            is_float_decimal=is_float_decimal,
-            is_type_enum=is_type_enum
-        )
+        with filename.open('rt', encoding="utf8") as file_ptr:
+            return load_protocol(
+                yaml.load(file_ptr),
+                is_millisecond_time=is_millisecond_time,
+                is_float_decimal=is_float_decimal,
+                is_integer_time=is_integer_time,
+                fixed_point_places=fixed_point_places,
+                is_type_enum=is_type_enum
+            )
+
+    if cache_dir is None:
+        return load()
+
+    return load_cached_protocol(
+        filename,
+        cache_dir,
+        load,
+        is_millisecond_time=is_millisecond_time,
+        is_float_decimal=is_float_decimal,
+        is_integer_time=is_integer_time,
+        fixed_point_places=fixed_point_places,
+        is_type_enum=is_type_enum
+    )
@@ -0,0 +1,25 @@
+"""A base class for immutable meta data"""
+
+from typing import Any
+
+
+class Immutable:
+    """A base class for slotted classes whose attributes can only be set once.
+
+    Attributes are set in `__init__`, or when unpickling, after which they are
+    read only.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(self, name):
+            raise AttributeError(
+                f"'{type(self).__name__}' attribute '{name}' is read only"
+            )
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(
+            f"'{type(self).__name__}' attribute '{name}' is read only"
+        )
@@ -2,6 +2,7 @@
 
 from typing import Mapping, Union
 
+from .immutable import Immutable
 from .message_member import MessageMemberMetaData
 
 MessageFieldMetaDataMapping = Mapping[
@@ -10,9 +11,11 @@ MessageFieldMetaDataMapping = Mapping[
 ]
 
 
-class MessageMetaData:
+class MessageMetaData(Immutable):
     """FIX message meta data"""
 
+    __slots__ = ('name', 'msgtype', 'msgcat', 'fields')
+
     def __init__(
             self,
             name: str,
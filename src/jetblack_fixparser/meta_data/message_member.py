@@ -4,10 +4,14 @@ from __future__ import annotations
 
 from typing import Mapping, Optional, Union
 
+from .immutable import Immutable
 
-class FieldMetaData:
+
+class FieldMetaData(Immutable):
     """Field meta data"""
 
+    __slots__ = ('name', 'number', 'tag', 'type', 'values', 'values_by_name')
+
     def __init__(
             self,
             name: str,
@@ -26,6 +30,7 @@ class FieldMetaData:
         """
         self.name = name
         self.number = number
+        self.tag = int(number)
         self.type = type_
         self.values = values
         self.values_by_name = {
@@ -53,9 +58,11 @@ class FieldMetaData:
     __repr__ = __str__
 
 
-class ComponentMetaData:
+class ComponentMetaData(Immutable):
     """Component meta data"""
 
+    __slots__ = ('name', 'members')
+
     def __init__(
             self,
             name: str,
@@ -80,9 +87,11 @@ class ComponentMetaData:
     __repr__ = __str__
 
 
-class MessageMemberMetaData:
+class MessageMemberMetaData(Immutable):
     """The meta data for a message member"""
 
+    __slots__ = ('member', 'type', 'is_required', 'children')
+
     def __init__(
             self,
             member: Union[FieldMetaData, ComponentMetaData],
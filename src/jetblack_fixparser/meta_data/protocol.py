@@ -1,6 +1,6 @@
 """The FIX protocol meta data"""
 
-from typing import Mapping, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from ..types import ValueType
 
@@ -11,6 +11,45 @@ from .message_member import (
 )
 from .message import MessageMetaData
 
+_FIXED_POINT_TYPES = {
+    ValueType.PRICE.name,
+    ValueType.QTY.name,
+    ValueType.AMT.name,
+    ValueType.PRICEOFFSET.name
+}
+
+
+def _fixed_point_places_by_field(
+        fields: Mapping[str, FieldMetaData],
+        fixed_point_places: Optional[Mapping[Union[ValueType, str], int]]
+) -> Dict[str, int]:
+    places_by_type: Dict[str, int] = {}
+    places_by_field: Dict[str, int] = {}
+    for key, places in (fixed_point_places or {}).items():
+        if places < 0:
+            raise ValueError(f'invalid decimal places {places} for {key}')
+        if isinstance(key, ValueType):
+            key = key.name
+        if key in ValueType.__members__:
+            if key not in _FIXED_POINT_TYPES:
+                raise ValueError(f'type {key} cannot be fixed point')
+            places_by_type[key] = places
+        elif key not in fields:
+            raise ValueError(f'unknown field {key}')
+        elif fields[key].type not in _FIXED_POINT_TYPES:
+            raise ValueError(f'field {key} cannot be fixed point')
+        else:
+            places_by_field[key] = places
+
+    return {
+        name: (
+            places_by_field[name] if name in places_by_field
+            else places_by_type[field.type]
+        )
+        for name, field in fields.items()
+        if name in places_by_field or field.type in places_by_type
+    }
+
 
 class ProtocolMetaData:
     """FIX protocol meta data"""
@@ -27,6 +66,8 @@ class ProtocolMetaData:
             *,
             is_millisecond_time: bool = True,
             is_float_decimal: bool = False,
+            is_integer_time: bool = False,
+            fixed_point_places: Optional[Mapping[Union[ValueType, str], int]] = None,
             is_type_enum: Optional[Mapping[Union[ValueType, str], bool]] = None
     ) -> None:
         """Initialise the FIX protocol meta data.
@@ -43,6 +84,16 @@ class ProtocolMetaData:
                 millisecond accuracy. Defaults to True.
             is_float_decimal (bool, optional): If true use Decimal to represent
                 floating point values. Defaults to False.
+            is_integer_time (bool, optional): If true UTC timestamps, times and
+                dates are decoded to integer nanoseconds since the epoch, or
+                since midnight for times, instead of datetime. Defaults to
+                False.
+            fixed_point_places (Optional[Mapping[Union[ValueType, str], int]], optional):
+                A map of value types (PRICE, QTY, AMT or PRICEOFFSET) or field
+                names to a number of decimal places. The values of these
+                fields are decoded to integers scaled by the number of places,
+                so 1.25 with 4 places is 12500. Field names take precedence
+                over types. Defaults to None.
             is_type_enum (Optional[Mapping[Union[ValueType, str], bool]], optional): A map
                 of FIX field types to bool, where true or missing indicates an
                 enum should be used when decoding if available. Defaults to
@@ -55,6 +106,12 @@ class ProtocolMetaData:
             field.number: field
             for field in fields.values()
         }
+        # A dense index of the fields by integer tag.
+        self.fields_by_tag: List[Optional[FieldMetaData]] = [None] * (
+            max((field.tag for field in fields.values()), default=-1) + 1
+        )
+        for field in fields.values():
+            self.fields_by_tag[field.tag] = field
         self.components = components
         self.messages_by_name = messages
         self.messages_by_type = {
@@ -65,6 +122,11 @@ class ProtocolMetaData:
         self.trailer = trailer
         self.is_millisecond_time = is_millisecond_time
         self.is_float_decimal = is_float_decimal
+        self.is_integer_time = is_integer_time
+        self.fixed_point_places = _fixed_point_places_by_field(
+            fields,
+            fixed_point_places
+        )
         self.is_type_enum: Mapping[ValueType, bool] = {
             value_type: True
             for value_type in ValueType
@@ -75,6 +137,29 @@ class ProtocolMetaData:
                     key = ValueType[key]
                 self.is_type_enum[key] = value
 
+        # The compiled decode and encode plans are created by the decoder and
+        # encoder on first use, as are the typed message classes.
+        self.decode_plan: Optional[Any] = None
+        self.encode_plan: Optional[Any] = None
+        self.message_classes: Optional[Any] = None
+
+    def field_by_tag(self, tag: int) -> Optional[FieldMetaData]:
+        """Find a field by its integer tag.
+
+        This is for callers which already hold integer tags. The decoder looks
+        up the bytes tag of each token in `fields_by_number` instead, as
+        converting a tag to an integer costs more than the hash it saves.
+
+        Args:
+            tag (int): The field tag.
+
+        Returns:
+            Optional[FieldMetaData]: The field meta data, or None if the tag is
+                not in the protocol.
+        """
+        fields_by_tag = self.fields_by_tag
+        return fields_by_tag[tag] if 0 <= tag < len(fields_by_tag) else None
+
     def is_valid_message_name(self, name: str) -> bool:
         """Check if the name is a valid message name
 
@@ -92,6 +177,16 @@ class ProtocolMetaData:
             raise ValueError('No messages names in protocol')
         return name in message_type_field.values_by_name
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The compiled plans hold bound functions, and the message classes are
+        # created at runtime. They are not pickled, and will be compiled again
+        # when they are used.
+        state = self.__dict__.copy()
+        state['decode_plan'] = None
+        state['encode_plan'] = None
+        state['message_classes'] = None
+        return state
+
     def __str__(self) -> str:
         return (
             'ProtocolMetaData: '
@@ -0,0 +1,151 @@
+"""Tests for decoding messages to columns"""
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol, ValueType
+from jetblack_fixparser.fix_message import decode_columns, decode_group_records
+from jetblack_fixparser.fix_message.columns import _to_column
+from jetblack_fixparser.fix_message.decoder import decode
+from jetblack_fixparser.fix_message.errors import DecodingError
+from jetblack_fixparser.meta_data import FieldMetaData
+
+np = pytest.importorskip('numpy')
+
+MESSAGES = [
+    b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|',
+    b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|',
+    b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=216|52=20100225-19:41:57.5|11=13347|1=Marcel|21=1|54=2|60=20100225-19:39:52.123456789|40=1|59=0|10=000|',
+    b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=217|52=20100225-19:41:58|11=13348|21=1|54=1|60=20100225-19:39:53|40=2|44=5.25|59=0|10=000|',
+]
+
+
+def test_decode_columns():
+    """Test decoding messages to columns"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    columns = decode_columns(
+        protocol,
+        MESSAGES,
+        'NewOrderSingle',
+        ['MsgSeqNum', 'TransactTime', 'Account', 'Side', 'Price'],
+        sep=b'|'
+    )
+
+    seqnum = columns['MsgSeqNum']
+    assert seqnum.values.dtype == np.int64
+    assert seqnum.values.tolist() == [215, 216, 217]
+
+    transact_time = columns['TransactTime']
+    assert transact_time.values.tolist() == np.array([
+        '2010-02-25T19:39:52.020',
+        '2010-02-25T19:39:52.123456789',
+        '2010-02-25T19:39:53',
+    ], 'datetime64[ns]').tolist()
+
+    account = columns['Account']
+    assert account.is_categorical
+    assert account.values.tolist() == [0, 0, -1]
+    assert account.mask.tolist() == [False, False, True]
+    assert account.categories == ['Marcel']
+
+    side = columns['Side']
+    assert [side.categories[code] for code in side.values] == [
+        'BUY', 'SELL', 'BUY'
+    ]
+
+    price = columns['Price'].to_masked_array()
+    assert price.dtype == np.float64
+    assert price.tolist() == [5.0, None, 5.25]
+
+
+def test_decode_columns_options():
+    """Test decoding columns with the protocol options"""
+    protocol = load_yaml_protocol(
+        'etc/FIX44.yaml',
+        is_integer_time=True,
+        fixed_point_places={'PRICE': 2}
+    )
+    columns = decode_columns(
+        protocol,
+        MESSAGES,
+        b'D',
+        ['TransactTime', 'Price'],
+        sep=b'|'
+    )
+    assert columns['TransactTime'].values.tolist() == [
+        1267126792020000000,
+        1267126792123456789,
+        1267126793000000000,
+    ]
+    assert columns['Price'].values.tolist() == [500, 0, 525]
+    assert columns['Price'].mask.tolist() == [False, True, False]
+
+    with pytest.raises(ValueError):
+        decode_columns(protocol, MESSAGES, b'D', ['NotAField'], sep=b'|')
+    with pytest.raises(ValueError):
+        decode_columns(protocol, MESSAGES, b'D', ['PartyID'], sep=b'|')
+
+
+def test_decode_group_records():
+    """Test decoding the entries of a group to records"""
+    protocol = load_yaml_protocol('etc/FIX42.yaml', is_millisecond_time=True)
+    buf = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+    expected, _ = decode(protocol, buf, sep=b'|')
+
+    message, meta_data = decode_group_records(
+        protocol,
+        buf,
+        fields=['MDUpdateAction', 'MDEntryType', 'MDEntryPx', 'MDEntrySize',
+                'MDEntryID', 'MinQty'],
+        sep=b'|'
+    )
+    assert meta_data.name == 'MarketDataIncrementalRefresh'
+    entries = message.pop('NoMDEntries')
+    del expected['NoMDEntries']
+    assert message == expected
+
+    assert entries.dtype.names == (
+        'MDUpdateAction', 'MDEntryType', 'MDEntryPx', 'MDEntrySize',
+        'MDEntryID', 'MinQty'
+    )
+    assert entries['MDEntryType'].tolist() == [b'0', b'1']
+    assert entries['MDEntryID'].tolist() == [b'BID', b'OFFER']
+    assert entries['MDEntryPx'].tolist() == [1.37215, 1.37224]
+    assert entries['MDEntrySize'].dtype == np.float64
+    assert np.isnan(entries['MinQty']).all()
+
+    # Every field of the entries is decoded by default.
+    message, _ = decode_group_records(protocol, buf, sep=b'|')
+    assert 'NumberOfOrders' in message['NoMDEntries'].dtype.names
+    assert message['NoMDEntries']['NumberOfOrders'].tolist() == [1, 1]
+
+    with pytest.raises(ValueError):
+        decode_group_records(protocol, buf, fields=['MsgSeqNum'], sep=b'|')
+    with pytest.raises(ValueError):
+        decode_group_records(protocol, buf, 'NoRelatedSym', sep=b'|')
+    with pytest.raises(DecodingError):
+        decode_group_records(
+            protocol,
+            buf.replace(b'268=2', b'268=3'),
+            sep=b'|',
+            validate=False
+        )
+
+
+def test_int_enum_option_by_type():
+    """Test the enum option of an integer column is taken from its type"""
+    protocol = load_yaml_protocol(
+        'etc/FIX44.yaml',
+        is_type_enum={ValueType.INT: False}
+    )
+    field = FieldMetaData('Count', b'9999', 'NUMINGROUP', {b'1': 'ONE'})
+    column = _to_column(np, protocol, field, [b'1', b'2'])
+    assert column.is_categorical
+    assert column.categories == [1, 2]
+
+    protocol = load_yaml_protocol(
+        'etc/FIX44.yaml',
+        is_type_enum={ValueType.NUMINGROUP: False}
+    )
+    column = _to_column(np, protocol, field, [b'1', b'2'])
+    assert not column.is_categorical
+    assert column.values.tolist() == [1, 2]
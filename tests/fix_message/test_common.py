@@ -0,0 +1,44 @@
+"""Tests for the common functions"""
+
+import random
+
+from jetblack_fixparser.fix_message.common import (
+    calc_checksum,
+    calc_checksums,
+    sum_bytes
+)
+
+
+def _reference_checksum(buf: bytes, sep: bytes, convert: bool) -> bytes:
+    if convert:
+        buf = buf.replace(sep, b'\x01')
+    return f'{sum(buf[:-7]) % 256:03}'.encode('ascii')
+
+
+def test_sum_bytes():
+    """Test summing bytes in chunks"""
+    assert sum_bytes(b'') == 0
+    assert sum_bytes(b'\xff' * 1000) == 255000
+    assert sum_bytes(bytearray(b'\x01\x02\x03\x04'), 1, 3) == 5
+    assert sum_bytes(memoryview(b'\x01\x02\x03\x04'), end=-1) == 6
+
+
+def test_calc_checksums():
+    """Test the checksums match a plain sum over the bytes"""
+    rng = random.Random(42)
+    buffers = [
+        bytes(rng.randrange(256) for _ in range(rng.randrange(600))) +
+        b'|10=000|'
+        for _ in range(100)
+    ]
+    for sep, convert in [(b'\x01', False), (b'|', False), (b'|', True)]:
+        expected = [
+            _reference_checksum(buf, sep, convert)
+            for buf in buffers
+        ]
+        assert [
+            calc_checksum(buf, sep, convert)
+            for buf in buffers
+        ] == expected
+        assert calc_checksums(buffers, sep, convert) == expected
+    assert not calc_checksums([])
@@ -0,0 +1,54 @@
+"""Tests for copying messages"""
+
+from copy import deepcopy
+from datetime import datetime, timezone
+
+from jetblack_fixparser import load_yaml_protocol, FixMessage
+from jetblack_fixparser.fix_message import CopyOnWriteMessage
+
+
+def test_copy_on_write():
+    """Test a shared message is never changed"""
+    protocol = load_yaml_protocol(
+        'etc/FIX42.yaml',
+        is_millisecond_time=True,
+        is_float_decimal=True
+    )
+    buf = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+    shared = FixMessage.decode(protocol, buf, sep=b'|').message
+    original = deepcopy(shared)
+
+    message = CopyOnWriteMessage(shared)
+    assert message == shared
+    assert list(message) == list(shared)
+
+    message['MsgSeqNum'] = 13
+    message['NoMDEntries'][0]['MDEntryID'] = 'BID2'
+    message['NoMDEntries'].pop()
+    del message['MDReqID']
+    assert message['MsgSeqNum'] == 13
+    assert message['NoMDEntries'][0]['MDEntryID'] == 'BID2'
+    assert len(message['NoMDEntries']) == 1
+    assert 'MDReqID' not in message
+    assert shared == original
+
+    # Encoding sets the integrity fields of the message, not the shared one.
+    fix_message = FixMessage(protocol, CopyOnWriteMessage(shared), copy=False)
+    assert fix_message.encode(sep=b'|', convert_sep_for_checksum=True) == buf
+    assert shared == original
+
+
+def test_from_owned():
+    """Test the message is only copied when it is shared"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    message = {
+        'MsgType': 'HEARTBEAT',
+        'SenderCompID': 'SENDER',
+        'TargetCompID': 'TARGET',
+        'MsgSeqNum': 1,
+        'SendingTime': datetime(2020, 1, 1, tzinfo=timezone.utc)
+    }
+    assert FixMessage(protocol, message).message is not message
+    fix_message = FixMessage.from_owned(protocol, message)
+    assert fix_message.message is message
+    assert fix_message.meta_data.name == 'Heartbeat'
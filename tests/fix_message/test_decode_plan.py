@@ -0,0 +1,143 @@
+"""Tests for compiled decode plans and header peeking"""
+
+from decimal import Decimal
+from typing import Any, Dict
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol, FixMessage
+from jetblack_fixparser.fix_message import (
+    compile_decode_plan,
+    compile_projection,
+    peek_header
+)
+from jetblack_fixparser.fix_message.decoder import decode
+from jetblack_fixparser.fix_message.errors import DecodingError
+from jetblack_fixparser.meta_data import ProtocolMetaData
+
+
+@pytest.fixture
+def protocol() -> ProtocolMetaData:
+    return load_yaml_protocol(
+        'etc/FIX42.yaml',
+        is_millisecond_time=True,
+        is_float_decimal=True
+    )
+
+
+def test_decode_plan_is_cached(protocol: ProtocolMetaData) -> None:
+    """Test the plan is compiled once and reused"""
+    assert protocol.decode_plan is None
+
+    buf = b'8=FIX.4.2|9=97|35=6|49=BKR|56=IM|34=14|52=20100204-09:18:42|23=115685|28=N|55=SPMI.MI|54=2|27=S|44=2200.75|25=H|10=248|'
+    FixMessage.decode(protocol, buf, sep=b'|')
+    plan = protocol.decode_plan
+    assert plan is not None
+    assert list(plan.bodies.keys()) == [b'6']
+
+    FixMessage.decode(protocol, buf, sep=b'|')
+    assert protocol.decode_plan is plan
+
+
+def test_compile_decode_plan(protocol: ProtocolMetaData) -> None:
+    """Test eager compilation of all the message plans"""
+    plan = compile_decode_plan(protocol)
+    assert set(plan.bodies.keys()) == set(protocol.messages_by_type.keys())
+
+    body = plan.body(protocol.messages_by_name['MarketDataIncrementalRefresh'])
+    group = body.by_number[b'268']
+    assert group.is_group
+    assert group.children is not None
+    assert b'279' in group.children.by_number
+
+
+def test_decode_groups_with_plan(protocol: ProtocolMetaData) -> None:
+    """Test groups are decoded from the plan"""
+    buf = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+    for strict in (True, False):
+        msg = FixMessage.decode(protocol, buf, sep=b'|', strict=strict)
+        entries = msg.message['NoMDEntries']
+        assert len(entries) == 2
+        assert entries[0]['MDEntryID'] == 'BID'
+        assert entries[1]['MDEntryType'] == 'OFFER'
+
+
+def test_decode_projection(protocol: ProtocolMetaData) -> None:
+    """Test only the projected fields are decoded"""
+    buf = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+
+    msg = FixMessage.decode(
+        protocol,
+        buf,
+        sep=b'|',
+        fields={'MsgSeqNum', 'MDEntryPx'}
+    )
+    assert msg.meta_data.msgtype == b'X'
+    assert msg.message == {
+        'MsgSeqNum': 12,
+        'NoMDEntries': [
+            {'MDEntryPx': Decimal('1.37215')},
+            {'MDEntryPx': Decimal('1.37224')}
+        ]
+    }
+
+    # A projected group is decoded in full, and unprojected groups are skipped.
+    projection = compile_projection(protocol, ['NoMDEntries'])
+    assert compile_projection(protocol, ['NoMDEntries']) is projection
+    msg = FixMessage.decode(protocol, buf, sep=b'|', fields=projection)
+    assert list(msg.message) == ['NoMDEntries']
+    assert msg.message['NoMDEntries'][1]['MDEntryID'] == 'OFFER'
+    msg = FixMessage.decode(protocol, buf, sep=b'|', fields={'MDReqID'})
+    assert msg.message == {'MDReqID': 'A'}
+
+    # The structure is still checked.
+    bad_count = buf.replace(b'268=2', b'268=3')
+    with pytest.raises(DecodingError):
+        FixMessage.decode(
+            protocol,
+            bad_count,
+            sep=b'|',
+            validate=False,
+            fields={'MsgSeqNum'}
+        )
+    with pytest.raises(ValueError):
+        compile_projection(protocol, ['NotAField'])
+
+
+def test_peek_header(protocol: ProtocolMetaData) -> None:
+    """Test peeking at the header fields"""
+    buf = b'8=FIX.4.2|9=97|35=6|49=BKR|56=IM|34=14|52=20100204-09:18:42|23=115685|28=N|55=SPMI.MI|54=2|27=S|44=2200.75|25=H|10=248|'
+    assert peek_header(protocol, buf, sep=b'|') == {
+        'MsgType': 'INDICATION_OF_INTEREST',
+        'SenderCompID': 'BKR',
+        'TargetCompID': 'IM',
+        'MsgSeqNum': 14
+    }
+    assert peek_header(protocol, buf, ['MsgType'], sep=b'|') == {
+        'MsgType': 'INDICATION_OF_INTEREST'
+    }
+    # Fields missing from the header are not returned.
+    assert peek_header(protocol, buf, ['OnBehalfOfCompID'], sep=b'|') == {}
+    # Buffers other than bytes are accepted, as with decode.
+    for other in (bytearray(buf), memoryview(buf)):
+        assert peek_header(protocol, other, ['MsgSeqNum'], sep=b'|') == {
+            'MsgSeqNum': 14
+        }
+
+
+def test_decode_into(protocol: ProtocolMetaData) -> None:
+    """Test decoding into a reused mapping"""
+    snapshot = b'8=FIX.4.2|9=97|35=6|49=BKR|56=IM|34=14|52=20100204-09:18:42|23=115685|28=N|55=SPMI.MI|54=2|27=S|44=2200.75|25=H|10=248|'
+    incremental = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+
+    message: Dict[str, Any] = {}
+    decoded, _ = decode(protocol, snapshot, sep=b'|', into=message)
+    assert decoded is message
+    assert message['IOIid'] == '115685'
+
+    # The fields of the previous message are cleared.
+    decoded, meta_data = decode(protocol, incremental, sep=b'|', into=message)
+    assert decoded is message
+    assert meta_data.msgtype == b'X'
+    assert message == decode(protocol, incremental, sep=b'|')[0]
+    assert 'IOIid' not in message
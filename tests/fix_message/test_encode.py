@@ -3,7 +3,10 @@
 from datetime import datetime, timezone
 from typing import Mapping, Optional
 
+import pytest
+
 from jetblack_fixparser import load_yaml_protocol, FixMessage, ValueType
+from jetblack_fixparser.fix_message.errors import EncodingError, FieldValueError
 
 
 def test_encode_logon():
@@ -71,3 +74,88 @@ def test_encode_logon():
         encoded_message = fix_message.encode(regenerate_integrity=True)
         roundtrip = FixMessage.decode(protocol, encoded_message)
         assert fix_message.message == roundtrip.message
+
+
+def test_encode_plan():
+    """Test the encode plan is compiled once and checks required fields"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    sending_time = datetime(2020, 1, 1, 12, 30, 0, tzinfo=timezone.utc)
+    message = {
+        'MsgType': 'HEARTBEAT',
+        'MsgSeqNum': 43,
+        'SenderCompID': "SENDER",
+        'TargetCompID': "TARGET",
+        'SendingTime': sending_time
+    }
+    FixMessage(protocol, message).encode()
+    plan = protocol.encode_plan
+    assert plan is not None
+    assert list(plan.messages.keys()) == [b'0']
+    assert plan.messages[b'0'][0].prefix == b'8='
+
+    FixMessage(protocol, message).encode()
+    assert protocol.encode_plan is plan
+
+    del message['SenderCompID']
+    with pytest.raises(EncodingError):
+        FixMessage(protocol, message).encode()
+
+
+def _checksum(buf: bytes) -> bytes:
+    # The checksum calculated from first principles.
+    return b'%03d' % (sum(buf[:buf.rindex(b'10=')]) % 256)
+
+
+@pytest.mark.parametrize('buf', [
+    b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|',
+    b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|',
+])
+def test_integrity(buf: bytes):
+    """Test the body length and checksum with a '|' separator"""
+    protocol = load_yaml_protocol(
+        'etc/FIX44.yaml',
+        is_millisecond_time=True,
+        is_float_decimal=True
+    )
+    soh_buf = buf.replace(b'|', b'\x01')
+    assert buf.endswith(b'10=' + _checksum(soh_buf) + b'|')
+
+    # Decoding validates the known good message.
+    fix_message = FixMessage.decode(
+        protocol,
+        buf,
+        sep=b'|',
+        convert_sep_for_checksum=True
+    )
+    assert fix_message.message['BodyLength'] == len(
+        soh_buf[soh_buf.index(b'\x0135=') + 1:soh_buf.rindex(b'10=')]
+    )
+
+    # Encoding with the separator converted matches the original.
+    assert fix_message.encode(sep=b'|', convert_sep_for_checksum=True) == buf
+    assert fix_message.encode(sep=b'\x01') == soh_buf
+
+    # Without conversion the checksum is calculated with the '|' separator.
+    unconverted = fix_message.encode(sep=b'|', convert_sep_for_checksum=False)
+    assert unconverted.endswith(b'10=' + _checksum(buf) + b'|')
+    assert unconverted[:unconverted.rindex(b'10=')] == buf[:buf.rindex(b'10=')]
+    FixMessage.decode(
+        protocol,
+        unconverted,
+        sep=b'|',
+        convert_sep_for_checksum=False
+    )
+    with pytest.raises(FieldValueError):
+        FixMessage.decode(
+            protocol,
+            unconverted,
+            sep=b'|',
+            convert_sep_for_checksum=True
+        )
+    with pytest.raises(FieldValueError):
+        FixMessage.decode(
+            protocol,
+            buf,
+            sep=b'|',
+            convert_sep_for_checksum=False
+        )
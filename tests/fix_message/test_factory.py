@@ -75,3 +75,32 @@ def test_fix_message_factory():
         encoded_message = fix_message.encode(regenerate_integrity=True)
         roundtrip = FixMessage.decode(protocol, encoded_message)
         assert fix_message.message == roundtrip.message
+
+
+def test_create_copies_groups():
+    """Test a group passed to create can be reused by the caller"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    factory = FixMessageFactory(protocol, "SENDER", "TARGET")
+    sending_time = datetime(2020, 1, 1, 12, 30, 0, tzinfo=timezone.utc)
+    lines = [{'Text': 'first'}]
+    first = factory.create(
+        'NEWS',
+        1,
+        sending_time,
+        {'Headline': 'Headline', 'NoLinesOfText': lines}
+    )
+    lines[0]['Text'] = 'second'
+    lines.append({'Text': 'third'})
+    second = factory.create(
+        'NEWS',
+        2,
+        sending_time,
+        {'Headline': 'Headline', 'NoLinesOfText': lines}
+    )
+    assert first.message['NoLinesOfText'] == [{'Text': 'first'}]
+    assert second.message['NoLinesOfText'] == [
+        {'Text': 'second'},
+        {'Text': 'third'}
+    ]
+    roundtrip = FixMessage.decode(protocol, first.encode())
+    assert roundtrip.message['NoLinesOfText'] == [{'Text': 'first'}]
@@ -0,0 +1,208 @@
+"""Tests for decoding log files"""
+
+from decimal import InvalidOperation
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol
+from jetblack_fixparser.fix_message import (
+    decode_file,
+    parallel_decode_file,
+    parallel_decode_file_batches,
+    scan_file
+)
+from jetblack_fixparser.fix_message.errors import DecodingError, FramingError
+
+MESSAGES = [
+    b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|',
+    b'8=FIX.4.4|9=117|35=AD|49=A|56=B|34=2|50=1|57=M|52=20100219-14:33:32.258|568=1|569=0|263=1|580=1|75=20100218|60=20100218-00:00:00.000|10=202|',
+    b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|',
+]
+
+
+def _corrupt_value(message: bytes, field: bytes, value: bytes) -> bytes:
+    # Replace a value keeping the length, and correct the checksum.
+    start = message.index(b'|' + field + b'=') + len(field) + 2
+    end = message.index(b'|', start)
+    assert end - start == len(value)
+    body = message[:start] + value + message[end:message.index(b'10=')]
+    checksum = sum(body.replace(b'|', b'\x01')) % 256
+    return body + b'10=%03d|' % checksum
+
+
+def _write_log(tmp_path: Path) -> Path:
+    path = tmp_path / 'fix.log'
+    path.write_bytes(b''.join(
+        b'2010-03-04 09:42:23.130 IN ' + message + b'\n'
+        for message in MESSAGES
+    ))
+    return path
+
+
+def test_scan_file(tmp_path: Path) -> None:
+    """Test reading the raw messages from a log file"""
+    path = _write_log(tmp_path)
+    assert list(scan_file(path, sep=b'|')) == MESSAGES
+    assert list(scan_file(path, sep=b'|', msgtypes=[b'D'])) == MESSAGES[2:]
+
+    empty_path = tmp_path / 'empty.log'
+    empty_path.write_bytes(b'')
+    assert list(scan_file(empty_path)) == []
+
+
+def test_decode_file(tmp_path: Path) -> None:
+    """Test decoding the messages in a log file"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    path = _write_log(tmp_path)
+
+    messages = list(decode_file(protocol, path, sep=b'|'))
+    assert [message['MsgSeqNum'] for message, _ in messages] == [214, 2, 215]
+
+    messages = list(
+        decode_file(protocol, path, sep=b'|', msgtypes=['NewOrderSingle'])
+    )
+    assert len(messages) == 1
+    message, meta_data = messages[0]
+    assert meta_data.name == 'NewOrderSingle'
+    assert message['ClOrdID'] == '13346'
+
+
+def test_decode_file_errors(tmp_path: Path) -> None:
+    """Test corrupt messages in a log file are skipped"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    path = tmp_path / 'fix.log'
+    bad_length = MESSAGES[1].replace(b'9=117', b'9=1x7')
+    bad_checksum = MESSAGES[1].replace(b'10=202', b'10=203')
+    path.write_bytes(b'\n'.join([MESSAGES[0], bad_length, MESSAGES[2]]))
+
+    errors: List[DecodingError] = []
+    assert list(scan_file(path, sep=b'|', on_error=errors.append)) == [
+        MESSAGES[0],
+        MESSAGES[2]
+    ]
+    assert len(errors) == 1
+    assert isinstance(errors[0], FramingError)
+    assert errors[0].position == len(MESSAGES[0]) + 2
+
+    messages = list(decode_file(protocol, path, sep=b'|'))
+    assert [message['MsgSeqNum'] for message, _ in messages] == [214, 215]
+
+    # Messages which cannot be decoded are reported when a callback is given.
+    path.write_bytes(b'\n'.join([MESSAGES[0], bad_checksum, MESSAGES[2]]))
+    with pytest.raises(DecodingError):
+        list(decode_file(protocol, path, sep=b'|'))
+    errors = []
+    messages = list(decode_file(protocol, path, sep=b'|', on_error=errors.append))
+    assert [message['MsgSeqNum'] for message, _ in messages] == [214, 215]
+    assert len(errors) == 1
+
+    # Values which cannot be converted are decoding errors.
+    bad_value = _corrupt_value(MESSAGES[1], b'34', b'x')
+    bad_price = _corrupt_value(MESSAGES[2], b'44', b'x')
+    path.write_bytes(b'\n'.join([MESSAGES[0], bad_value, bad_price]))
+    with pytest.raises(DecodingError):
+        list(decode_file(protocol, path, sep=b'|'))
+    errors = []
+    messages = list(decode_file(protocol, path, sep=b'|', on_error=errors.append))
+    assert [message['MsgSeqNum'] for message, _ in messages] == [214]
+    assert len(errors) == 2
+    assert all(isinstance(error.__cause__, ValueError) for error in errors)
+
+    decimal_protocol = load_yaml_protocol('etc/FIX44.yaml', is_float_decimal=True)
+    errors = []
+    messages = list(
+        decode_file(decimal_protocol, path, sep=b'|', on_error=errors.append)
+    )
+    assert [message['MsgSeqNum'] for message, _ in messages] == [214]
+    assert isinstance(errors[1].__cause__, InvalidOperation)
+
+
+def test_parallel_decode_file(tmp_path: Path) -> None:
+    """Test decoding a log file in parallel"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    path = tmp_path / 'fix.log'
+    path.write_bytes(b'\n'.join(MESSAGES * 20))
+
+    expected = [message for message, _ in decode_file(protocol, path, sep=b'|')]
+    messages = list(parallel_decode_file(
+        'etc/FIX44.yaml',
+        path,
+        workers=2,
+        chunk_size=500,
+        sep=b'|'
+    ))
+    assert messages == expected
+
+    batches = list(parallel_decode_file_batches(
+        'etc/FIX44.yaml',
+        path,
+        workers=2,
+        chunk_size=len(path.read_bytes()) // 2,
+        sep=b'|',
+        msgtypes=['NewOrderSingle']
+    ))
+    assert len(batches) >= 2
+    assert sum(len(batch) for batch in batches) == 20
+
+
+def test_parallel_decode_file_errors(tmp_path: Path) -> None:
+    """Test corrupt messages are handled as when decoding serially"""
+    path = tmp_path / 'fix.log'
+    bad_length = MESSAGES[1].replace(b'9=117', b'9=1x7')
+    bad_checksum = MESSAGES[1].replace(b'10=202', b'10=203')
+    path.write_bytes(b'\n'.join(
+        [MESSAGES[0], bad_length, MESSAGES[2]] * 5 + [bad_checksum]
+    ))
+
+    with pytest.raises(DecodingError):
+        list(parallel_decode_file(
+            'etc/FIX44.yaml',
+            path,
+            workers=2,
+            chunk_size=500,
+            sep=b'|'
+        ))
+
+    errors: List[DecodingError] = []
+    messages = list(parallel_decode_file(
+        'etc/FIX44.yaml',
+        path,
+        workers=2,
+        chunk_size=500,
+        sep=b'|',
+        on_error=errors.append
+    ))
+    assert [message['MsgSeqNum'] for message in messages] == [214, 215] * 5
+    assert len(errors) == 6
+    framing_errors = [error for error in errors if isinstance(error, FramingError)]
+    assert len(framing_errors) == 5
+    assert [error.position for error in framing_errors] == sorted(
+        error.position for error in framing_errors
+    )
+
+    # A corrupt value in one chunk leaves the other chunks to be decoded.
+    bad_value = _corrupt_value(MESSAGES[1], b'34', b'x')
+    path.write_bytes(b'\n'.join(MESSAGES * 5 + [bad_value] + MESSAGES * 5))
+    with pytest.raises(DecodingError):
+        list(parallel_decode_file(
+            'etc/FIX44.yaml',
+            path,
+            workers=2,
+            chunk_size=500,
+            sep=b'|'
+        ))
+
+    errors = []
+    messages = list(parallel_decode_file(
+        'etc/FIX44.yaml',
+        path,
+        workers=2,
+        chunk_size=500,
+        sep=b'|',
+        on_error=errors.append
+    ))
+    assert [message['MsgSeqNum'] for message in messages] == [214, 2, 215] * 10
+    assert len(errors) == 1
+    assert 'invalid value' in str(errors[0])
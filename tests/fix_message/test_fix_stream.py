@@ -0,0 +1,102 @@
+"""Tests for asyncio streams"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol, FixMessageFactory
+from jetblack_fixparser.fix_message import fix_stream
+from jetblack_fixparser.fix_message.errors import DecodingError, FramingError
+
+MESSAGES = [
+    b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|',
+    b'8=FIX.4.4|9=117|35=AD|49=A|56=B|34=2|50=1|57=M|52=20100219-14:33:32.258|568=1|569=0|263=1|580=1|75=20100218|60=20100218-00:00:00.000|10=202|',
+    b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|',
+]
+
+
+async def _read_loopback(
+        factory: FixMessageFactory,
+        data: bytes,
+        executor: Optional[ThreadPoolExecutor],
+        on_error: Optional[Callable[[DecodingError], None]] = None,
+        seqnums: Optional[List[int]] = None
+) -> List[int]:
+    async def handle(
+            _reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ) -> None:
+        # Write in small pieces to exercise the framing.
+        for i in range(0, len(data), 37):
+            writer.write(data[i:i+37])
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        if seqnums is None:
+            seqnums = []
+        try:
+            async for fix_message in fix_stream(
+                    reader,
+                    factory,
+                    executor=executor,
+                    burst_size=2,
+                    on_error=on_error
+            ):
+                seqnums.append(fix_message.message['MsgSeqNum'])
+        finally:
+            writer.close()
+    return seqnums
+
+
+def test_fix_stream():
+    """Test decoding messages from a loopback connection"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    factory = FixMessageFactory(protocol, 'A', 'B', sep=b'|')
+    data = b''.join(MESSAGES * 10)
+    expected = [214, 2, 215] * 10
+
+    assert asyncio.run(_read_loopback(factory, data, None)) == expected
+
+    with ThreadPoolExecutor(1) as executor:
+        assert asyncio.run(_read_loopback(factory, data, executor)) == expected
+
+
+def test_fix_stream_errors() -> None:
+    """Test bad messages are reported without losing the others"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    factory = FixMessageFactory(protocol, 'A', 'B', sep=b'|')
+    bad_checksum = MESSAGES[1].replace(b'10=202', b'10=203')
+    # A corrupt value with a valid checksum.
+    bad_value = MESSAGES[1].replace(b'34=2|', b'34=x|').replace(
+        b'10=202', b'10=%03d' % ((202 + ord('x') - ord('2')) % 256)
+    )
+    bad_framing = b'8=FIX.4.4|9=1x7|35=0|10=000|'
+    data = b''.join(
+        MESSAGES + [bad_checksum] + MESSAGES + [bad_framing, bad_value] +
+        MESSAGES
+    )
+    expected = [214, 2, 215] * 3
+
+    for executor in (None, ThreadPoolExecutor(1)):
+        errors: List[DecodingError] = []
+        assert asyncio.run(
+            _read_loopback(factory, data, executor, errors.append)
+        ) == expected
+        assert len(errors) == 3
+        assert isinstance(errors[1], FramingError)
+        assert isinstance(errors[2].__cause__, ValueError)
+
+        # Without a callback the messages before the error are still read.
+        seqnums: List[int] = []
+        with pytest.raises(DecodingError):
+            asyncio.run(_read_loopback(factory, data, executor, None, seqnums))
+        assert seqnums == [214, 2, 215]
+
+        if executor is not None:
+            executor.shutdown()
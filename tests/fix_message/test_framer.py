@@ -0,0 +1,60 @@
+"""Tests for the framer"""
+
+from io import BytesIO
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol, FixMessage
+from jetblack_fixparser.fix_message import (
+    FixFramer,
+    iter_messages,
+    read_messages
+)
+from jetblack_fixparser.fix_message.errors import DecodingError
+
+MESSAGES = [
+    b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|',
+    b'8=FIX.4.4|9=117|35=AD|49=A|56=B|34=2|50=1|57=M|52=20100219-14:33:32.258|568=1|569=0|263=1|580=1|75=20100218|60=20100218-00:00:00.000|10=202|',
+    b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|',
+]
+
+
+def test_frame_chunks():
+    """Test framing messages split over chunks of every size"""
+    stream = b'\n'.join(MESSAGES) + b'\n'
+    for chunk_size in range(1, len(stream) + 1, 7):
+        chunks = [
+            stream[i:i+chunk_size]
+            for i in range(0, len(stream), chunk_size)
+        ]
+        assert list(iter_messages(chunks, sep=b'|')) == MESSAGES
+
+
+def test_frame_raw_data():
+    """Test a message containing a checksum-like sequence in the body"""
+    body = b'35=0|95=9|96=A|10=123|B|'
+    buf = b'8=FIX.4.4|9=' + str(len(body)).encode() + b'|' + body + b'10=000|'
+    framer = FixFramer(b'|')
+    framer.feed(buf + MESSAGES[0])
+    assert list(framer) == [buf, MESSAGES[0]]
+    assert framer.buffered == 0
+
+
+def test_frame_bad_body_length():
+    """Test the framer recovers from a bad body length"""
+    framer = FixFramer(b'|')
+    framer.feed(b'8=FIX.4.4|9=3|35=0|10=000|' + MESSAGES[0])
+    with pytest.raises(DecodingError):
+        framer.next_message()
+    assert list(framer) == [MESSAGES[0]]
+
+
+def test_read_and_decode():
+    """Test reading and decoding messages from a file"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    file_ptr = BytesIO(b''.join(MESSAGES))
+    messages = [
+        FixMessage.decode(protocol, buf, sep=b'|')
+        for buf in read_messages(file_ptr, sep=b'|', chunk_size=50)
+    ]
+    assert [msg.message['MsgSeqNum'] for msg in messages] == [214, 2, 215]
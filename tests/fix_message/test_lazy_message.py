@@ -0,0 +1,31 @@
+"""Tests for lazy decoding"""
+
+from jetblack_fixparser import load_yaml_protocol, FixMessage
+from jetblack_fixparser.fix_message import LazyMessage
+from jetblack_fixparser.fix_message.decoder import decode
+
+
+def test_lazy_decode():
+    """Test lazy decoding matches eager decoding"""
+    protocol = load_yaml_protocol(
+        'etc/FIX42.yaml',
+        is_millisecond_time=True,
+        is_float_decimal=True
+    )
+    buf = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+
+    eager, _ = decode(protocol, buf, sep=b'|')
+    lazy, meta_data = decode(protocol, buf, sep=b'|', lazy=True)
+    assert isinstance(lazy, LazyMessage)
+    assert meta_data.name == 'MarketDataIncrementalRefresh'
+    assert list(lazy.keys()) == list(eager.keys())
+
+    # Only the fields read during decoding have been converted.
+    assert lazy['MDReqID'] == 'A'
+    assert 'SendingTime' not in lazy._values
+
+    assert lazy == eager
+    assert lazy['NoMDEntries'][1]['MDEntryPx'] == eager['NoMDEntries'][1]['MDEntryPx']
+
+    msg = FixMessage.decode(protocol, buf, sep=b'|', lazy=True)
+    assert msg.encode(sep=b'|', convert_sep_for_checksum=True) == buf
@@ -0,0 +1,279 @@
+"""Tests for order books"""
+
+from decimal import Decimal
+
+from jetblack_fixparser import load_yaml_protocol
+from jetblack_fixparser.fix_message import BookManager, BookSide, TopOfBook
+from jetblack_fixparser.fix_message.decoder import decode
+
+
+def test_book_side():
+    """Test the levels are kept in order"""
+    bids = BookSide(True)
+    for price in (3, 1, 2, 5, 4):
+        bids.set(price, price * 10)
+    bids.set(2, 25)
+    bids.remove(5)
+    bids.remove(6)
+    assert bids.best == (4, 40)
+    assert bids.levels() == [(4, 40), (3, 30), (2, 25), (1, 10)]
+    assert bids.levels(2) == [(4, 40), (3, 30)]
+    bids.add(1, 5)
+    assert bids.levels()[-1] == (1, 15)
+
+    offers = BookSide(False)
+    offers.set(2, 20)
+    offers.set(1, 10)
+    assert offers.best == (1, 10)
+    offers.clear()
+    assert offers.best is None
+    assert len(offers) == 0
+
+
+def test_book_manager():
+    """Test books are built from market data messages"""
+    protocol = load_yaml_protocol(
+        'etc/FIX42.yaml',
+        is_millisecond_time=True,
+        is_float_decimal=True
+    )
+    published = []
+    manager = BookManager(protocol, published.append)
+
+    snapshot = protocol.messages_by_type[b'W']
+    manager.update(
+        {
+            'Symbol': 'EUR/USD',
+            'NoMDEntries': [
+                {'MDEntryType': 'BID', 'MDEntryPx': Decimal('1.37210'), 'MDEntrySize': 1000000},
+                {'MDEntryType': 'BID', 'MDEntryPx': Decimal('1.37200'), 'MDEntrySize': 2000000},
+                {'MDEntryType': 'OFFER', 'MDEntryPx': Decimal('1.37230'), 'MDEntrySize': 1500000},
+                {'MDEntryType': 'TRADE', 'MDEntryPx': Decimal('1.37220'), 'MDEntrySize': 100000},
+            ]
+        },
+        snapshot
+    )
+    book = manager.books['EUR/USD']
+    assert book.bids.levels() == [
+        (Decimal('1.37210'), 1000000),
+        (Decimal('1.37200'), 2000000)
+    ]
+    assert published == [
+        TopOfBook(
+            'EUR/USD',
+            (Decimal('1.37210'), 1000000),
+            (Decimal('1.37230'), 1500000)
+        )
+    ]
+
+    buf = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+    instruments = manager.update(*decode(protocol, buf, sep=b'|'))
+    assert instruments == {'EUR/USD'}
+    assert book.bids.best == (Decimal('1.37215'), Decimal('2500000'))
+    assert book.offers.levels() == [
+        (Decimal('1.37224'), Decimal('2503200')),
+        (Decimal('1.37230'), 1500000)
+    ]
+    assert len(published) == 2
+
+    # Deletes, and entries without an instrument.
+    incremental = protocol.messages_by_type[b'X']
+    manager.update(
+        {
+            'NoMDEntries': [
+                {'MDUpdateAction': 'DELETE', 'MDEntryType': 'BID', 'Symbol': 'EUR/USD', 'MDEntryPx': Decimal('1.37215')},
+                {'MDUpdateAction': 'CHANGE', 'MDEntryType': 'BID', 'MDEntryPx': Decimal('1.37200'), 'MDEntrySize': 500000},
+            ]
+        },
+        incremental
+    )
+    assert book.bids.levels() == [
+        (Decimal('1.37210'), 1000000),
+        (Decimal('1.37200'), 500000)
+    ]
+    assert published[-1].bid == (Decimal('1.37210'), 1000000)
+
+    # Changes below the top are not published.
+    manager.update(
+        {
+            'NoMDEntries': [
+                {'MDUpdateAction': 'NEW', 'MDEntryType': 'BID', 'Symbol': 'EUR/USD', 'MDEntryPx': Decimal('1.37100'), 'MDEntrySize': 500000},
+            ]
+        },
+        incremental
+    )
+    assert len(published) == 3
+
+    # Other messages are ignored.
+    assert manager.update({}, protocol.messages_by_type[b'0']) == set()
+
+
+def test_book_manager_conflation():
+    """Test the top of book is published at most once per interval"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    now = [0.0]
+    published = []
+    manager = BookManager(
+        protocol,
+        published.append,
+        conflation_ms=100,
+        clock=lambda: now[0]
+    )
+    incremental = protocol.messages_by_type[b'X']
+
+    def bid(price):
+        manager.update(
+            {
+                'NoMDEntries': [
+                    {'MDUpdateAction': 'NEW', 'MDEntryType': 'BID', 'Symbol': 'ABC', 'MDEntryPx': price, 'MDEntrySize': 100.0},
+                ]
+            },
+            incremental
+        )
+
+    bid(10.0)
+    assert [top.bid for top in published] == [(10.0, 100.0)]
+
+    now[0] = 0.05
+    bid(11.0)
+    bid(12.0)
+    assert len(published) == 1
+
+    now[0] = 0.1
+    manager.poll()
+    assert [top.bid for top in published] == [(10.0, 100.0), (12.0, 100.0)]
+
+    now[0] = 0.15
+    bid(13.0)
+    assert len(published) == 2
+    manager.flush()
+    assert published[-1].bid == (13.0, 100.0)
+
+
+def test_book_side_entries():
+    """Test the size of a level is the sum of its entries"""
+    bids = BookSide(True)
+    bids.set_entry('A', 10, 100)
+    bids.set_entry('B', 10, 200)
+    bids.set_entry('C', 9, 50)
+    assert bids.levels() == [(10, 300), (9, 50)]
+
+    # Moving an entry leaves the other entries of its level.
+    bids.set_entry('A', 9, 100)
+    assert bids.levels() == [(10, 200), (9, 150)]
+    bids.set_entry('B', 10, 250)
+    assert bids.levels() == [(10, 250), (9, 150)]
+
+    # The level is removed with its last entry.
+    assert bids.remove_entry('B')
+    assert not bids.remove_entry('B')
+    assert bids.levels() == [(9, 150)]
+
+    # Removing a level removes its entries.
+    bids.remove(9)
+    assert len(bids) == 0
+    assert bids.entry('A') is None
+
+
+def test_book_manager_entries():
+    """Test entries sharing a price level"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    manager = BookManager(protocol)
+
+    manager.update(
+        {
+            'Symbol': 'ABC',
+            'NoMDEntries': [
+                {'MDEntryType': 'BID', 'MDEntryPx': 10.0, 'MDEntrySize': 100.0},
+                {'MDEntryType': 'BID', 'MDEntryPx': 10.0, 'MDEntrySize': 200.0},
+                {'MDEntryType': 'OFFER', 'MDEntryID': 'O1', 'MDEntryPx': 11.0, 'MDEntrySize': 300.0},
+                {'MDEntryType': 'OFFER', 'MDEntryID': 'O2', 'MDEntryPx': 11.0, 'MDEntrySize': 400.0},
+            ]
+        },
+        protocol.messages_by_type[b'W']
+    )
+    book = manager.books['ABC']
+    # The entries of a snapshot at the same price add up.
+    assert book.bids.levels() == [(10.0, 300.0)]
+    assert book.offers.levels() == [(11.0, 700.0)]
+
+    incremental = protocol.messages_by_type[b'X']
+    manager.update(
+        {
+            'NoMDEntries': [
+                {'MDUpdateAction': 'NEW', 'MDEntryType': 'OFFER', 'Symbol': 'ABC', 'MDEntryID': 'O3', 'MDEntryPx': 11.0, 'MDEntrySize': 50.0},
+                {'MDUpdateAction': 'CHANGE', 'MDEntryType': 'OFFER', 'MDEntryID': 'O1', 'MDEntryPx': 12.0, 'MDEntrySize': 300.0},
+            ]
+        },
+        incremental
+    )
+    # The entry moving price leaves the other entries at its old price.
+    assert book.offers.levels() == [(11.0, 450.0), (12.0, 300.0)]
+
+    manager.update(
+        {
+            'NoMDEntries': [
+                {'MDUpdateAction': 'DELETE', 'Symbol': 'ABC', 'MDEntryID': 'O2'},
+                {'MDUpdateAction': 'CHANGE', 'MDEntryType': 'OFFER', 'MDEntryID': 'O3', 'MDEntrySize': 75.0},
+            ]
+        },
+        incremental
+    )
+    assert book.offers.levels() == [(11.0, 75.0), (12.0, 300.0)]
+
+
+def test_book_manager_delete_by_entry_id(caplog):
+    """Test deletes without a price are resolved by their MDEntryID"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    manager = BookManager(protocol)
+    incremental = protocol.messages_by_type[b'X']
+
+    manager.update(
+        {
+            'NoMDEntries': [
+                {'MDUpdateAction': 'NEW', 'MDEntryType': 'BID', 'Symbol': 'ABC', 'MDEntryID': 'B1', 'MDEntryPx': 10.0, 'MDEntrySize': 100.0},
+                {'MDUpdateAction': 'NEW', 'MDEntryType': 'BID', 'MDEntryID': 'B2', 'MDEntryPx': 9.0, 'MDEntrySize': 200.0},
+                {'MDUpdateAction': 'NEW', 'MDEntryType': 'OFFER', 'MDEntryID': 'O1', 'MDEntryPx': 11.0, 'MDEntrySize': 300.0},
+            ]
+        },
+        incremental
+    )
+    book = manager.books['ABC']
+
+    # A change moving an entry replaces its level.
+    manager.update(
+        {
+            'NoMDEntries': [
+                {'MDUpdateAction': 'CHANGE', 'MDEntryType': 'OFFER', 'Symbol': 'ABC', 'MDEntryID': 'O1', 'MDEntryPx': 12.0, 'MDEntrySize': 300.0},
+            ]
+        },
+        incremental
+    )
+    assert book.offers.levels() == [(12.0, 300.0)]
+
+    manager.update(
+        {
+            'NoMDEntries': [
+                {'MDUpdateAction': 'DELETE', 'Symbol': 'ABC', 'MDEntryID': 'B1'},
+                {'MDUpdateAction': 'DELETE', 'MDEntryType': 'OFFER', 'MDEntryID': 'O1'},
+            ]
+        },
+        incremental
+    )
+    assert book.bids.levels() == [(9.0, 200.0)]
+    assert book.offers.levels() == []
+    assert book.bids.entry('B1') is None
+    assert book.bids.entry('B2') == (9.0, 200.0)
+
+    # A delete which cannot be resolved is logged, and the book unchanged.
+    with caplog.at_level('WARNING'):
+        manager.update(
+            {
+                'NoMDEntries': [
+                    {'MDUpdateAction': 'DELETE', 'MDEntryType': 'BID', 'Symbol': 'ABC', 'MDEntryID': 'B3'},
+                ]
+            },
+            incremental
+        )
+    assert 'Unable to resolve' in caplog.text
+    assert book.bids.levels() == [(9.0, 200.0)]
@@ -0,0 +1,116 @@
+"""Tests for message templates"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from jetblack_fixparser import (
+    load_yaml_protocol,
+    FixMessage,
+    FixMessageFactory
+)
+from jetblack_fixparser.fix_message import MessageTemplate
+from jetblack_fixparser.fix_message.errors import EncodingError
+
+
+def test_template_matches_encode():
+    """Test encoding from a template matches encoding the message"""
+    protocol = load_yaml_protocol(
+        'etc/FIX44.yaml',
+        is_millisecond_time=True,
+        is_float_decimal=True
+    )
+
+    for sep, convert_sep_for_checksum in (
+            (b'\x01', True),
+            (b'|', True),
+            (b'|', False)
+    ):
+        factory = FixMessageFactory(
+            protocol,
+            'SENDER',
+            'TARGET',
+            sep=sep,
+            convert_sep_for_checksum=convert_sep_for_checksum
+        )
+        body = {
+            'Account': 'ACCT',
+            'HandlInst': 'AUTOMATED_EXECUTION_ORDER_PRIVATE_NO_BROKER_INTERVENTION',
+            'Symbol': 'VOD.L',
+            'Side': 'BUY',
+            'OrdType': 'LIMIT',
+            'TimeInForce': 'DAY',
+            'TransactTime': datetime(2020, 1, 1, 12, 0, tzinfo=timezone.utc),
+        }
+        template = factory.create_template(
+            'ORDER_SINGLE',
+            ['ClOrdID', 'Price', 'OrderQty'],
+            body
+        )
+
+        for seq_num in range(1, 4):
+            values = {
+                'MsgSeqNum': seq_num,
+                'SendingTime': datetime(
+                    2020, 1, 1, 12, 0, seq_num, 1000 * seq_num, timezone.utc
+                ),
+                'ClOrdID': f'ORDER-{seq_num ** 7}',
+                'Price': Decimal('100.25') * seq_num,
+                'OrderQty': Decimal(10 ** seq_num)
+            }
+            fix_message = factory.create(
+                'ORDER_SINGLE',
+                seq_num,
+                values['SendingTime'],
+                {**body, **values}
+            )
+            buf = template.encode(values)
+            assert buf == fix_message.encode(
+                sep=sep,
+                convert_sep_for_checksum=convert_sep_for_checksum
+            )
+            decoded = FixMessage.decode(
+                protocol,
+                buf,
+                sep=sep,
+                convert_sep_for_checksum=convert_sep_for_checksum
+            )
+            assert decoded.message['ClOrdID'] == values['ClOrdID']
+
+        # Optional variable fields can be left out.
+        values = {
+            'MsgSeqNum': 4,
+            'SendingTime': datetime(2020, 1, 1, 12, 0, tzinfo=timezone.utc),
+            'ClOrdID': 'ORDER',
+            'OrderQty': Decimal(10)
+        }
+        FixMessage.decode(
+            protocol,
+            template.encode(values),
+            sep=sep,
+            convert_sep_for_checksum=convert_sep_for_checksum
+        )
+
+        with pytest.raises(EncodingError):
+            template.encode({'MsgSeqNum': 5})
+
+
+def test_template_invalid_fields():
+    """Test templates reject fields which cannot vary"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    fix_message = FixMessage(
+        protocol,
+        {
+            'MsgType': 'HEARTBEAT',
+            'SenderCompID': 'SENDER',
+            'TargetCompID': 'TARGET',
+            'MsgSeqNum': 1,
+            'SendingTime': datetime(2020, 1, 1, tzinfo=timezone.utc)
+        }
+    )
+    template = MessageTemplate.from_fix_message(fix_message, ['MsgSeqNum'])
+    assert [slot.name for slot in template.slots] == ['MsgSeqNum']
+    for fields in (['CheckSum'], ['ClOrdID'], ['NoHops']):
+        with pytest.raises(ValueError):
+            MessageTemplate.from_fix_message(fix_message, fields)
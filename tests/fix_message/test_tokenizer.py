@@ -0,0 +1,26 @@
+"""Tests for the tokenizer"""
+
+from jetblack_fixparser import load_yaml_protocol
+from jetblack_fixparser.fix_message.common import calc_body_length
+from jetblack_fixparser.fix_message.decoder import decode
+from jetblack_fixparser.fix_message.tokenizer import tokenize
+
+BUF = b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|'
+
+
+def test_tokenize():
+    """Test tokenizing a buffer"""
+    encoded_message = tokenize(BUF, b'|')
+    assert encoded_message[0] == (b'8', b'=', b'FIX.4.4')
+    assert encoded_message[-1] == (b'10', b'=', b'058')
+    assert len(encoded_message) == 15
+    assert calc_body_length(BUF, encoded_message, b'|') == 94
+
+
+def test_decode_buffer_types():
+    """Test decoding bytearrays and memoryviews"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    expected, _ = decode(protocol, BUF, sep=b'|')
+    for buf in (bytearray(BUF), memoryview(BUF)):
+        message, _ = decode(protocol, buf, sep=b'|')
+        assert message == expected
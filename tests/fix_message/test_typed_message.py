@@ -0,0 +1,123 @@
+"""Tests for typed message classes"""
+
+import pickle
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol, FixMessage
+from jetblack_fixparser.fix_message import (
+    create_message_classes,
+    decode_typed,
+    get_message_class
+)
+from jetblack_fixparser.fix_message.errors import DecodingError, EncodingError
+
+
+def test_typed_message():
+    """Test decoding and encoding typed messages"""
+    protocol = load_yaml_protocol(
+        'etc/FIX42.yaml',
+        is_millisecond_time=True,
+        is_float_decimal=True
+    )
+    buf = b'8=FIX.4.2|9=196|35=X|49=A|56=B|34=12|52=20100318-03:21:11.364|262=A|268=2|279=0|269=0|278=BID|55=EUR/USD|270=1.37215|15=EUR|271=2500000|346=1|279=0|269=1|278=OFFER|55=EUR/USD|270=1.37224|15=EUR|271=2503200|346=1|10=171|'
+
+    refresh_class = get_message_class(protocol, 'MarketDataIncrementalRefresh')
+    assert get_message_class(protocol, b'X') is refresh_class
+    assert refresh_class.__name__ == 'MarketDataIncrementalRefresh'
+
+    refresh = refresh_class.decode_from(buf, sep=b'|')
+    assert not hasattr(refresh, '__dict__')
+    assert refresh.MsgSeqNum == 12
+    assert refresh.OnBehalfOfCompID is None
+    entries = refresh.NoMDEntries
+    assert isinstance(entries[0], refresh_class.groups['NoMDEntries'])
+    assert entries[1].MDEntryPx == Decimal('1.37224')
+    with pytest.raises(AttributeError):
+        refresh.NotAField = 1  # pylint: disable=attribute-defined-outside-init
+
+    decoded = FixMessage.decode(protocol, buf, sep=b'|')
+    assert refresh.to_dict() == decoded.message
+    assert refresh.encode(b'|', True) == buf
+    assert decode_typed(protocol, buf, sep=b'|') == refresh
+
+    heartbeat = b'8=FIX.4.2|9=49|35=0|49=A|56=B|34=13|52=20100318-03:21:12.000|10=100|'
+    with pytest.raises(DecodingError):
+        refresh_class.decode_from(heartbeat, sep=b'|', validate=False)
+
+    # Creating messages.
+    heartbeat_class = get_message_class(protocol, 'Heartbeat')
+    message = heartbeat_class(
+        SenderCompID='A',
+        TargetCompID='B',
+        MsgSeqNum=13,
+        SendingTime=datetime(2010, 3, 18, 3, 21, 12, tzinfo=timezone.utc)
+    )
+    assert message.MsgType == 'HEARTBEAT'
+    decoded = FixMessage.decode(protocol, message.encode())
+    assert decoded.message == message.to_dict()
+    with pytest.raises(EncodingError):
+        heartbeat_class(SenderCompID='A').encode()
+
+    # The classes are not pickled with the protocol.
+    classes = create_message_classes(protocol)
+    assert classes['Heartbeat'] is heartbeat_class
+    assert pickle.loads(pickle.dumps(protocol)).message_classes is None
+
+
+def test_typed_message_fields():
+    """Test a typed message holding only some fields"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    buf = b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|'
+
+    order_class = get_message_class(
+        protocol,
+        'NewOrderSingle',
+        ['Account', 'Price']
+    )
+    assert get_message_class(
+        protocol,
+        'NewOrderSingle',
+        ['Price', 'Account']
+    ) is order_class
+    assert order_class is not get_message_class(protocol, 'NewOrderSingle')
+    # The required fields are always held.
+    assert {'MsgSeqNum', 'ClOrdID', 'Side', 'Account', 'Price'} <= set(
+        order_class.fields
+    )
+    assert 'HandlInst' not in order_class.fields
+
+    order = order_class.decode_from(buf, sep=b'|')
+    assert order.Account == 'Marcel'
+    assert order.Price == 5
+    assert not hasattr(order, 'HandlInst')
+
+    # Encoding writes only the fields held.
+    decoded = FixMessage.decode(protocol, order.encode())
+    assert decoded.message == order.to_dict()
+    assert 'HandlInst' not in decoded.message
+
+    with pytest.raises(ValueError):
+        get_message_class(protocol, 'NewOrderSingle', ['NotAField'])
+
+
+def test_typed_message_decode_into():
+    """Test decoding into a reused typed message"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    buf = b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|'
+    order_class = get_message_class(protocol, 'NewOrderSingle')
+
+    order = order_class(Account='Other', StopPx=10.0)
+    decoded = order_class.decode_from(buf, sep=b'|', into=order)
+    assert decoded is order
+    assert order == order_class.decode_from(buf, sep=b'|')
+    assert order.StopPx is None
+
+    with pytest.raises(ValueError):
+        order_class.decode_from(
+            buf,
+            sep=b'|',
+            into=get_message_class(protocol, 'NewOrderSingle', ['Price'])()
+        )
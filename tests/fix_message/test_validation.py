@@ -0,0 +1,32 @@
+"""Tests for message validation"""
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol
+from jetblack_fixparser.fix_message.decoder import decode
+from jetblack_fixparser.fix_message.errors import FieldValueError
+from jetblack_fixparser.fix_message.tokenizer import tokenize
+from jetblack_fixparser.fix_message.validation import assert_message_valid
+
+BUF = b'8=FIX.4.4|9=94|35=3|49=A|56=AB|128=B1|34=214|50=U1|52=20100304-09:42:23.130|45=176|371=15|372=X|373=1|58=txt|10=058|'
+
+
+def _assert_valid(buf: bytes) -> None:
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    assert_message_valid(protocol, buf, tokenize(buf, b'|'), b'|', True)
+
+
+def test_body_length():
+    """Test the body length must match the encoded value"""
+    _assert_valid(BUF)
+
+    # Zero padding is rejected.
+    padded = BUF.replace(b'9=94', b'9=0094')
+    with pytest.raises(FieldValueError):
+        _assert_valid(padded)
+    with pytest.raises(FieldValueError):
+        decode(load_yaml_protocol('etc/FIX44.yaml'), padded, sep=b'|')
+
+    # A value which is not a number is a validation error.
+    with pytest.raises(FieldValueError):
+        _assert_valid(BUF.replace(b'9=94', b'9=9x'))
@@ -1,13 +1,26 @@
 """Tests for value decoders"""
 
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import random
+
 import pytest
 
-from jetblack_fixparser import load_yaml_protocol
+from jetblack_fixparser import load_yaml_protocol, ValueType
 from jetblack_fixparser.meta_data import ProtocolMetaData
+from jetblack_fixparser.fix_message.common import (
+    UTCTIMEONLY_FMT_MILLIS,
+    UTCTIMEONLY_FMT_NO_MILLIS,
+    UTCTIMESTAMP_FMT_MILLIS,
+    UTCTIMESTAMP_FMT_NO_MILLIS
+)
+from jetblack_fixparser.fix_message.errors import DecodingError
 from jetblack_fixparser.fix_message.value_decoders import (
     _decode_utc_timestamp,
-    _decode_utc_time_only
+    _decode_utc_time_only,
+    bind_decoder
 )
+from jetblack_fixparser.fix_message.value_encoders import bind_encoder
 
 
 @pytest.fixture
@@ -27,6 +40,7 @@ def test_decode_utc_timestamp(protocol: ProtocolMetaData) -> None:
         protocol.fields_by_name['SendingTime'],
         src.encode('ascii')
     )
+    assert isinstance(dest, datetime)
     assert dest.strftime("%Y%m%d-%H:%M:%S") == src
 
     src = "20200312-15:35:13.123"
@@ -35,6 +49,7 @@ def test_decode_utc_timestamp(protocol: ProtocolMetaData) -> None:
         protocol.fields_by_name['SendingTime'],
         src.encode('ascii')
     )
+    assert isinstance(dest, datetime)
     assert dest.strftime("%Y%m%d-%H:%M:%S.%f")[:-3] == src
 
     src = "20200312-15:35:13.123456"
@@ -43,6 +58,7 @@ def test_decode_utc_timestamp(protocol: ProtocolMetaData) -> None:
         protocol.fields_by_name['SendingTime'],
         src.encode('ascii')
     )
+    assert isinstance(dest, datetime)
     assert dest.strftime("%Y%m%d-%H:%M:%S.%f") == src
 
 
@@ -54,6 +70,7 @@ def test_decode_utc_time_only(protocol: ProtocolMetaData) -> None:
         protocol.fields_by_name['SendingTime'],
         src.encode('ascii')
     )
+    assert isinstance(dest, datetime)
     assert dest.strftime("%H:%M:%S") == src
 
     src = "15:35:13.123"
@@ -62,6 +79,7 @@ def test_decode_utc_time_only(protocol: ProtocolMetaData) -> None:
         protocol.fields_by_name['SendingTime'],
         src.encode('ascii')
     )
+    assert isinstance(dest, datetime)
     assert dest.strftime("%H:%M:%S.%f")[:-3] == src
 
     src = "15:35:13.123456"
@@ -70,4 +88,153 @@ def test_decode_utc_time_only(protocol: ProtocolMetaData) -> None:
         protocol.fields_by_name['SendingTime'],
         src.encode('ascii')
     )
+    assert isinstance(dest, datetime)
     assert dest.strftime("%H:%M:%S.%f") == src
+
+
+def _strptime(text: str, fmt_no_millis: str, fmt_millis: str) -> datetime:
+    fmt = fmt_no_millis if '.' not in text else fmt_millis
+    return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+
+
+def test_decode_utc_timestamp_matches_strptime(
+        protocol: ProtocolMetaData
+) -> None:
+    """Test decoding timestamps gives the same result as strptime"""
+    meta_data = protocol.fields_by_name['SendingTime']
+    rng = random.Random(42)
+    start = datetime(1970, 1, 1)
+    for _ in range(5000):
+        value = start + timedelta(
+            seconds=rng.randrange(200 * 365 * 24 * 60 * 60),
+            microseconds=rng.randrange(1000000)
+        )
+        digits = rng.choice((0, 1, 3, 6))
+        timestamp = value.strftime('%Y%m%d-%H:%M:%S.%f')[:18 + digits]
+        timestamp = timestamp.rstrip('.')
+        time_only = timestamp[9:]
+
+        assert _decode_utc_timestamp(
+            protocol,
+            meta_data,
+            timestamp.encode('ascii')
+        ) == _strptime(
+            timestamp,
+            UTCTIMESTAMP_FMT_NO_MILLIS,
+            UTCTIMESTAMP_FMT_MILLIS
+        )
+        assert _decode_utc_time_only(
+            protocol,
+            meta_data,
+            time_only.encode('ascii')
+        ) == _strptime(
+            time_only,
+            UTCTIMEONLY_FMT_NO_MILLIS,
+            UTCTIMEONLY_FMT_MILLIS
+        )
+
+
+def test_decode_utc_timestamp_nanos(protocol: ProtocolMetaData) -> None:
+    """Test nanosecond timestamps are truncated to microseconds"""
+    meta_data = protocol.fields_by_name['SendingTime']
+    dest = _decode_utc_timestamp(
+        protocol,
+        meta_data,
+        b'20200312-15:35:13.123456789'
+    )
+    assert dest == datetime(2020, 3, 12, 15, 35, 13, 123456, timezone.utc)
+    dest = _decode_utc_time_only(protocol, meta_data, b'15:35:13.123456789')
+    assert dest == datetime(1900, 1, 1, 15, 35, 13, 123456, timezone.utc)
+
+
+@pytest.mark.parametrize('value', [
+    b'2020031215:35:13',
+    b'20200312-15:35',
+    b'20200312-15:35:13.',
+    b'20200312-15:35:13.1234567890',
+    b'20201312-15:35:13',
+    b'20200312-25:35:13.123',
+    b'20200312-15:35:1x',
+])
+def test_decode_utc_timestamp_malformed(
+        protocol: ProtocolMetaData,
+        value: bytes
+) -> None:
+    """Test malformed timestamps raise as strptime does"""
+    with pytest.raises(ValueError):
+        _decode_utc_timestamp(
+            protocol,
+            protocol.fields_by_name['SendingTime'],
+            value
+        )
+
+
+def test_decode_integer_time() -> None:
+    """Tests for decoding and encoding times as integer nanoseconds"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml', is_integer_time=True)
+    sending_time = protocol.fields_by_name['SendingTime']
+    md_entry_time = protocol.fields_by_name['MDEntryTime']
+
+    decode_timestamp = bind_decoder(protocol, sending_time)
+    encode_timestamp = bind_encoder(protocol, sending_time)
+    for src, seconds, nanos in [
+            (b'20200312-15:35:13.000', 1584027313, 0),
+            (b'20200312-15:35:13.123', 1584027313, 123000000),
+            (b'20200312-15:35:13.123456', 1584027313, 123456000),
+            (b'20200312-15:35:13.123456789', 1584027313, 123456789),
+    ]:
+        value = decode_timestamp(src)
+        assert value == seconds * 1000000000 + nanos
+        assert encode_timestamp(value) == src
+    assert decode_timestamp(b'20200312-15:35:13') == 1584027313000000000
+
+    decode_time_only = bind_decoder(protocol, md_entry_time)
+    encode_time_only = bind_encoder(protocol, md_entry_time)
+    value = decode_time_only(b'15:35:13.000000001')
+    assert value == (15 * 3600 + 35 * 60 + 13) * 1000000000 + 1
+    assert encode_time_only(value) == b'15:35:13.000000001'
+
+    # The encoders accept datetime as well.
+    assert encode_timestamp(
+        datetime(2020, 3, 12, 15, 35, 13, 123000, timezone.utc)
+    ) == b'20200312-15:35:13.123'
+
+
+def test_decode_fixed_point() -> None:
+    """Tests for decoding and encoding fixed point numbers"""
+    protocol = load_yaml_protocol(
+        'etc/FIX44.yaml',
+        is_float_decimal=True,
+        fixed_point_places={ValueType.PRICE: 4, 'QTY': 0, 'LastPx': 6}
+    )
+    assert protocol.fixed_point_places['Price'] == 4
+    assert protocol.fixed_point_places['OrderQty'] == 0
+    assert protocol.fixed_point_places['LastPx'] == 6
+    assert 'Commission' not in protocol.fixed_point_places
+
+    price = protocol.fields_by_name['Price']
+    decode_price = bind_decoder(protocol, price)
+    encode_price = bind_encoder(protocol, price)
+    for src, value in [
+            (b'1.25', 12500),
+            (b'-0.5', -5000),
+            (b'100', 1000000),
+            (b'0.0001', 1),
+            (b'-12.3456', -123456),
+    ]:
+        assert decode_price(src) == value
+        assert encode_price(value) == src
+    assert decode_price(b'1.250000') == 12500
+    with pytest.raises(DecodingError):
+        decode_price(b'1.23456')
+
+    # Other types are unaffected.
+    assert bind_decoder(
+        protocol,
+        protocol.fields_by_name['Commission']
+    )(b'1.5') == Decimal('1.5')
+
+    with pytest.raises(ValueError):
+        load_yaml_protocol('etc/FIX44.yaml', fixed_point_places={'INT': 2})
+    with pytest.raises(ValueError):
+        load_yaml_protocol('etc/FIX44.yaml', fixed_point_places={'Symbol': 2})
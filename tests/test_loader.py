@@ -1,6 +1,29 @@
 """Test the loader"""
 
-from jetblack_fixparser import load_yaml_protocol, ValueType
+import json
+from pathlib import Path
+import pickle
+from typing import Any, Dict, Mapping, Optional
+import xml.dom as dom
+import xml.dom.minidom as minidom
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+import pytest
+from ruamel.yaml import YAML
+
+from jetblack_fixparser import (
+    FixMessage,
+    load_quickfix_protocol,
+    load_yaml_protocol,
+    ValueType
+)
+from jetblack_fixparser.fix_message import (
+    compile_decode_plan,
+    compile_encode_plan
+)
+from jetblack_fixparser.loader.quickfix_loader import (
+    _convert_xml_file_to_dict
+)
 
 
 def test_loader():
@@ -22,3 +45,335 @@ def test_loader_is_type_enum():
         'etc/FIX44.yaml',
         is_type_enum={'BOOLEAN': False}
     ) is not None
+
+
+def test_loader_cache(tmp_path):
+    """Tests for the protocol cache"""
+    cache_dir = tmp_path / 'cache'
+    protocol = load_yaml_protocol('etc/FIX44.yaml', cache_dir=cache_dir)
+    cache_files = list(cache_dir.iterdir())
+    assert len(cache_files) == 1
+
+    cached = load_yaml_protocol('etc/FIX44.yaml', cache_dir=cache_dir)
+    assert cached is not protocol
+    assert cached.fields_by_name.keys() == protocol.fields_by_name.keys()
+    assert cached.messages_by_type.keys() == protocol.messages_by_type.keys()
+    assert list(cache_dir.iterdir()) == cache_files
+
+    # Different options have a different cache entry.
+    load_yaml_protocol(
+        'etc/FIX44.yaml',
+        is_type_enum={ValueType.BOOLEAN: False},
+        cache_dir=cache_dir
+    )
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_loader_cache_recovery(tmp_path):
+    """Test corrupt and stale cache files are replaced"""
+    cache_dir = tmp_path / 'cache'
+    protocol_file = tmp_path / 'FIX44.yaml'
+    protocol_file.write_bytes(Path('etc/FIX44.yaml').read_bytes())
+
+    load_yaml_protocol(protocol_file, cache_dir=cache_dir)
+    cache_file, = cache_dir.iterdir()
+    cache_file.write_bytes(cache_file.read_bytes()[:100])
+    protocol = load_yaml_protocol(protocol_file, cache_dir=cache_dir)
+    assert 'NewOrderSingle' in protocol.messages_by_name
+    assert list(cache_dir.iterdir()) == [cache_file]
+    assert pickle.loads(cache_file.read_bytes()).messages_by_name.keys() == (
+        protocol.messages_by_name.keys()
+    )
+
+    # A changed protocol file replaces the old entry.
+    protocol_file.write_bytes(protocol_file.read_bytes() + b'\n')
+    load_yaml_protocol(protocol_file, cache_dir=cache_dir)
+    new_cache_file, = cache_dir.iterdir()
+    assert new_cache_file != cache_file
+
+
+def test_protocol_pickle_drops_plans():
+    """Test the compiled plans are not pickled"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    compile_decode_plan(protocol)
+    compile_encode_plan(protocol)
+    restored = pickle.loads(pickle.dumps(protocol))
+    assert restored.decode_plan is None
+    assert restored.encode_plan is None
+
+
+QUICKFIX_XML = """<?xml version="1.0"?>
+<fix major="4" minor="4" servicepack="0" type="FIX">
+ <header>
+  <field name="BeginString" required="Y"/>
+  <field name="BodyLength" required="Y"/>
+  <field name="MsgType" required="Y"/>
+  <group name="NoHops" required="N">
+   <field name="HopCompID" required="N"/>
+  </group>
+ </header>
+ <trailer>
+  <field name="CheckSum" required="Y"/>
+ </trailer>
+ <messages>
+  <message name="Heartbeat" msgtype="0" msgcat="admin">
+   <field name="TestReqID" required="N"/>
+   <component name="Instrument" required="N"/>
+  </message>
+ </messages>
+ <components>
+  <component name="Instrument">
+   <field name="Symbol" required="Y"/>
+  </component>
+ </components>
+ <fields>
+  <field number="8" name="BeginString" type="STRING"/>
+  <field number="9" name="BodyLength" type="LENGTH"/>
+  <field number="10" name="CheckSum" type="STRING"/>
+  <field number="35" name="MsgType" type="STRING">
+   <value enum="0" description="HEARTBEAT"/>
+   <value enum="1" description="TEST_REQUEST"/>
+  </field>
+  <field number="55" name="Symbol" type="STRING"/>
+  <field number="112" name="TestReqID" type="STRING"/>
+  <field number="627" name="NoHops" type="NUMINGROUP"/>
+  <field number="628" name="HopCompID" type="STRING"/>
+ </fields>
+</fix>
+"""
+
+
+def test_quickfix_loader(tmp_path):
+    """Test the QuickFix loader"""
+    filename = tmp_path / 'FIX44.xml'
+    filename.write_text(QUICKFIX_XML)
+
+    config = _convert_xml_file_to_dict(filename)
+    assert config == {
+        'version': {'major': '4', 'minor': '4', 'servicepack': '0'},
+        'beginString': 'FIX.4.4',
+        'fields': {
+            'BeginString': {'number': '8', 'type': 'STRING', 'values': {}},
+            'BodyLength': {'number': '9', 'type': 'LENGTH', 'values': {}},
+            'CheckSum': {'number': '10', 'type': 'STRING', 'values': {}},
+            'MsgType': {
+                'number': '35',
+                'type': 'STRING',
+                'values': {'0': 'HEARTBEAT', '1': 'TEST_REQUEST'}
+            },
+            'Symbol': {'number': '55', 'type': 'STRING', 'values': {}},
+            'TestReqID': {'number': '112', 'type': 'STRING', 'values': {}},
+            'NoHops': {'number': '627', 'type': 'NUMINGROUP', 'values': {}},
+            'HopCompID': {'number': '628', 'type': 'STRING', 'values': {}},
+        },
+        'components': {
+            'Instrument': {
+                'Symbol': {'type': 'field', 'required': True}
+            }
+        },
+        'header': {
+            'BeginString': {'type': 'field', 'required': True},
+            'BodyLength': {'type': 'field', 'required': True},
+            'MsgType': {'type': 'field', 'required': True},
+            'NoHops': {
+                'type': 'group',
+                'required': False,
+                'fields': {
+                    'HopCompID': {'type': 'field', 'required': False}
+                }
+            }
+        },
+        'trailer': {
+            'CheckSum': {'type': 'field', 'required': True}
+        },
+        'messages': {
+            'Heartbeat': {
+                'msgtype': '0',
+                'msgcat': 'admin',
+                'fields': {
+                    'TestReqID': {'type': 'field', 'required': False},
+                    'Instrument': {'type': 'component', 'required': False}
+                }
+            }
+        }
+    }
+
+    protocol = load_quickfix_protocol(filename)
+    assert protocol.begin_string == b'FIX.4.4'
+    assert protocol.messages_by_name['Heartbeat'].msgtype == b'0'
+
+
+def test_quickfix_loader_invalid_member(tmp_path):
+    """Test the QuickFix loader rejects unknown members"""
+    filename = tmp_path / 'FIX44.xml'
+    filename.write_text(QUICKFIX_XML.replace(
+        '<field name="CheckSum" required="Y"/>\n </trailer>',
+        '<bogus name="CheckSum" required="Y"/>\n </trailer>'
+    ))
+    with pytest.raises(RuntimeError):
+        _convert_xml_file_to_dict(filename)
+
+
+def _add_quickfix_members(
+        element: Element,
+        members: Optional[Mapping[str, Any]]
+) -> None:
+    for name, member in (members or {}).items():
+        member = member or {}
+        child = SubElement(
+            element,
+            member.get('type', 'field'),
+            name=name,
+            required='Y' if member.get('required') else 'N'
+        )
+        if member.get('type') == 'group':
+            _add_quickfix_members(child, member['fields'])
+
+
+def _write_quickfix_xml(yaml_filename: str, filename: Path) -> None:
+    # Write a QuickFix dictionary with the content of a YAML protocol.
+    config = YAML().load(Path(yaml_filename).read_text(encoding='utf8'))
+    version = config['version']
+    root = Element(
+        'fix',
+        type='FIX',
+        major=str(version['major']),
+        minor=str(version['minor']),
+        servicepack=str(version['servicepack'])
+    )
+    for section in ('header', 'trailer'):
+        _add_quickfix_members(SubElement(root, section), config[section])
+    messages = SubElement(root, 'messages')
+    for name, message in config['messages'].items():
+        _add_quickfix_members(
+            SubElement(
+                messages,
+                'message',
+                name=name,
+                msgtype=str(message['msgtype']),
+                msgcat=message['msgcat']
+            ),
+            message['fields']
+        )
+    components = SubElement(root, 'components')
+    for name, members in config['components'].items():
+        _add_quickfix_members(
+            SubElement(components, 'component', name=name),
+            members
+        )
+    fields = SubElement(root, 'fields')
+    for name, field in config['fields'].items():
+        field_element = SubElement(
+            fields,
+            'field',
+            number=str(field['number']),
+            name=name,
+            type=field['type']
+        )
+        for enum, description in (field.get('values') or {}).items():
+            SubElement(
+                field_element,
+                'value',
+                enum=str(enum),
+                description=str(description)
+            )
+    filename.write_bytes(tostring(root).replace(b'><', b'>\n<'))
+
+
+def _minidom_members(node: Any) -> Dict[str, Any]:
+    # The members as converted by the minidom loader the streaming loader
+    # replaced.
+    members: Dict[str, Any] = {}
+    for child in node.childNodes:
+        if child.nodeType != dom.Node.ELEMENT_NODE:
+            continue
+        member: Dict[str, Any] = {
+            'type': child.nodeName,
+            'required': child.attributes['required'].value == 'Y'
+        }
+        if child.nodeName == 'group':
+            member['fields'] = _minidom_members(child)
+        members[child.attributes['name'].value] = member
+    return members
+
+
+def _minidom_convert_xml_file_to_dict(filename: Path) -> Dict[str, Any]:
+    root: Any = minidom.parse(str(filename)).documentElement
+    major = root.attributes['major'].value
+    minor = root.attributes['minor'].value
+    config: Dict[str, Any] = {
+        'version': {
+            'major': major,
+            'minor': minor,
+            'servicepack': root.attributes['servicepack'].value
+        },
+        'beginString': 'FIX.' + major + '.' + minor,
+        'fields': {},
+        'components': {},
+        'header': {},
+        'trailer': {},
+        'messages': {}
+    }
+    for section in root.childNodes:
+        if section.nodeType != dom.Node.ELEMENT_NODE:
+            continue
+        children = [
+            child for child in section.childNodes
+            if child.nodeType == dom.Node.ELEMENT_NODE
+        ]
+        if section.nodeName in ('header', 'trailer'):
+            config[section.nodeName] = _minidom_members(section)
+        elif section.nodeName == 'messages':
+            config['messages'] = {
+                child.attributes['name'].value: {
+                    'msgtype': child.attributes['msgtype'].value,
+                    'msgcat': child.attributes['msgcat'].value,
+                    'fields': _minidom_members(child)
+                }
+                for child in children
+            }
+        elif section.nodeName == 'components':
+            config['components'] = {
+                child.attributes['name'].value: _minidom_members(child)
+                for child in children
+            }
+        elif section.nodeName == 'fields':
+            config['fields'] = {
+                child.attributes['name'].value: {
+                    'number': child.attributes['number'].value,
+                    'type': child.attributes['type'].value,
+                    'values': {
+                        value.attributes['enum'].value:
+                        value.attributes['description'].value
+                        for value in child.childNodes
+                        if value.nodeType == dom.Node.ELEMENT_NODE
+                    }
+                }
+                for child in children
+            }
+    return config
+
+
+def test_quickfix_loader_matches_minidom(tmp_path):
+    """Test the streaming QuickFix loader matches the minidom loader"""
+    filename = tmp_path / 'FIX44.xml'
+    _write_quickfix_xml('etc/FIX44.yaml', filename)
+
+    config = _convert_xml_file_to_dict(filename)
+    expected = _minidom_convert_xml_file_to_dict(filename)
+    # The key order is compared, as it sets the order of the members.
+    assert json.dumps(config) == json.dumps(expected)
+    assert len(config['messages']) > 90
+    assert config['components']['Parties']['NoPartyIDs']['fields'][
+        'PtysSubGrp'
+    ] == {'type': 'component', 'required': False}
+
+    protocol = load_quickfix_protocol(filename)
+    yaml_protocol = load_yaml_protocol('etc/FIX44.yaml')
+    assert list(protocol.messages_by_name) == list(
+        yaml_protocol.messages_by_name
+    )
+    buf = b'8=FIX.4.4|9=122|35=D|49=CLIENT12|56=B|34=215|52=20100225-19:41:57.316|11=13346|1=Marcel|21=1|54=1|60=20100225-19:39:52.020|40=2|44=5|59=0|10=072|'
+    assert FixMessage.decode(protocol, buf, sep=b'|').message == (
+        FixMessage.decode(yaml_protocol, buf, sep=b'|').message
+    )
@@ -0,0 +1,36 @@
+"""Test the meta data"""
+
+import pytest
+
+from jetblack_fixparser import load_yaml_protocol
+
+
+def test_meta_data_is_immutable():
+    """Test the meta data is slotted and read only"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    field = protocol.fields_by_name['MsgType']
+    assert not hasattr(field, '__dict__')
+    with pytest.raises(AttributeError):
+        field.name = 'NotMsgType'
+    with pytest.raises(AttributeError):
+        field.other = 'value'
+
+    message = protocol.messages_by_name['Logon']
+    with pytest.raises(AttributeError):
+        message.msgtype = b'0'
+
+    component = protocol.components['Instrument']
+    assert 'Symbol' in component.members
+    with pytest.raises(AttributeError):
+        component.members = {}
+
+
+def test_fields_by_tag():
+    """Test looking up fields by integer tag"""
+    protocol = load_yaml_protocol('etc/FIX44.yaml')
+    for field in protocol.fields_by_name.values():
+        assert field.tag == int(field.number)
+        assert protocol.field_by_tag(field.tag) is field
+    assert protocol.field_by_tag(0) is None
+    assert protocol.field_by_tag(-1) is None
+    assert protocol.field_by_tag(len(protocol.fields_by_tag)) is None